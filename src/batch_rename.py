@@ -0,0 +1,114 @@
+"""Rename nodes of Maya ASCII files without opening Maya.
+
+Usage:
+    python -m PRTTM_Node_Renamer.src.batch_rename assets/ --output-dir fixed/
+    python -m PRTTM_Node_Renamer.src.batch_rename shot.ma --in-place --mapping renames.json
+    python -m PRTTM_Node_Renamer.src.batch_rename assets/ --dry-run
+
+Without --mapping, every transform or joint whose name does not follow the
+naming grammar is renamed to the name the tool would suggest. Files are
+processed in parallel, one per worker process.
+"""
+import argparse
+import concurrent.futures
+import functools
+import json
+import os
+import sys
+
+from .core.grammar import active_grammar, load_grammar
+from .core.ma_file import FileReport, rename_file
+
+
+def collect_files(inputs):
+    """Expand inputs into (source, path relative to its input root) pairs."""
+    files = []
+    for item in inputs:
+        if os.path.isdir(item):
+            for root, _, names in os.walk(item):
+                for name in sorted(names):
+                    if name.endswith(".ma"):
+                        source = os.path.join(root, name)
+                        files.append((source, os.path.relpath(source, item)))
+        else:
+            files.append((item, os.path.basename(item)))
+    return files
+
+
+@functools.lru_cache(maxsize=None)
+def _load_mapping(path):
+    with open(path, "r", encoding="utf-8") as handle:
+        return json.load(handle)
+
+
+def _rename_worker(source, output, grammar_path, mapping_path, dry_run):
+    # Runs in a worker process: grammar and mapping are loaded once per process
+    grammar = load_grammar(grammar_path) if grammar_path else active_grammar()
+    mapping = _load_mapping(mapping_path) if mapping_path else None
+    return rename_file(source, grammar, output, mapping, dry_run)
+
+
+def run(files, output_dir=None, grammar_path=None, mapping_path=None, dry_run=False, jobs=None):
+    """Rename every file, yielding FileReports as they complete.
+
+    A file that cannot be renamed yields a report with its error set, the
+    other files are still processed.
+    """
+    tasks = [(source, os.path.join(output_dir, relative) if output_dir else None)
+             for source, relative in files]
+    if jobs == 1 or len(tasks) < 2:
+        for source, output in tasks:
+            try:
+                yield _rename_worker(source, output, grammar_path, mapping_path, dry_run)
+            except Exception as e:
+                yield FileReport.failed(source, e)
+        return
+    with concurrent.futures.ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = {executor.submit(_rename_worker, source, output, grammar_path, mapping_path, dry_run): source
+                   for source, output in tasks}
+        for future in concurrent.futures.as_completed(futures):
+            try:
+                yield future.result()
+            except Exception as e:
+                yield FileReport.failed(futures[future], e)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rename nodes of Maya ASCII files without Maya.")
+    parser.add_argument("inputs", nargs="+", help=".ma files or folders to search for them.")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--output-dir", help="Write renamed files here, keeping the folder layout.")
+    target.add_argument("--in-place", action="store_true", help="Overwrite the input files.")
+    target.add_argument("--dry-run", action="store_true", help="Only report what would be renamed.")
+    parser.add_argument("--grammar", help="Naming grammar file, defaults to the active grammar.")
+    parser.add_argument("--mapping", help="JSON file of {long or short name: new name} to apply instead.")
+    parser.add_argument("--jobs", type=int, default=None, help="Worker processes, defaults to one per core.")
+    parser.add_argument("--verbose", action="store_true", help="List every rename.")
+    args = parser.parse_args(argv)
+
+    files = collect_files(args.inputs)
+    if not files:
+        print("No .ma files found.")
+        return 1
+
+    renamed = conflicts = failed = 0
+    for report in run(files, args.output_dir, args.grammar, args.mapping, args.dry_run, args.jobs):
+        if report.error is not None:
+            failed += 1
+            print(f"{report.path}: failed, {report.error}")
+            continue
+        renamed += len(report.renamed)
+        conflicts += len(report.conflicts)
+        print(f"{report.path}: {len(report.renamed)} renamed, {len(report.conflicts)} conflicts, "
+              f"{report.nodes} nodes, {report.size / 1e6:.1f} MB in {report.seconds:.2f}s")
+        if args.verbose:
+            for path, new_name in report.renamed.items():
+                print(f"    {path} -> {new_name}")
+        for path, new_name, reason in report.conflicts:
+            print(f"    skipped {path} -> {new_name}: {reason}")
+    print(f"{len(files)} files, {renamed} nodes renamed, {conflicts} conflicts, {failed} failed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,373 @@
+"""Pure-Python throughput harness for the renamer, runnable without Maya.
+
+Usage:
+    python -m PRTTM_Node_Renamer.src.benchmarks --count 100000
+"""
+import argparse
+import os
+import random
+import re
+import string
+import tempfile
+import time
+import tracemalloc
+
+from .core import bulk_ops
+from .core.grammar import load_grammar, GRAMMAR_DIR
+from .core.classify import classify, TYPE_RULES, CENTER_TOLERANCE
+from .core.fake_cmds import FakeCmds, build_scene, build_classified_scene
+from .core.hierarchy import HierarchyIndex, load_hierarchy
+from .core.rows import RowStore
+from .core.scene import SceneSnapshot
+from .core.jobs import RowSnapshot, preview_batches
+from .core.ma_file import rename_file
+from .core.manifest import RenameManifest, load_manifest, save_manifest, diff_manifests
+from .core.search import SearchIndex, MODE_SUBSTRING, MODE_GLOB, MODE_REGEX
+
+
+def generate_names(count, invalid_ratio=0.3, seed=0):
+    """Generate a mix of valid and invalid node names for the default grammar."""
+    grammar = load_grammar()
+    sides = grammar.token_values("side")
+    types = grammar.token_values("type")
+    rng = random.Random(seed)
+    letters = string.ascii_letters + string.digits
+    names = []
+    for index in range(count):
+        base = "".join(rng.choice(letters) for _ in range(rng.randint(3, 12)))
+        if rng.random() < invalid_ratio:
+            names.append(f"{base} {index}|old")
+        else:
+            side = rng.choice(sides)
+            node_type = rng.choice(types)
+            names.append(f"{side}_{base}{index}_{node_type}")
+    return names
+
+
+def timed(func, *args, repeat=3):
+    """Return the best wall time in seconds over `repeat` runs."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def _legacy_validate(names):
+    # Mirrors the original per-call ObjectWidget.validate_name
+    pattern = r'^([CLR])_([a-zA-Z0-9]+)_(GEO|JNT|CTRL)$'
+    return [bool(re.match(pattern, name)) for name in names]
+
+
+def _legacy_clean(names):
+    return [re.sub(r'[^a-zA-Z0-9]', '', name) for name in names]
+
+
+def bench_naming(count):
+    """Time the default grammar's bulk API against the legacy per-call implementation."""
+    names = generate_names(count)
+    grammar = load_grammar()
+    primary = grammar.tokens[grammar.primary_index]
+    _, columns = grammar.parse_many(names)
+    return {
+        "legacy_validate": timed(_legacy_validate, names),
+        "validate_many": timed(grammar.validate_many, names),
+        "legacy_clean": timed(_legacy_clean, names),
+        "clean": timed(lambda: [primary.clean(name) for name in names]),
+        "parse_many": timed(grammar.parse_many, names),
+        "format_many": timed(grammar.format_many, columns),
+    }
+
+
+def _legacy_parse(names):
+    # Mirrors the original validate_name + populate_fields split
+    parsed = []
+    for name in names:
+        if re.match(r'^([CLR])_([a-zA-Z0-9]+)_(GEO|JNT|CTRL)$', name):
+            parsed.append(tuple(name.split('_')))
+        else:
+            parsed.append(("C", name, "GEO"))
+    return parsed
+
+
+def bench_grammar(count):
+    """Time grammar parsing against the original per-call regex."""
+    names = generate_names(count)
+    default = load_grammar()
+    show = load_grammar(os.path.join(GRAMMAR_DIR, "show_example.json"))
+    show_names = [f"{name[:-4]}_01_A_LOD0{name[-4:]}" if index % 2 else name
+                  for index, name in enumerate(names)]
+    _, columns = default.parse_many(names)
+    return {
+        "legacy_parse": timed(_legacy_parse, names),
+        "default_parse_many": timed(default.parse_many, names),
+        "default_format_many": timed(default.format_many, columns),
+        "show_parse_many": timed(show.parse_many, show_names),
+    }
+
+
+def _legacy_populate(cmds, set_name):
+    # Mirrors the original per-member ObjectNamerTool.populate_objects
+    names = []
+    for obj in cmds.sets(set_name, q=True) or []:
+        if cmds.objectType(obj) == 'mesh':
+            transform = cmds.listRelatives(obj, parent=True, type='transform')
+            if transform:
+                obj = transform[0]
+        if cmds.objectType(obj) == 'transform':
+            names.append(obj)
+    return names
+
+
+def bench_scene(count, latency=0.0002):
+    """Time set member resolution against the fake scene, with command counts.
+
+    `latency` models the per-command cost of a heavy Maya scene.
+    """
+    cmds = FakeCmds()
+    set_name = build_scene(cmds, count)
+    cmds.latency = latency
+    results = {"legacy_populate": timed(_legacy_populate, cmds, set_name, repeat=1)}
+    legacy_calls = sum(cmds.calls.values())
+    cmds.calls.clear()
+    snapshot = SceneSnapshot(cmds)
+    results["set_transforms"] = timed(lambda: (snapshot.invalidate(), snapshot.set_transforms(set_name)), repeat=1)
+    snapshot_calls = sum(cmds.calls.values())
+    results["set_transforms_cached"] = timed(snapshot.set_transforms, set_name)
+    print(f"scene commands: legacy {legacy_calls}, snapshot {snapshot_calls}")
+    return results
+
+
+def _legacy_classify(cmds, long_names):
+    # What a per-node classifier would do: three commands for every node
+    rules = dict(TYPE_RULES)
+    result = []
+    for long_name in long_names:
+        types = [cmds.objectType(long_name)]
+        types += [cmds.objectType(shape) for shape in cmds.listRelatives(long_name, shapes=True, fullPath=True) or []]
+        box = cmds.xform(long_name, q=True, ws=True, boundingBox=True)
+        x = (box[0] + box[3]) * 0.5
+        side = "L" if x > CENTER_TOLERANCE else "R" if x < -CENTER_TOLERANCE else "C"
+        result.append((side, next((rules[t] for t in types if t in rules), None)))
+    return result
+
+
+def bench_classify(count, latency=0.0002):
+    """Time batched side/type classification against a per-node loop, and check accuracy."""
+    cmds = FakeCmds()
+    _, expected = build_classified_scene(cmds, count)
+    long_names = list(expected)
+    grammar = load_grammar()
+    side_index = grammar.token_names.index("side")
+    type_index = grammar.token_names.index("type")
+    cmds.latency = latency
+    # The per-node loop is timed on a sample and scaled, it would take minutes on large counts
+    sample = long_names[:2000]
+    legacy_time = timed(_legacy_classify, cmds, sample, repeat=1)
+    results = {"legacy_classify": legacy_time * count / max(len(sample), 1)}
+    legacy_calls = sum(cmds.calls.values())
+    cmds.calls.clear()
+    suggestions = {}
+    results["classify"] = timed(lambda: suggestions.update(classify(cmds, long_names, grammar)), repeat=1)
+    batched_calls = sum(cmds.calls.values())
+    correct = sum((side, node_type) == expected[long_name] for long_name, side, node_type
+                  in zip(long_names, suggestions[side_index], suggestions[type_index]))
+    print(f"classify commands: legacy {legacy_calls} for {len(sample)} nodes, batched {batched_calls}, "
+          f"accuracy {correct / max(count, 1):.1%}")
+    return results
+
+
+def generate_paths(count, branching=8, seed=0):
+    """Generate `count` long DAG paths forming a random tree."""
+    rng = random.Random(seed)
+    paths = []
+    for index in range(count):
+        if index < branching or rng.random() < 0.01:
+            paths.append(f"|root{index}")
+        else:
+            parent = paths[rng.randrange(max(0, len(paths) - branching * 4), len(paths))]
+            paths.append(f"{parent}|node{index}")
+    return paths
+
+
+def _legacy_tree(cmds):
+    # Mirrors the original recursive SelectionSetEditor.populate_tree_widget
+    def add(obj):
+        for child in sorted(cmds.listRelatives(obj, children=True, type='transform') or []):
+            add(child)
+    for obj in sorted(cmds.ls(assemblies=True)):
+        add(obj)
+
+
+def bench_hierarchy(count, latency=0.0002):
+    """Time hierarchy loading on generated paths and against the fake scene."""
+    paths = generate_paths(count)
+    results = {"index_from_paths": timed(HierarchyIndex.from_paths, paths)}
+    cmds = FakeCmds()
+    build_scene(cmds, min(count, 5000))
+    cmds.latency = latency
+    results["legacy_tree"] = timed(_legacy_tree, cmds, repeat=1)
+    legacy_calls = sum(cmds.calls.values())
+    cmds.calls.clear()
+    results["load_hierarchy"] = timed(load_hierarchy, cmds, repeat=1)
+    print(f"hierarchy commands: legacy {legacy_calls}, indexed {sum(cmds.calls.values())}")
+    return results
+
+
+def write_sample_ma(path, count, seed=0, points=64):
+    """Write a Maya ASCII file with `count` mesh transforms, half of them badly named.
+
+    Each mesh carries `points` lines of vertex data, the bulk of a real file.
+    """
+    rng = random.Random(seed)
+    with open(path, "w", encoding="utf-8", newline="\n") as handle:
+        handle.write('//Maya ASCII 2022 scene\nrequires maya "2022";\n')
+        handle.write('createNode transform -s -n "persp";\n')
+        handle.write('createNode transform -n "asset_grp";\n')
+        handle.write('createNode objectSet -n "renameSet";\n')
+        names = []
+        for index in range(count):
+            name = f"C_part{index}_GEO" if rng.random() < 0.5 else f"part {index}"
+            names.append(name)
+            handle.write(f'createNode transform -n "{name}" -p "asset_grp";\n')
+            handle.write(f'\tsetAttr ".t" -type "double3" {rng.uniform(-5, 5):.3f} 0 0 ;\n')
+            handle.write(f'createNode mesh -n "{name}Shape" -p "{name}";\n')
+            handle.write(f'\tsetAttr -s {points} ".vt[0:{points - 1}]"')
+            for _ in range(points):
+                handle.write(f"\n\t\t{rng.random():.6f} {rng.random():.6f} {rng.random():.6f}")
+            handle.write(";\n")
+        for name in names:
+            handle.write(f'connectAttr "{name}.iog" "renameSet.dsm" -na;\n')
+        handle.write('select -ne :time1;\n')
+
+
+def bench_ma(count, files=4):
+    """Time the offline .ma renamer, serially and across a process pool."""
+    from .batch_rename import collect_files, run
+
+    per_file = max(count // files, 1)
+    with tempfile.TemporaryDirectory() as folder:
+        source_dir = os.path.join(folder, "source")
+        os.makedirs(source_dir)
+        for index in range(files):
+            write_sample_ma(os.path.join(source_dir, f"asset{index}.ma"), per_file, seed=index)
+        inputs = collect_files([source_dir])
+        size = sum(os.path.getsize(source) for source, _ in inputs)
+        output_dir = os.path.join(folder, "output")
+        results = {
+            "serial": timed(lambda: list(run(inputs, output_dir, jobs=1)), repeat=1),
+            "process_pool": timed(lambda: list(run(inputs, output_dir)), repeat=1),
+        }
+        # Peak Python allocations while streaming one file, independent of its size
+        tracemalloc.start()
+        rename_file(inputs[0][0], load_grammar(), os.path.join(folder, "traced.ma"))
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    print(f"ma files: {files} files, {size / 1e6:.1f} MB, peak {peak / 1e6:.1f} MB traced for one "
+          f"{size / files / 1e6:.1f} MB file")
+    return results
+
+
+def bench_manifest(count):
+    """Time writing, loading, validating and diffing rename plan manifests."""
+    names = generate_names(count)
+    uuids = [f"{index:08X}-0000-0000-0000-{index:012X}" for index in range(count)]
+    new_names = [f"C_node{index}_GEO" for index in range(count)]
+    manifest = RenameManifest("renameSet", uuids, names, new_names)
+    grammar = load_grammar()
+    results = {}
+    with tempfile.TemporaryDirectory() as folder:
+        for extension in ("jsonl", "rnp"):
+            path = os.path.join(folder, f"plan.{extension}")
+            results[f"write_{extension}"] = timed(save_manifest, manifest, path)
+            results[f"load_{extension}"] = timed(load_manifest, path)
+            print(f"manifest {extension}: {os.path.getsize(path) / 1e6:.1f} MB")
+    results["validate"] = timed(manifest.validate, grammar)
+    changed = RenameManifest("renameSet", uuids, names, new_names[:-100] + ["C_other_GEO"] * 100)
+    results["diff"] = timed(diff_manifests, manifest, changed)
+    return results
+
+
+def _legacy_set_text(store, token_index, func):
+    # Mirrors typing into each row: one edit and status refresh per row
+    for row in range(len(store)):
+        store.set_token(row, token_index, func(store.token(row, token_index)))
+
+
+def bench_bulk(count):
+    """Time bulk edits over a row store, each applied as one column update."""
+    store = RowStore()
+    store.load(generate_names(count))
+    primary = store.grammar.primary_index
+    pattern = re.compile(r'(\D+)(\d+)')
+
+    def run(op, first="", second="", token_index=primary):
+        # Applied and reverted so every run starts from the same rows
+        edit = bulk_ops.bulk_edit(store, op, token_index, first, second)
+        edit.apply(store)
+        edit.revert(store)
+
+    results = {
+        "legacy_per_row": timed(_legacy_set_text, store, primary,
+                                lambda value: pattern.sub(r'\2x\1', value), repeat=1),
+        "regex_replace": timed(run, bulk_ops.OP_REGEX, r'(\D+)(\d+)', r'\2x\1'),
+        "replace": timed(run, bulk_ops.OP_REPLACE, "a", "b"),
+        "add_prefix": timed(run, bulk_ops.OP_ADD_PREFIX, "new"),
+        "upper_case": timed(run, bulk_ops.OP_UPPER),
+        "set_side": timed(run, bulk_ops.OP_SET, "L", "", 0),
+    }
+    snapshot = RowSnapshot.from_store(store)
+    results["snapshot"] = timed(RowSnapshot.from_store, store)
+    results["preview_batches"] = timed(lambda: sum(len(batch) for batch in preview_batches(snapshot)))
+    return results
+
+
+def _legacy_filter(hierarchy, text):
+    # Mirrors the original filter_tree: lowercase and test every name
+    text = text.lower()
+    return [node_id for node_id, name in enumerate(hierarchy.names) if text in name.lower()]
+
+
+def bench_search(count):
+    """Time index build and query latency on a generated hierarchy."""
+    hierarchy = HierarchyIndex.from_paths(generate_paths(count))
+    index = SearchIndex(hierarchy)
+    results = {
+        "search_index": timed(SearchIndex, hierarchy, repeat=1),
+        "ngram_build": timed(index.warm_up, repeat=1),
+        "legacy_filter": timed(_legacy_filter, hierarchy, "node12"),
+    }
+    for label, text, mode in (("query_contains", "node12", MODE_SUBSTRING),
+                              ("query_short", "e1", MODE_SUBSTRING),
+                              ("query_glob", "node1*3", MODE_GLOB),
+                              ("query_regex", r"node\d{3}$", MODE_REGEX)):
+        results[label] = timed(index.query, text, mode)
+    return results
+
+
+def report(title, count, results):
+    print(f"{title} ({count} names)")
+    for name, seconds in results.items():
+        rate = count / seconds if seconds else float("inf")
+        print(f"  {name:<20} {seconds * 1000:9.2f} ms  {rate:12.0f} names/s")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the renamer without Maya.")
+    parser.add_argument("--count", type=int, default=100000, help="Number of names to generate.")
+    args = parser.parse_args(argv)
+    report("naming", args.count, bench_naming(args.count))
+    report("grammar", args.count, bench_grammar(args.count))
+    report("scene", args.count, bench_scene(args.count))
+    report("classify", args.count, bench_classify(args.count))
+    report("ma", args.count, bench_ma(args.count))
+    report("manifest", args.count, bench_manifest(args.count))
+    report("bulk", args.count, bench_bulk(args.count))
+    report("hierarchy", args.count, bench_hierarchy(args.count))
+    report("search", args.count, bench_search(args.count))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+"""Bulk edits of one token over many rows of a RowStore.
+
+Each operation reads the token column once, computes the new values in a
+single pass and returns a BulkEdit holding only the rows that change, with
+their old and new values. Applying or reverting an edit is one
+RowStore.set_token_column call, so a whole operation is one undo step.
+Cells typed into after an edit no longer hold the value it expects and are
+left alone by undo and redo.
+
+Literal replacement and case changes run over one newline-joined blob of
+the values, node names never contain a newline, so the work is done by a
+single str method call in C. Regex replacement runs the compiled pattern
+over each value, since a pattern could match across the joins, with the
+replacement template parsed once instead of once per value.
+"""
+import re
+
+OP_REPLACE = "replace"
+OP_REGEX = "regex"
+OP_ADD_PREFIX = "add_prefix"
+OP_ADD_SUFFIX = "add_suffix"
+OP_STRIP_PREFIX = "strip_prefix"
+OP_STRIP_SUFFIX = "strip_suffix"
+OP_LOWER = "lower"
+OP_UPPER = "upper"
+OP_CAPITALIZE = "capitalize"
+OP_SET = "set"
+
+CASE_OPS = (OP_LOWER, OP_UPPER, OP_CAPITALIZE)
+
+_GROUP_REFERENCE = re.compile(r'\\(?:g<(\w+)>|([1-9][0-9]?))')
+
+
+class BulkEdit:
+    """New values of one token for some rows, with the values they replace."""
+
+    __slots__ = ("token_index", "rows", "old_values", "new_values")
+
+    def __init__(self, token_index, rows, old_values, new_values):
+        self.token_index = token_index
+        self.rows = rows
+        self.old_values = old_values
+        self.new_values = new_values
+
+    def __len__(self):
+        return len(self.rows)
+
+    def apply(self, store):
+        """Set the new values, returns the rows updated."""
+        return self._swap(store, self.old_values, self.new_values)
+
+    def revert(self, store):
+        """Restore the old values, returns the rows updated."""
+        return self._swap(store, self.new_values, self.old_values)
+
+    def _swap(self, store, expected, values):
+        # Cells edited by hand since the last apply or revert keep their value
+        current = store.token_column(self.token_index, self.rows)
+        if current == expected:
+            store.set_token_column(self.token_index, self.rows, values)
+            return self.rows
+        kept = [index for index, (value, wanted) in enumerate(zip(current, expected)) if value == wanted]
+        rows = [self.rows[index] for index in kept]
+        store.set_token_column(self.token_index, rows, [values[index] for index in kept])
+        return rows
+
+
+def _diff(token_index, rows, old_values, new_values):
+    changed = [index for index, (old, new) in enumerate(zip(old_values, new_values)) if old != new]
+    return BulkEdit(token_index, [rows[index] for index in changed],
+                    [old_values[index] for index in changed], [new_values[index] for index in changed])
+
+
+def _text_token(store, token_index):
+    if store.grammar.tokens[token_index].is_choice:
+        raise ValueError(f"Token '{store.grammar.tokens[token_index].name}' is not a free text token.")
+
+
+def _rows(store, rows):
+    return list(range(len(store))) if rows is None else list(rows)
+
+
+def _map_blob(values, func):
+    # One call over all values, split back into the same number of rows
+    if not values:
+        return []
+    return func("\n".join(values)).split("\n")
+
+
+def replace(store, token_index, find, replacement, rows=None):
+    """Replace every occurrence of the literal text find."""
+    _text_token(store, token_index)
+    if not find or "\n" in find or "\n" in replacement:
+        raise ValueError("The text to find must be non-empty and on one line.")
+    rows = _rows(store, rows)
+    values = store.token_column(token_index, rows)
+    return _diff(token_index, rows, values, _map_blob(values, lambda blob: blob.replace(find, replacement)))
+
+
+def _expander(compiled, replacement):
+    # re parses a string template again on every sub call, which dominates
+    # the cost over many short values, so group references are resolved here
+    if "\\" not in replacement:
+        return replacement
+    literals = []
+    groups = []
+    position = 0
+    for match in _GROUP_REFERENCE.finditer(replacement):
+        literals.append(replacement[position:match.start()])
+        reference = match.group(1) or match.group(2)
+        index = int(reference) if reference.isdigit() else compiled.groupindex.get(reference)
+        if index is None or index > compiled.groups:
+            raise re.error(f"invalid group reference {reference}")
+        groups.append(index)
+        position = match.end()
+    literals.append(replacement[position:])
+    if any("\\" in literal for literal in literals):
+        # Other escapes, leave them to re
+        return replacement
+    head = literals[0]
+    pairs = tuple(zip(groups, literals[1:]))
+
+    def expand(match):
+        parts = [head]
+        for index, literal in pairs:
+            parts.append(match.group(index) or "")
+            parts.append(literal)
+        return "".join(parts)
+
+    return expand
+
+
+def regex_replace(store, token_index, pattern, replacement, rows=None, ignore_case=False):
+    """Replace the matches of a regex, replacement may use group references.
+
+    Raises re.error for an invalid pattern or replacement.
+    """
+    _text_token(store, token_index)
+    compiled = re.compile(pattern, re.IGNORECASE if ignore_case else 0)
+    sub = compiled.sub
+    replacement = _expander(compiled, replacement)
+    rows = _rows(store, rows)
+    values = store.token_column(token_index, rows)
+    return _diff(token_index, rows, values, [sub(replacement, value) for value in values])
+
+
+def add_affix(store, token_index, prefix="", suffix="", rows=None):
+    _text_token(store, token_index)
+    rows = _rows(store, rows)
+    values = store.token_column(token_index, rows)
+    return _diff(token_index, rows, values, [prefix + value + suffix for value in values])
+
+
+def strip_affix(store, token_index, prefix="", suffix="", rows=None):
+    """Remove prefix and suffix from the values that have them."""
+    _text_token(store, token_index)
+    rows = _rows(store, rows)
+    values = store.token_column(token_index, rows)
+    new_values = values
+    if prefix:
+        new_values = [value[len(prefix):] if value.startswith(prefix) else value for value in new_values]
+    if suffix:
+        new_values = [value[:-len(suffix)] if value.endswith(suffix) else value for value in new_values]
+    return _diff(token_index, rows, values, new_values)
+
+
+def change_case(store, token_index, mode, rows=None):
+    """Lower-case, upper-case or capitalize (first letter up, rest kept) the values."""
+    _text_token(store, token_index)
+    rows = _rows(store, rows)
+    values = store.token_column(token_index, rows)
+    if mode == OP_LOWER:
+        new_values = _map_blob(values, str.lower)
+    elif mode == OP_UPPER:
+        new_values = _map_blob(values, str.upper)
+    elif mode == OP_CAPITALIZE:
+        new_values = [value[:1].upper() + value[1:] for value in values]
+    else:
+        raise ValueError(f"Unknown case mode: {mode}")
+    return _diff(token_index, rows, values, new_values)
+
+
+def set_value(store, token_index, value, rows=None):
+    """Give every row the same value, one of the choices for a choice token."""
+    token = store.grammar.tokens[token_index]
+    if token.is_choice and value not in token.choices:
+        raise ValueError(f"'{value}' is not a value of token '{token.name}'.")
+    rows = _rows(store, rows)
+    values = store.token_column(token_index, rows)
+    return _diff(token_index, rows, values, [value] * len(values))
+
+
+def bulk_edit(store, op, token_index, first="", second="", rows=None, ignore_case=False):
+    """Dispatch an OP_* operation, first and second are its text arguments."""
+    if op == OP_REPLACE:
+        return replace(store, token_index, first, second, rows)
+    if op == OP_REGEX:
+        return regex_replace(store, token_index, first, second, rows, ignore_case)
+    if op == OP_ADD_PREFIX:
+        return add_affix(store, token_index, prefix=first, rows=rows)
+    if op == OP_ADD_SUFFIX:
+        return add_affix(store, token_index, suffix=first, rows=rows)
+    if op == OP_STRIP_PREFIX:
+        return strip_affix(store, token_index, prefix=first, rows=rows)
+    if op == OP_STRIP_SUFFIX:
+        return strip_affix(store, token_index, suffix=first, rows=rows)
+    if op in CASE_OPS:
+        return change_case(store, token_index, op, rows)
+    if op == OP_SET:
+        return set_value(store, token_index, first, rows)
+    raise ValueError(f"Unknown bulk operation: {op}")
@@ -0,0 +1,116 @@
+"""Batched side and type suggestions for badly named nodes.
+
+The type token comes from each node's own type and the type of its shapes,
+the side token from the X coordinate of its world bounding box center.
+Whatever the number of nodes, classification makes four scene queries: an
+ls for node types, a listRelatives and an ls for shape types, and one xform
+for bounding boxes. Side thresholds are vectorized with NumPy when it is available.
+"""
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from .scene import parent_path
+
+# Checked in order, the first matching node or shape type wins
+TYPE_RULES = (
+    ("joint", "JNT"),
+    ("nurbsCurve", "CTRL"),
+    ("mesh", "GEO"),
+    ("nurbsSurface", "GEO"),
+    ("locator", "LOC"),
+)
+
+# Characters face +Z, so their left side is +X
+SIDE_POSITIVE = "L"
+SIDE_NEGATIVE = "R"
+SIDE_CENTER = "C"
+CENTER_TOLERANCE = 0.1
+
+
+def query_node_types(cmds, long_names):
+    """Own type and shape types of each node, from two batched queries."""
+    own = cmds.ls(long_names, showType=True, long=True) or []
+    types = {own[i]: [own[i + 1]] for i in range(0, len(own), 2)}
+    shapes = cmds.listRelatives(long_names, shapes=True, fullPath=True) or []
+    if shapes:
+        shape_types = cmds.ls(shapes, showType=True, long=True) or []
+        for i in range(0, len(shape_types), 2):
+            parent = parent_path(shape_types[i])
+            if parent in types:
+                types[parent].append(shape_types[i + 1])
+    return [types.get(long_name, []) for long_name in long_names]
+
+
+def classify_types(node_types, allowed, rules=TYPE_RULES):
+    """Type token per node, or None when no rule applies or the value is not allowed."""
+    rule_map = {node_type: token for node_type, token in rules if token in allowed}
+    order = {node_type: index for index, (node_type, _) in enumerate(rules)}
+    result = []
+    for types in node_types:
+        matches = [node_type for node_type in types if node_type in rule_map]
+        result.append(rule_map[min(matches, key=order.__getitem__)] if matches else None)
+    return result
+
+
+def query_centers_x(cmds, long_names):
+    """World bounding box center X of each node, from one xform query."""
+    if not long_names:
+        return []
+    values = cmds.xform(long_names, q=True, ws=True, boundingBox=True)
+    if numpy is not None:
+        boxes = numpy.asarray(values, dtype=float).reshape(-1, 6)
+        return (boxes[:, 0] + boxes[:, 3]) * 0.5
+    return [(values[i] + values[i + 3]) * 0.5 for i in range(0, len(values), 6)]
+
+
+def classify_sides(centers_x, tolerance=CENTER_TOLERANCE):
+    """Side token per center X value."""
+    if numpy is not None:
+        x = numpy.asarray(centers_x, dtype=float)
+        sides = numpy.full(x.shape, SIDE_CENTER, dtype=object)
+        sides[x > tolerance] = SIDE_POSITIVE
+        sides[x < -tolerance] = SIDE_NEGATIVE
+        return sides.tolist()
+    return [SIDE_POSITIVE if x > tolerance else SIDE_NEGATIVE if x < -tolerance else SIDE_CENTER
+            for x in centers_x]
+
+
+def classify(cmds, long_names, grammar, side_token="side", type_token="type"):
+    """Suggested values for the side and type tokens of the given nodes.
+
+    Returns {token index: [value or None per node]} for the tokens the
+    grammar defines.
+    """
+    long_names = list(long_names)
+    suggestions = {}
+    if not long_names:
+        return suggestions
+    if type_token in grammar.token_names:
+        allowed = grammar.token(type_token).values
+        suggestions[grammar.token_names.index(type_token)] = classify_types(
+            query_node_types(cmds, long_names), allowed)
+    if side_token in grammar.token_names:
+        allowed = grammar.token(side_token).values
+        sides = classify_sides(query_centers_x(cmds, long_names))
+        suggestions[grammar.token_names.index(side_token)] = [side if side in allowed else None
+                                                              for side in sides]
+    return suggestions
+
+
+def prefill_invalid(cmds, store, side_token="side", type_token="type"):
+    """Fill side and type of every row whose original name does not parse.
+
+    Returns the rows that were updated.
+    """
+    valid = store.grammar.validate_many(store.names)
+    rows = [row for row, is_valid in enumerate(valid) if not is_valid]
+    if not rows:
+        return []
+    suggestions = classify(cmds, [store.long_names[row] for row in rows], store.grammar,
+                           side_token, type_token)
+    for token_index, values in suggestions.items():
+        picked = [(row, value) for row, value in zip(rows, values) if value is not None]
+        store.set_token_column(token_index, [row for row, _ in picked], [value for _, value in picked])
+    return rows
@@ -0,0 +1,516 @@
+"""In-memory stand-in for the subset of maya.cmds used by the renamer.
+
+FakeCmds mirrors the call signatures of the real commands closely enough for
+the scene, rename and set logic to run off-Maya. Every call is counted in
+`calls`, which makes it easy to check how many round-trips a code path makes,
+and `latency` adds a fixed per-call delay to model a heavy scene.
+
+    cmds = FakeCmds()
+    grp = cmds.createNode('transform', name='grp')
+    cmds.createNode('mesh', name='bodyShape', parent=cmds.createNode('transform', name='body', parent=grp))
+"""
+import collections
+import itertools
+import re
+import sys
+import time
+import types
+
+# Parent type for every node type the fake knows about, used by `type=` filters
+TYPE_PARENTS = {
+    "transform": "dagNode",
+    "joint": "transform",
+    "shape": "dagNode",
+    "mesh": "shape",
+    "nurbsCurve": "shape",
+    "nurbsSurface": "shape",
+    "locator": "shape",
+    "camera": "shape",
+    "objectSet": "entity",
+    "dagNode": "entity",
+    "entity": None,
+}
+
+_TRAILING_DIGITS = re.compile(r'(\d*)$')
+
+
+class FakeNode:
+    __slots__ = ("uuid", "name", "node_type", "parent", "children", "members", "bbox")
+
+    def __init__(self, uuid, name, node_type, parent=None):
+        self.uuid = uuid
+        self.name = name
+        self.node_type = node_type
+        self.parent = parent
+        self.children = []
+        self.members = [] if node_type == "objectSet" else None
+        self.bbox = (0.0, 0.0, 0.0, 0.0, 0.0, 0.0)
+
+
+def _as_list(args):
+    items = []
+    for arg in args:
+        if arg is None:
+            continue
+        if isinstance(arg, (list, tuple, set)):
+            items.extend(arg)
+        else:
+            items.append(arg)
+    return items
+
+
+def is_type(node_type, base_type):
+    """Return True if node_type is base_type or derives from it."""
+    while node_type is not None:
+        if node_type == base_type:
+            return True
+        node_type = TYPE_PARENTS.get(node_type, "dagNode" if node_type != "entity" else None)
+    return False
+
+
+class FakeCmds:
+    """Minimal maya.cmds replacement working on an in-memory scene."""
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.nodes = {}
+        self.roots = []
+        self.by_name = collections.defaultdict(list)
+        self.selection = []
+        self.calls = collections.Counter()
+        self.undo_chunks = []
+        self.scene_name = ""
+        self._uuid_counter = itertools.count(1)
+
+    # Internal helpers
+
+    def _count(self, name):
+        self.calls[name] += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def _new_uuid(self):
+        value = next(self._uuid_counter)
+        return f"{value:08X}-0000-0000-0000-{value:012X}"
+
+    def _long_name(self, node):
+        parts = []
+        while node is not None:
+            parts.append(node.name)
+            node = node.parent
+        return "|" + "|".join(reversed(parts))
+
+    def _display_name(self, node, long=False):
+        if long:
+            return self._long_name(node) if self._is_dag(node) else node.name
+        if not self._is_dag(node) or len(self.by_name[node.name]) == 1:
+            return node.name
+        # Shortest partial path that is unique in the scene
+        parts = self._long_name(node).split("|")[1:]
+        for size in range(2, len(parts) + 1):
+            candidate = "|".join(parts[-size:])
+            if len(self._resolve(candidate)) == 1:
+                return candidate
+        return self._long_name(node)
+
+    def _is_dag(self, node):
+        return is_type(node.node_type, "dagNode")
+
+    def _resolve(self, name):
+        """All nodes matching a short name, partial path, long name or UUID."""
+        if name in self.nodes:
+            return [self.nodes[name]]
+        if "|" not in name:
+            return list(self.by_name.get(name, ()))
+        parts = [part for part in name.split("|") if part]
+        if not parts:
+            return []
+        candidates = self.by_name.get(parts[-1], ())
+        matches = []
+        for node in candidates:
+            current = node
+            ok = True
+            for part in reversed(parts[:-1]):
+                current = current.parent
+                if current is None or current.name != part:
+                    ok = False
+                    break
+            if ok and (not name.startswith("|") or current.parent is None):
+                matches.append(node)
+        return matches
+
+    def _node(self, name):
+        matches = self._resolve(name)
+        if not matches:
+            raise ValueError(f"No object matches name: {name}")
+        if len(matches) > 1:
+            raise ValueError(f"More than one object matches name: {name}")
+        return matches[0]
+
+    def _unique_name(self, name, siblings):
+        taken = {sibling.name for sibling in siblings}
+        if name not in taken:
+            return name
+        stem = _TRAILING_DIGITS.sub("", name)
+        for index in itertools.count(1):
+            candidate = f"{stem}{index}"
+            if candidate not in taken:
+                return candidate
+
+    def _siblings(self, parent):
+        return parent.children if parent is not None else self.roots
+
+    def _walk(self, node):
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            yield current
+            stack.extend(reversed(current.children))
+
+    # Scene construction
+
+    def createNode(self, node_type, name=None, parent=None):
+        self._count("createNode")
+        parent_node = self._node(parent) if parent else None
+        if name is None:
+            name = f"{node_type}1"
+        is_dag = is_type(node_type, "dagNode")
+        if is_dag:
+            name = self._unique_name(name, self._siblings(parent_node))
+        elif name in self.by_name:
+            name = self._unique_name(name, [node for nodes in self.by_name.values() for node in nodes])
+        node = FakeNode(self._new_uuid(), name, node_type, parent_node if is_dag else None)
+        self.nodes[node.uuid] = node
+        self.by_name[name].append(node)
+        if is_dag:
+            self._siblings(parent_node).append(node)
+        return self._display_name(node)
+
+    def delete(self, *names):
+        self._count("delete")
+        for name in _as_list(names):
+            for match in self._resolve(name):
+                for node in list(self._walk(match)):
+                    if node.uuid not in self.nodes:
+                        continue
+                    del self.nodes[node.uuid]
+                    self.by_name[node.name].remove(node)
+                    if not self.by_name[node.name]:
+                        del self.by_name[node.name]
+                for object_set in self.nodes.values():
+                    if object_set.members is not None:
+                        object_set.members = [uuid for uuid in object_set.members if uuid in self.nodes]
+                self._siblings(match.parent).remove(match)
+
+    # Queries
+
+    def objExists(self, name):
+        self._count("objExists")
+        return bool(self._resolve(name))
+
+    def objectType(self, name, isType=None):
+        self._count("objectType")
+        node = self._node(name)
+        if isType is not None:
+            return node.node_type == isType
+        return node.node_type
+
+    def nodeType(self, name):
+        self._count("nodeType")
+        return self._node(name).node_type
+
+    def ls(self, *names, type=None, exactType=None, long=False, assemblies=False,
+           selection=False, uuid=False, dag=False, transforms=False, shapes=False, sl=False,
+           showType=False):
+        self._count("ls")
+        if selection or sl:
+            nodes = [self.nodes[key] for key in self.selection if key in self.nodes]
+        elif _as_list(names):
+            nodes = []
+            seen = set()
+            for name in _as_list(names):
+                for node in self._resolve(name):
+                    if node.uuid not in seen:
+                        seen.add(node.uuid)
+                        nodes.append(node)
+        elif assemblies:
+            nodes = list(self.roots)
+        else:
+            nodes = [node for root in self.roots for node in self._walk(root)]
+            nodes.extend(node for node in self.nodes.values() if not self._is_dag(node))
+
+        if assemblies and names:
+            nodes = [node for node in nodes if node.parent is None and self._is_dag(node)]
+        if dag:
+            nodes = [node for node in nodes if self._is_dag(node)]
+        if transforms:
+            nodes = [node for node in nodes if is_type(node.node_type, "transform")]
+        if shapes:
+            nodes = [node for node in nodes if is_type(node.node_type, "shape")]
+        if type is not None:
+            wanted = _as_list([type])
+            nodes = [node for node in nodes if any(is_type(node.node_type, item) for item in wanted)]
+        if exactType is not None:
+            wanted = set(_as_list([exactType]))
+            nodes = [node for node in nodes if node.node_type in wanted]
+        if uuid:
+            return [node.uuid for node in nodes]
+        if showType:
+            # Like Maya, names and types alternate in one flat list
+            return [item for node in nodes for item in (self._display_name(node, long), node.node_type)]
+        return [self._display_name(node, long) for node in nodes]
+
+    def listRelatives(self, *names, children=False, parent=False, allDescendents=False,
+                      shapes=False, type=None, fullPath=False, path=False):
+        self._count("listRelatives")
+        results = []
+        seen = set()
+        for name in _as_list(names):
+            node = self._node(name)
+            if parent:
+                related = [node.parent] if node.parent is not None else []
+            elif allDescendents:
+                related = [child for root in node.children for child in self._walk(root)]
+                related.reverse()
+            else:
+                related = list(node.children)
+            for relative in related:
+                if relative.uuid in seen:
+                    continue
+                if shapes and not is_type(relative.node_type, "shape"):
+                    continue
+                if type is not None and not any(is_type(relative.node_type, item) for item in _as_list([type])):
+                    continue
+                seen.add(relative.uuid)
+                results.append(relative)
+        if not results:
+            # Like Maya, an empty result is None rather than an empty list
+            return None
+        return [self._display_name(node, fullPath or path) for node in results]
+
+    def xform(self, *names, q=False, query=False, ws=False, worldSpace=False,
+              boundingBox=False, translation=False, t=False):
+        """Query world bounding boxes or translations, flattened like Maya for several objects."""
+        self._count("xform")
+        if not (q or query):
+            raise NotImplementedError("FakeCmds.xform only supports queries.")
+        values = []
+        for name in _as_list(names):
+            bbox = self._node(name).bbox
+            if boundingBox:
+                values.extend(bbox)
+            else:
+                values.extend(((bbox[0] + bbox[3]) / 2, (bbox[1] + bbox[4]) / 2, (bbox[2] + bbox[5]) / 2))
+        return values
+
+    def set_bounding_box(self, name, bbox):
+        """Fake-only helper placing a node's world bounding box."""
+        self._node(name).bbox = tuple(float(value) for value in bbox)
+
+    # Edits
+
+    def rename(self, old_name, new_name):
+        self._count("rename")
+        node = self._node(old_name)
+        if not new_name or "|" in new_name:
+            raise RuntimeError(f"New name is not legal: {new_name}")
+        if self._is_dag(node):
+            siblings = [sibling for sibling in self._siblings(node.parent) if sibling is not node]
+        else:
+            siblings = [other for nodes in self.by_name.values() for other in nodes
+                        if other is not node and not self._is_dag(other)]
+        new_name = self._unique_name(new_name, siblings)
+        self.by_name[node.name].remove(node)
+        if not self.by_name[node.name]:
+            del self.by_name[node.name]
+        node.name = new_name
+        self.by_name[new_name].append(node)
+        return self._display_name(node)
+
+    def parent(self, *names, world=False):
+        """Move DAG nodes under the last name given, or to the world. Returns their new names."""
+        self._count("parent")
+        names = _as_list(names)
+        if world:
+            new_parent = None
+        else:
+            names, new_parent = names[:-1], self._node(names[-1])
+        moved = []
+        for name in names:
+            node = self._node(name)
+            self._siblings(node.parent).remove(node)
+            new_name = self._unique_name(node.name, self._siblings(new_parent))
+            if new_name != node.name:
+                self.by_name[node.name].remove(node)
+                if not self.by_name[node.name]:
+                    del self.by_name[node.name]
+                node.name = new_name
+                self.by_name[new_name].append(node)
+            node.parent = new_parent
+            self._siblings(new_parent).append(node)
+            moved.append(self._display_name(node))
+        return moved
+
+    def select(self, *names, clear=False, add=False):
+        self._count("select")
+        if clear:
+            self.selection = []
+            return
+        nodes = [self._node(name).uuid for name in _as_list(names)]
+        self.selection = (self.selection + nodes) if add else nodes
+
+    def sets(self, *objects, q=False, query=False, name=None, addElement=None, remove=None,
+             clear=None, isMember=None, empty=False):
+        self._count("sets")
+        objects = _as_list(objects)
+        if q or query:
+            object_set = self._node(objects[0])
+            members = [self.nodes[uuid] for uuid in object_set.members]
+            return [self._display_name(node) for node in members] or None
+        if clear is not None:
+            self._node(clear).members = []
+            return None
+        if addElement is not None:
+            object_set = self._node(addElement)
+            existing = set(object_set.members)
+            for obj in objects:
+                uuid = self._node(obj).uuid
+                if uuid not in existing:
+                    existing.add(uuid)
+                    object_set.members.append(uuid)
+            return None
+        if remove is not None:
+            object_set = self._node(remove)
+            removed = {self._node(obj).uuid for obj in objects}
+            object_set.members = [uuid for uuid in object_set.members if uuid not in removed]
+            return None
+        if isMember is not None:
+            object_set = self._node(isMember)
+            return all(self._node(obj).uuid in object_set.members for obj in objects)
+        set_name = self.createNode("objectSet", name=name or "set1")
+        if not empty:
+            members = objects or [self._long_name(self.nodes[uuid]) for uuid in self.selection]
+            self.sets(members, addElement=set_name)
+        return set_name
+
+    def undoInfo(self, openChunk=False, closeChunk=False, chunkName=None, q=False, state=None):
+        self._count("undoInfo")
+        if openChunk:
+            self.undo_chunks.append(chunkName or "")
+        elif closeChunk:
+            if not self.undo_chunks:
+                raise RuntimeError("No undo chunk is open.")
+            self.undo_chunks.pop()
+        return True
+
+    def file(self, q=False, query=False, sceneName=False):
+        self._count("file")
+        if (q or query) and sceneName:
+            return self.scene_name
+        raise NotImplementedError("FakeCmds.file only answers sceneName queries.")
+
+
+def install(fake_cmds):
+    """Register fake_cmds as `maya.cmds` in sys.modules and return it."""
+    maya_module = sys.modules.get("maya")
+    if maya_module is None:
+        maya_module = types.ModuleType("maya")
+        sys.modules["maya"] = maya_module
+    maya_module.cmds = fake_cmds
+    sys.modules["maya.cmds"] = fake_cmds
+    return fake_cmds
+
+
+def build_scene(cmds, count, group_size=50, shape_ratio=0.5, set_name="renameSet"):
+    """Fill cmds with `count` mesh transforms under groups and one set holding them.
+
+    A `shape_ratio` fraction of the set members are added as their mesh shape,
+    the rest as the transform. Returns the set name.
+    """
+    members = []
+    group = None
+    for index in range(count):
+        if index % group_size == 0:
+            group = cmds.createNode("transform", name=f"grp{index // group_size}")
+        transform = cmds.createNode("transform", name=f"node{index}", parent=group)
+        shape = cmds.createNode("mesh", name=f"node{index}Shape", parent=f"{group}|{transform}")
+        use_shape = (index * shape_ratio) % 1 + shape_ratio >= 1
+        members.append(f"{group}|{transform}|{shape}" if use_shape else f"{group}|{transform}")
+    object_set = cmds.sets(members, name=set_name)
+    cmds.calls.clear()
+    return object_set
+
+
+def build_synthetic_scene(cmds, count, depth=3, branching=10, set_count=1, set_size=None,
+                          invalid_ratio=0.5, shape_ratio=0.5, seed=0):
+    """Fill cmds with `count` mesh transforms nested `depth` groups deep.
+
+    Groups split `branching` ways at every level. An `invalid_ratio` fraction
+    of the transforms break the naming convention, with names whose suggested
+    fix is unique in the scene. `set_count` sets each hold `set_size` random
+    members (all of them by default), a `shape_ratio` fraction of them given
+    as their mesh shape. Returns the set names.
+    """
+    import random
+
+    rng = random.Random(seed)
+    # Group names are unique, so each long name is its parent's plus the leaf
+    groups = [""]
+    for level in range(depth):
+        groups = [f"{parent}|" + cmds.createNode("transform", name=f"L{level}_{index}", parent=parent or None)
+                  for index, parent in enumerate(parent for parent in groups for _ in range(branching))]
+
+    transforms = []
+    shapes = []
+    for index in range(count):
+        parent = groups[index % len(groups)]
+        name = f"mesh{index}" if rng.random() < invalid_ratio else f"C_part{index}_GEO"
+        transform = cmds.createNode("transform", name=name, parent=parent or None)
+        long_name = f"{parent}|{transform}"
+        shape = cmds.createNode("mesh", name=f"{name}Shape", parent=long_name)
+        transforms.append(long_name)
+        shapes.append(f"{long_name}|{shape}")
+
+    set_names = []
+    for set_index in range(set_count):
+        size = count if set_size is None else min(set_size, count)
+        picked = range(count) if size == count else sorted(rng.sample(range(count), size))
+        members = [shapes[index] if rng.random() < shape_ratio else transforms[index] for index in picked]
+        set_names.append(cmds.sets(members, name=f"renameSet{set_index + 1}"))
+    cmds.calls.clear()
+    return set_names
+
+
+def build_classified_scene(cmds, count, seed=0, set_name="classifySet"):
+    """Fill cmds with badly named nodes of known side and type.
+
+    Meshes, curve controls and joints are placed left, right or on the
+    centre line. Returns (set name, {long name: (side, type)}) so classifier
+    accuracy can be measured.
+    """
+    import random
+
+    rng = random.Random(seed)
+    expected = {}
+    members = []
+    group = cmds.createNode("transform", name="classify_grp")
+    for index in range(count):
+        kind = rng.choice(("mesh", "nurbsCurve", "joint"))
+        side = rng.choice(("L", "R", "C"))
+        x = {"L": rng.uniform(0.5, 10.0), "R": -rng.uniform(0.5, 10.0), "C": rng.uniform(-0.05, 0.05)}[side]
+        half = rng.uniform(0.05, 0.4)
+        bbox = (x - half, 0.0, -half, x + half, 2 * half, half)
+        if kind == "joint":
+            node = cmds.createNode("joint", name=f"bone{index}", parent=group)
+            node_type = "JNT"
+        else:
+            node = cmds.createNode("transform", name=f"thing{index}", parent=group)
+            cmds.createNode(kind, name=f"thing{index}Shape", parent=f"classify_grp|{node}")
+            node_type = "GEO" if kind == "mesh" else "CTRL"
+        long_name = f"|classify_grp|{node}"
+        cmds.set_bounding_box(long_name, bbox)
+        expected[long_name] = (side, node_type)
+        members.append(long_name)
+    object_set = cmds.sets(members, name=set_name)
+    cmds.calls.clear()
+    return object_set, expected
@@ -0,0 +1,240 @@
+"""Declarative naming grammars.
+
+A grammar file lists the tokens of a name in order, with a separator:
+
+    {
+        "separator": "_",
+        "tokens": [
+            {"name": "side", "values": ["L", "R", "C"], "default": "C"},
+            {"name": "name", "pattern": "[a-zA-Z0-9]+", "primary": true},
+            {"name": "index", "pattern": "[0-9]{2}", "clean": "[^0-9]", "optional": true},
+            {"name": "type", "values": ["GEO", "JNT", "CTRL"], "default": "GEO"}
+        ]
+    }
+
+Tokens either choose from `values` (shown as dropdowns) or match a free
+`pattern` (shown as line edits, `clean` removes illegal characters). Optional
+tokens and their separator may be left out. The primary token receives the
+whole name when a name does not parse.
+
+Each file is compiled once into a Grammar holding one regex for matching and
+parsing and a formatter, and cached by path and modification time.
+"""
+import functools
+import json
+import operator
+import os
+import re
+from array import array
+
+GRAMMAR_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "grammars")
+DEFAULT_GRAMMAR_PATH = os.path.join(GRAMMAR_DIR, "default.json")
+# Points at a per-show grammar file
+GRAMMAR_ENV_VAR = "PRTTM_NAMING_GRAMMAR"
+
+DEFAULT_CLEAN = r'[^a-zA-Z0-9]'
+
+
+class GrammarError(ValueError):
+    """Raised for malformed grammar files."""
+
+
+class Token:
+    __slots__ = ("name", "label", "values", "pattern", "clean_pattern", "optional", "default", "primary")
+
+    def __init__(self, name, label=None, values=None, pattern=None, clean=None,
+                 optional=False, default=None, primary=False):
+        # Token names become regex group names
+        if not isinstance(name, str) or not name.isidentifier():
+            raise GrammarError(f"Token name {name!r} must be a valid identifier.")
+        if not values and not pattern:
+            raise GrammarError(f"Token '{name}' needs either 'values' or 'pattern'.")
+        try:
+            if pattern:
+                re.compile(pattern)
+            clean_pattern = None if values else re.compile(clean or DEFAULT_CLEAN)
+        except (re.error, TypeError) as e:
+            raise GrammarError(f"Token '{name}' has an invalid pattern: {e}") from e
+        self.name = name
+        self.label = label or name.capitalize()
+        self.values = tuple(values) if values else None
+        self.pattern = pattern
+        self.clean_pattern = clean_pattern
+        self.optional = optional
+        self.primary = primary
+        if default is None and self.values and not optional:
+            default = self.values[0]
+        self.default = default or ""
+
+    @property
+    def is_choice(self):
+        return self.values is not None
+
+    @property
+    def choices(self):
+        """Values a dropdown offers, with '' first for optional tokens."""
+        if self.values is None:
+            return None
+        return (("",) + self.values) if self.optional else self.values
+
+    def regex(self):
+        if self.values:
+            # Longest first so a value is never cut short by one of its prefixes
+            return "|".join(re.escape(value) for value in sorted(self.values, key=len, reverse=True))
+        return self.pattern
+
+    def clean(self, value):
+        if self.clean_pattern is None:
+            return value
+        return self.clean_pattern.sub("", value)
+
+
+class Grammar:
+    """Compiled matcher, parser and formatter for one naming convention."""
+
+    def __init__(self, tokens, separator="_"):
+        if not tokens:
+            raise GrammarError("A grammar needs at least one token.")
+        names = [token.name for token in tokens]
+        if len(set(names)) != len(names):
+            raise GrammarError("Token names must be unique.")
+        self.tokens = tuple(tokens)
+        self.separator = separator
+        self.token_names = tuple(names)
+        primary = [index for index, token in enumerate(tokens) if token.primary]
+        if not primary:
+            primary = [index for index, token in enumerate(tokens) if not token.is_choice][:1]
+        if not primary:
+            raise GrammarError("A grammar needs a primary free-text token.")
+        if all(token.optional for token in tokens):
+            raise GrammarError("A grammar needs at least one required token.")
+        self.primary_index = primary[0]
+        try:
+            self.pattern = re.compile(self._build_regex())
+        except re.error as e:
+            raise GrammarError(f"Invalid grammar: {e}") from e
+        # Token values are read by group name, patterns may hold groups of their own
+        self._values = operator.itemgetter(*names) if len(names) > 1 else (lambda groups: (groups[names[0]],))
+        defaults = tuple(token.default for token in self.tokens)
+        self._fallback_head = defaults[:self.primary_index]
+        self._fallback_tail = defaults[self.primary_index + 1:]
+
+    @classmethod
+    def from_dict(cls, config):
+        try:
+            tokens = [Token(**spec) for spec in config["tokens"]]
+        except (KeyError, TypeError) as e:
+            raise GrammarError(f"Invalid grammar: {e}") from e
+        return cls(tokens, config.get("separator", "_"))
+
+    def _build_regex(self):
+        sep = re.escape(self.separator)
+        parts = []
+        # Optional tokens before the first required one carry the separator after them
+        leading = True
+        for token in self.tokens:
+            group = f"(?P<{token.name}>{token.regex()})"
+            if leading:
+                if token.optional:
+                    parts.append(f"(?:{group}{sep})?")
+                    continue
+                leading = False
+                parts.append(group)
+            elif token.optional:
+                parts.append(f"(?:{sep}{group})?")
+            else:
+                parts.append(f"{sep}{group}")
+        return "".join(parts)
+
+    def token(self, name):
+        return self.tokens[self.token_names.index(name)]
+
+    def token_values(self, name):
+        """Allowed values of a choice token, for dropdowns."""
+        return self.token(name).values
+
+    # Single names
+
+    def validate(self, name):
+        return self.pattern.fullmatch(name) is not None
+
+    def parse(self, name):
+        """Token values of a valid name ('' for omitted optional tokens), or None."""
+        match = self.pattern.fullmatch(name)
+        if match is None:
+            return None
+        return self._values(match.groupdict(""))
+
+    def fallback(self, name):
+        """Token values shown for a name that does not parse."""
+        return self._fallback_head + (name,) + self._fallback_tail
+
+    def format(self, values):
+        """Join token values, cleaning free-text tokens and skipping empty optional ones."""
+        parts = []
+        for token, value in zip(self.tokens, values):
+            value = token.clean(value)
+            if value or not token.optional:
+                parts.append(value)
+        return self.separator.join(parts)
+
+    # Bulk
+
+    def validate_many(self, names):
+        fullmatch = self.pattern.fullmatch
+        return array('B', [fullmatch(name) is not None for name in names])
+
+    def parse_many(self, names):
+        """Parse names into (valid mask, one column per token).
+
+        Names that do not parse get their fallback values.
+        """
+        names = names if isinstance(names, list) else list(names)
+        fullmatch = self.pattern.fullmatch
+        matches = [fullmatch(name) for name in names]
+        valid = array('B', [match is not None for match in matches])
+        head = self._fallback_head
+        tail = self._fallback_tail
+        values = self._values
+        rows = [head + (name,) + tail if match is None else values(match.groupdict(""))
+                for name, match in zip(names, matches)]
+        # Transposing in C is much cheaper than appending to one list per token
+        columns = [list(column) for column in zip(*rows)] if rows else [[] for _ in self.tokens]
+        return valid, columns
+
+    def format_many(self, columns):
+        """Format parallel token columns into names."""
+        cleaned = []
+        for token, column in zip(self.tokens, columns):
+            if token.clean_pattern is None:
+                cleaned.append(column)
+            else:
+                sub = token.clean_pattern.sub
+                cleaned.append([sub("", value) for value in column])
+        optional = [token.optional for token in self.tokens]
+        sep = self.separator
+        if not any(optional):
+            return [sep.join(values) for values in zip(*cleaned)]
+        return [sep.join(value for value, is_optional in zip(values, optional) if value or not is_optional)
+                for values in zip(*cleaned)]
+
+
+@functools.lru_cache(maxsize=None)
+def _load(path, mtime):
+    with open(path, "r", encoding="utf-8") as handle:
+        try:
+            config = json.load(handle)
+        except ValueError as e:
+            raise GrammarError(f"Invalid grammar file '{path}': {e}") from e
+    return Grammar.from_dict(config)
+
+
+def load_grammar(path=DEFAULT_GRAMMAR_PATH):
+    """Compile a grammar file, reusing the compiled grammar while the file is unchanged."""
+    path = os.path.abspath(path)
+    return _load(path, os.path.getmtime(path))
+
+
+def active_grammar():
+    """Grammar named by the PRTTM_NAMING_GRAMMAR variable, or the default one."""
+    return load_grammar(os.environ.get(GRAMMAR_ENV_VAR) or DEFAULT_GRAMMAR_PATH)
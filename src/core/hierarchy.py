@@ -0,0 +1,186 @@
+"""Scene hierarchy loaded with one bulk query.
+
+HierarchyIndex turns the long paths of every transform into compact
+parent/children arrays keyed by integer node ids, so views can walk any
+branch without going back to Maya. Scene changes are patched in with add,
+move and remove: ids are never reused, a removed node keeps its slot with
+its path set to None.
+"""
+import bisect
+import collections
+from array import array
+
+ROOT = -1
+
+
+class HierarchyIndex:
+    """Parent -> children index over long DAG paths."""
+
+    __slots__ = ("paths", "names", "parents", "removed", "_children", "_by_path")
+
+    def __init__(self):
+        self.paths = []
+        self.names = []
+        self.parents = array('i')
+        # Number of removed slots
+        self.removed = 0
+        self._children = collections.defaultdict(list)
+        self._by_path = {}
+
+    @classmethod
+    def from_paths(cls, long_paths):
+        """Build the index from long names in any order.
+
+        Children of every node end up sorted by their short name.
+        """
+        index = cls()
+        paths = list(dict.fromkeys(long_paths))
+        by_path = index._by_path
+        for node_id, path in enumerate(paths):
+            by_path[path] = node_id
+        for path in paths:
+            parent, _, name = path.rpartition("|")
+            parent_id = by_path.get(parent, ROOT)
+            index.paths.append(path)
+            index.names.append(name)
+            index.parents.append(parent_id)
+        children = index._children
+        for node_id, parent_id in enumerate(index.parents):
+            children[parent_id].append(node_id)
+        for siblings in children.values():
+            siblings.sort(key=index.names.__getitem__)
+        return index
+
+    def __len__(self):
+        return len(self.paths)
+
+    def node_id(self, path):
+        return self._by_path.get(path)
+
+    def children(self, node_id=ROOT):
+        return self._children.get(node_id, ())
+
+    def has_children(self, node_id):
+        return bool(self._children.get(node_id))
+
+    def ancestors(self, node_id):
+        """Ids from node_id's parent up to its root."""
+        result = []
+        parent = self.parents[node_id]
+        while parent != ROOT:
+            result.append(parent)
+            parent = self.parents[parent]
+        return result
+
+    def _insert_child(self, parent_id, node_id):
+        siblings = self._children[parent_id]
+        names = self.names
+        row = bisect.bisect_right([names[sibling] for sibling in siblings], names[node_id])
+        siblings.insert(row, node_id)
+
+    def _detach(self, node_id):
+        siblings = self._children.get(self.parents[node_id])
+        if siblings is not None:
+            siblings.remove(node_id)
+
+    def add(self, path):
+        """Index a new node under its parent, returns its id.
+
+        Parents must be added before their children.
+        """
+        node_id = self._by_path.get(path)
+        if node_id is not None:
+            return node_id
+        parent, _, name = path.rpartition("|")
+        node_id = len(self.paths)
+        self._by_path[path] = node_id
+        self.paths.append(path)
+        self.names.append(name)
+        self.parents.append(self._by_path.get(parent, ROOT))
+        self._insert_child(self.parents[node_id], node_id)
+        return node_id
+
+    def move(self, node_id, path):
+        """Rename or reparent a node, the paths of its descendants follow.
+
+        The new parent must already be indexed under its current path.
+        """
+        old_path = self.paths[node_id]
+        if path == old_path:
+            return
+        parent, _, name = path.rpartition("|")
+        self._detach(node_id)
+        self.names[node_id] = name
+        self.parents[node_id] = self._by_path.get(parent, ROOT)
+        self._insert_child(self.parents[node_id], node_id)
+        by_path = self._by_path
+        size = len(old_path)
+        for moved in self.subtree(node_id):
+            moved_path = path + self.paths[moved][size:]
+            # A node moved earlier in a swap may already own the old path
+            if by_path.get(self.paths[moved]) == moved:
+                del by_path[self.paths[moved]]
+            by_path[moved_path] = moved
+            self.paths[moved] = moved_path
+
+    def remove(self, node_id):
+        """Drop a node and its descendants, returns the ids removed."""
+        removed = self.subtree(node_id)
+        self._detach(node_id)
+        for removed_id in removed:
+            if self._by_path.get(self.paths[removed_id]) == removed_id:
+                del self._by_path[self.paths[removed_id]]
+            self._children.pop(removed_id, None)
+            self.paths[removed_id] = None
+            self.names[removed_id] = ""
+            self.parents[removed_id] = ROOT
+        self.removed += len(removed)
+        return removed
+
+    def subtree(self, node_id):
+        """node_id followed by all of its descendants."""
+        result = [node_id]
+        children = self._children
+        for current in result:
+            result.extend(children.get(current, ()))
+        return result
+
+
+def load_hierarchy(cmds):
+    """Query every transform once and index it."""
+    return HierarchyIndex.from_paths(cmds.ls(type='transform', long=True) or [])
+
+
+def apply_delta(cmds, hierarchy, delta):
+    """Patch the index for a sync.SceneDelta whose moved_nodes is empty.
+
+    Removed nodes are dropped, renamed and reparented ones moved, and added
+    transforms resolved with one query on their UUIDs. Returns the ids of the
+    nodes added, moved or removed and the ids of the nodes whose children
+    changed.
+    """
+    changed = []
+    branches = set()
+    for path in delta.removed_nodes:
+        node_id = hierarchy.node_id(path)
+        if node_id is not None:
+            branches.add(hierarchy.parents[node_id])
+            changed.extend(hierarchy.remove(node_id))
+
+    # Ids are looked up before anything moves, renamed keys are the paths before the burst
+    placements = [(new_path, hierarchy.node_id(old_path)) for old_path, new_path in delta.renamed.items()]
+    placements = [(path, node_id) for path, node_id in placements if node_id is not None]
+    if delta.added_nodes:
+        placements.extend((path, None) for path in cmds.ls(list(delta.added_nodes), type='transform', long=True) or [])
+    # Parents first, every final parent path is then indexed when its children are placed
+    placements.sort(key=lambda placement: placement[0].count("|"))
+    for path, node_id in placements:
+        if node_id is None:
+            node_id = hierarchy.add(path)
+        else:
+            branches.add(hierarchy.parents[node_id])
+            hierarchy.move(node_id, path)
+        branches.add(hierarchy.parents[node_id])
+        changed.append(node_id)
+    paths = hierarchy.paths
+    return changed, {node_id for node_id in branches if node_id == ROOT or paths[node_id] is not None}
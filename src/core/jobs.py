@@ -0,0 +1,130 @@
+"""Validation and preview work that can run off the main thread.
+
+A RowSnapshot is an immutable copy of the rows a job needs, taken on the
+main thread, so a worker never reads the live RowStore and never calls
+maya.cmds. Each job carries a JobToken from a Generation counter; starting
+a newer job advances the counter, which cancels the older one between
+batches and lets the receiver drop any batch it had already sent.
+"""
+import threading
+from array import array
+
+from .rows import STATUS_INVALID, STATUS_MODIFIED, STATUS_VALID
+
+DEFAULT_BATCH_SIZE = 2000
+
+
+class Generation:
+    """Counter shared by the jobs of one consumer, the newest job wins."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._value = 0
+
+    @property
+    def current(self):
+        return self._value
+
+    def advance(self):
+        """Cancel every outstanding job and return a token for the next one."""
+        with self._lock:
+            self._value += 1
+            return JobToken(self, self._value)
+
+    def is_current(self, value):
+        return value == self._value
+
+
+class JobToken:
+    __slots__ = ("generation", "value")
+
+    def __init__(self, generation, value):
+        self.generation = generation
+        self.value = value
+
+    @property
+    def cancelled(self):
+        return not self.generation.is_current(self.value)
+
+
+class RowSnapshot:
+    """Frozen copy of the original names and token values of some rows."""
+
+    __slots__ = ("grammar", "rows", "names", "columns")
+
+    def __init__(self, grammar, rows, names, columns):
+        self.grammar = grammar
+        self.rows = rows
+        self.names = names
+        self.columns = columns
+
+    def __len__(self):
+        return len(self.rows)
+
+    @classmethod
+    def from_store(cls, store, rows=None, first=None):
+        """Copy the given rows of a RowStore, or all of them.
+
+        Rows are in order, except that those also listed in first come first.
+        """
+        if rows is None and not first:
+            rows = range(len(store))
+            names = tuple(store.names)
+            # Choice columns are byte arrays, bytes() copies them in one go
+            columns = tuple(bytes(column) if isinstance(column, array) else tuple(column)
+                            for column in store.columns)
+        else:
+            rows = sorted(set(range(len(store)) if rows is None else rows))
+            if first:
+                wanted = set(rows)
+                first = [row for row in first if row in wanted]
+                leading = set(first)
+                rows = first + [row for row in rows if row not in leading]
+            store_names = store.names
+            names = tuple(store_names[row] for row in rows)
+            columns = tuple(tuple(column[row] for row in rows) for column in store.columns)
+        return cls(store.grammar, tuple(rows), names, columns)
+
+    def token_columns(self, start, stop):
+        """Token values of rows start to stop, choice indices turned into their text."""
+        values = []
+        for token, column in zip(self.grammar.tokens, self.columns):
+            part = column[start:stop]
+            if token.is_choice:
+                choices = token.choices
+                part = [choices[index] for index in part]
+            values.append(part)
+        return values
+
+
+class PreviewBatch:
+    """Statuses and composed names computed for a run of snapshot rows."""
+
+    __slots__ = ("rows", "statuses", "new_names")
+
+    def __init__(self, rows, statuses, new_names):
+        self.rows = rows
+        self.statuses = statuses
+        self.new_names = new_names
+
+    def __len__(self):
+        return len(self.rows)
+
+
+def preview_batches(snapshot, token=None, batch_size=DEFAULT_BATCH_SIZE):
+    """Validate the snapshot rows and compose their new names, one batch at a time.
+
+    Statuses follow RowStore.refresh_status. Stops early once token is cancelled.
+    """
+    grammar = snapshot.grammar
+    fullmatch = grammar.pattern.fullmatch
+    names = snapshot.names
+    for start in range(0, len(snapshot), batch_size):
+        if token is not None and token.cancelled:
+            return
+        stop = start + batch_size
+        new_names = grammar.format_many(snapshot.token_columns(start, stop))
+        statuses = [STATUS_INVALID if fullmatch(new_name) is None
+                    else STATUS_MODIFIED if new_name != name else STATUS_VALID
+                    for name, new_name in zip(names[start:stop], new_names)]
+        yield PreviewBatch(snapshot.rows[start:stop], statuses, new_names)
@@ -0,0 +1,316 @@
+"""Streaming renamer for Maya ASCII files, no Maya session needed.
+
+A file is read twice, one line at a time:
+
+* the first pass records the createNode statements (type, name, parent)
+  and decides the renames, with the grammar and the same sibling conflict
+  rules as the live tool;
+* the second pass copies the file, rewriting node names in createNode,
+  connectAttr, disconnectAttr, parent, select, sets and relationship
+  statements, so every reference to a renamed node stays consistent.
+
+Memory grows with the number of nodes, never with the size of the setAttr
+data, so multi-gigabyte files stream through.
+"""
+import collections
+import os
+import re
+import shutil
+import tempfile
+import time
+
+from .classify import classify_types
+from .rename_plan import RenameOp, plan_renames
+from .scene import leaf_name, parent_path
+
+# Nodes the tool renames, the same ones set members resolve to
+RENAMABLE_TYPES = frozenset(("transform", "joint"))
+
+# Maya writes these statements at the start of a line, setAttr data is indented
+REFERENCE_COMMANDS = ("connectAttr ", "disconnectAttr ", "parent ", "select ", "sets ", "relationship ")
+
+_QUOTED = re.compile(r'"((?:[^"\\]|\\.)*)"')
+_CREATE_TYPE = re.compile(r'createNode\s+(\S+)')
+_CREATE_NAME = re.compile(r'(\s-n\s+)"((?:[^"\\]|\\.)*)"')
+_CREATE_PARENT = re.compile(r'(\s-p\s+)"((?:[^"\\]|\\.)*)"')
+_CREATE_SHARED = re.compile(r'\s-(?:s|shared)(?=[\s;])')
+_SELECT_NE = re.compile(r'^(select\s+-ne\s+)([^\s";]+)')
+
+ENCODING = "utf-8"
+# Keeps undecodable bytes as they were when the file is written back
+ENCODING_ERRORS = "surrogateescape"
+
+
+class MaNodes:
+    """Nodes declared by one file, in createNode order."""
+
+    __slots__ = ("paths", "types", "shared", "shape_types", "_by_leaf")
+
+    def __init__(self):
+        self.paths = []
+        self.types = []
+        self.shared = []
+        self.shape_types = collections.defaultdict(list)
+        self._by_leaf = collections.defaultdict(list)
+
+    def __len__(self):
+        return len(self.paths)
+
+    def add(self, node_type, name, parent=None, shared=False):
+        """Record a createNode statement and return the node's long name."""
+        parent_long = "" if parent is None else (self.resolve(parent) or "|" + parent)
+        path = f"{parent_long}|{name}"
+        self.paths.append(path)
+        self.types.append(node_type)
+        self.shared.append(shared)
+        self._by_leaf[name].append(path)
+        if parent_long and node_type not in RENAMABLE_TYPES:
+            self.shape_types[parent_long].append(node_type)
+        return path
+
+    def resolve(self, reference):
+        """Long name of a node referenced by name or (partial) path, None if unknown or ambiguous."""
+        if reference.startswith("|"):
+            return reference if leaf_name(reference) in self._by_leaf else None
+        candidates = self._by_leaf.get(leaf_name(reference))
+        if not candidates:
+            return None
+        if "|" in reference:
+            suffix = "|" + reference
+            candidates = [path for path in candidates if path.endswith(suffix)]
+        return candidates[0] if len(candidates) == 1 else None
+
+
+class MaRenames:
+    """Rename map of one file plus the rules to rewrite references to it."""
+
+    __slots__ = ("renames", "conflicts", "_affected_leaves", "_final_counts")
+
+    def __init__(self, nodes, renames, conflicts=()):
+        self.renames = renames
+        self.conflicts = list(conflicts)
+        # Leaf names shared by several nodes once renamed must be written as full paths
+        counts = collections.Counter(leaf_name(path) for path in nodes.paths if path not in renames)
+        counts.update(renames.values())
+        self._final_counts = counts
+        # References to renamed nodes, and short references to untouched nodes
+        # whose name a rename now also gives to another node
+        self._affected_leaves = {leaf_name(path) for path in renames}
+        self._affected_leaves.update(name for name in set(renames.values()) if counts[name] > 1)
+
+    def __len__(self):
+        return len(self.renames)
+
+    def new_path(self, path):
+        """Long name of a node after every rename of the file."""
+        parts = path.split("|")
+        prefix = ""
+        for index in range(1, len(parts)):
+            prefix = f"{prefix}|{parts[index]}"
+            new_name = self.renames.get(prefix)
+            if new_name is not None:
+                parts[index] = new_name
+        return "|".join(parts)
+
+    def new_reference(self, reference, path):
+        """Reference to the node at path, written in the same form as reference."""
+        new_path = self.new_path(path)
+        if reference.startswith("|") or self._final_counts[leaf_name(new_path)] > 1:
+            return new_path
+        depth = reference.count("|") + 1
+        return "|".join(new_path.split("|")[-depth:])
+
+    def affects(self, reference):
+        """Cheap check ruling out references that touch no renamed node."""
+        affected = self._affected_leaves
+        return any(part in affected for part in reference.split("|"))
+
+
+def scan_file(path):
+    """First pass: collect the createNode statements of a file."""
+    nodes = MaNodes()
+    with open(path, "r", encoding=ENCODING, errors=ENCODING_ERRORS, newline="") as handle:
+        for line in handle:
+            if line.startswith("createNode "):
+                _add_node(nodes, line)
+    return nodes
+
+
+def _add_node(nodes, line):
+    node_type = _CREATE_TYPE.match(line).group(1)
+    name = _CREATE_NAME.search(line)
+    parent = _CREATE_PARENT.search(line)
+    return nodes.add(node_type, name.group(2) if name else "",
+                     parent.group(2) if parent else None,
+                     _CREATE_SHARED.search(line) is not None)
+
+
+def suggest_names(grammar, names, node_types):
+    """Grammar-valid names for badly named nodes: the UI's fallback tokens plus a classified type.
+
+    Returns None for names that stay invalid, for instance when nothing is
+    left of them once cleaned.
+    """
+    suggested = []
+    type_index = grammar.token_names.index("type") if "type" in grammar.token_names else None
+    types = classify_types(node_types, grammar.token("type").values) if type_index is not None else None
+    for index, name in enumerate(names):
+        tokens = list(grammar.fallback(name))
+        if types is not None and types[index] is not None:
+            tokens[type_index] = types[index]
+        new_name = grammar.format(tokens)
+        suggested.append(new_name if grammar.validate(new_name) else None)
+    return suggested
+
+
+def plan_file(nodes, grammar, mapping=None):
+    """Decide the renames of a scanned file.
+
+    Without a mapping every renamable node whose name does not follow the
+    grammar gets a suggested name. A mapping ({long or short name: new name})
+    renames exactly the nodes it lists. Renames that would collide with a
+    sibling are dropped and reported as conflicts.
+    """
+    candidates = []
+    for path, node_type, shared in zip(nodes.paths, nodes.types, nodes.shared):
+        name = leaf_name(path)
+        # Shared nodes are Maya's defaults, namespaced ones come from references
+        if shared or node_type not in RENAMABLE_TYPES or ":" in name:
+            continue
+        if mapping is not None:
+            new_name = mapping.get(path) or mapping.get(name)
+            if new_name and new_name != name:
+                candidates.append((path, new_name))
+        elif not grammar.validate(name):
+            candidates.append((path, node_type))
+
+    if mapping is None and candidates:
+        paths = [path for path, _ in candidates]
+        node_types = [[node_type] + nodes.shape_types.get(path, []) for path, node_type in candidates]
+        suggested = suggest_names(grammar, [leaf_name(path) for path in paths], node_types)
+        candidates = [(path, new_name) for path, new_name in zip(paths, suggested) if new_name]
+
+    siblings = collections.defaultdict(set)
+    for path in nodes.paths:
+        siblings[parent_path(path)].add(leaf_name(path))
+    ops = [RenameOp(path, parent_path(path), leaf_name(path), new_name) for path, new_name in candidates]
+    plan = plan_renames(ops, siblings)
+    rejected = {path for path, _, _ in plan.conflicts}
+    renames = {path: new_name for path, new_name in candidates if path not in rejected}
+    return MaRenames(nodes, renames, plan.conflicts)
+
+
+def rewrite_file(source, destination, nodes, renames):
+    """Second pass: copy source to destination with every renamed node rewritten.
+
+    Returns the number of lines changed.
+    """
+    paths = iter(nodes.paths)
+    changed = 0
+    with open(source, "r", encoding=ENCODING, errors=ENCODING_ERRORS, newline="") as reader, \
+            open(destination, "w", encoding=ENCODING, errors=ENCODING_ERRORS, newline="") as writer:
+        for line in reader:
+            if line.startswith("createNode "):
+                new_line = _rewrite_create(line, next(paths), renames)
+            elif line.startswith(REFERENCE_COMMANDS):
+                new_line = _rewrite_references(line, nodes, renames)
+            else:
+                writer.write(line)
+                continue
+            if new_line is not line:
+                changed += 1
+            writer.write(new_line)
+    return changed
+
+
+def _rewrite_create(line, path, renames):
+    new_name = renames.renames.get(path)
+    parent = parent_path(path)
+    parent_match = _CREATE_PARENT.search(line) if parent else None
+    if new_name is None and not (parent_match and renames.affects(parent_match.group(2))):
+        return line
+    if parent_match:
+        new_parent = renames.new_reference(parent_match.group(2), parent)
+        line = f'{line[:parent_match.start(2)]}{new_parent}{line[parent_match.end(2):]}'
+    if new_name is not None:
+        name_match = _CREATE_NAME.search(line)
+        line = f'{line[:name_match.start(2)]}{new_name}{line[name_match.end(2):]}'
+    return line
+
+
+def _rewrite_reference(reference, nodes, renames):
+    node, dot, attribute = reference.partition(".")
+    if not node or not renames.affects(node):
+        return reference
+    path = nodes.resolve(node)
+    if path is None:
+        return reference
+    return renames.new_reference(node, path) + dot + attribute
+
+
+def _rewrite_references(line, nodes, renames):
+    def replace(match):
+        reference = match.group(1)
+        new_reference = _rewrite_reference(reference, nodes, renames)
+        return match.group(0) if new_reference is reference else f'"{new_reference}"'
+
+    new_line = _QUOTED.sub(replace, line)
+    if line.startswith("select "):
+        # select -ne writes its node unquoted
+        match = _SELECT_NE.match(new_line)
+        if match:
+            reference = match.group(2)
+            new_reference = _rewrite_reference(reference, nodes, renames)
+            if new_reference is not reference:
+                new_line = f"{match.group(1)}{new_reference}{new_line[match.end(2):]}"
+    return line if new_line == line else new_line
+
+
+class FileReport:
+    """Outcome of renaming one file, error is set when the file could not be renamed."""
+
+    __slots__ = ("path", "output", "nodes", "renamed", "conflicts", "lines_changed", "size", "seconds", "error")
+
+    def __init__(self, path, output, nodes, renamed, conflicts, lines_changed, size, seconds, error=None):
+        self.path = path
+        self.output = output
+        self.nodes = nodes
+        self.renamed = renamed
+        self.conflicts = conflicts
+        self.lines_changed = lines_changed
+        self.size = size
+        self.seconds = seconds
+        self.error = error
+
+    @classmethod
+    def failed(cls, path, error):
+        return cls(path, None, 0, {}, [], 0, 0, 0.0, f"{type(error).__name__}: {error}")
+
+
+def rename_file(path, grammar, output=None, mapping=None, dry_run=False):
+    """Rename the nodes of one .ma file, writing to output or in place.
+
+    The result is written to a temporary file next to the destination and
+    moved over it once complete, so an interrupted run never leaves a
+    truncated scene behind.
+    """
+    start = time.perf_counter()
+    nodes = scan_file(path)
+    renames = plan_file(nodes, grammar, mapping)
+    output = output or path
+    lines_changed = 0
+    if not dry_run and (renames or output != path):
+        directory = os.path.dirname(os.path.abspath(output))
+        os.makedirs(directory, exist_ok=True)
+        handle, temp_path = tempfile.mkstemp(suffix=".ma", dir=directory)
+        os.close(handle)
+        try:
+            lines_changed = rewrite_file(path, temp_path, nodes, renames)
+            shutil.copymode(path, temp_path)
+            os.replace(temp_path, output)
+        except BaseException:
+            os.remove(temp_path)
+            raise
+    return FileReport(path, None if dry_run else output, len(nodes), dict(renames.renames),
+                      renames.conflicts, lines_changed, os.path.getsize(path),
+                      time.perf_counter() - start)
@@ -0,0 +1,262 @@
+"""Rename plan manifests.
+
+A manifest records, for one selection set, the UUID, old name and new name
+of every pending rename, so edits can be reviewed, diffed and replayed on
+other shots. Two encodings are supported:
+
+* JSON Lines (.jsonl): a header object then one {"uuid", "old", "new"}
+  object per line, easy to read, grep and stream;
+* columnar (.rnp): a small JSON header then the three columns, each one
+  newline-joined UTF-8 block behind a length prefix and zlib compressed.
+  Loading is three decompress-and-split calls whatever the entry count.
+
+Both load into the same RenameManifest, whose new names by UUID feed
+straight into build_plan and apply_plan.
+"""
+import json
+import re
+import struct
+import zlib
+
+from .rename_plan import apply_plan, build_plan
+
+FORMAT_NAME = "prttm-rename-plan"
+FORMAT_VERSION = 1
+
+COLUMNAR_MAGIC = b"PRNP"
+COLUMNAR_EXTENSION = ".rnp"
+_COLUMNAR_HEADER = struct.Struct("<4sHI")
+_BLOCK_SIZE = struct.Struct("<I")
+
+# Maya node UUIDs, e.g. 7E4E4E38-4E1E-6D0E-9E2A-3B8E8A9D1C3F
+UUID_PATTERN = re.compile(r'[0-9A-F]{8}-[0-9A-F]{4}-[0-9A-F]{4}-[0-9A-F]{4}-[0-9A-F]{12}')
+
+
+class ManifestError(ValueError):
+    """Raised for unreadable or malformed manifest files."""
+
+
+class RenameManifest:
+    """Parallel uuid, old name and new name columns for one set."""
+
+    __slots__ = ("set_name", "uuids", "old_names", "new_names", "metadata")
+
+    def __init__(self, set_name="", uuids=(), old_names=(), new_names=(), metadata=None):
+        self.set_name = set_name
+        self.uuids = list(uuids)
+        self.old_names = list(old_names)
+        self.new_names = list(new_names)
+        if not len(self.uuids) == len(self.old_names) == len(self.new_names):
+            raise ManifestError("Manifest columns must have the same length.")
+        self.metadata = dict(metadata or {})
+
+    def __len__(self):
+        return len(self.uuids)
+
+    def __iter__(self):
+        return zip(self.uuids, self.old_names, self.new_names)
+
+    @classmethod
+    def from_store(cls, store, rows, uuids, set_name="", metadata=None):
+        """Manifest of the pending renames of some RowStore rows, uuids given per row."""
+        rows = list(rows)
+        return cls(set_name, uuids, [store.names[row] for row in rows], store.combined_names(rows), metadata)
+
+    def new_names_by_uuid(self):
+        return dict(zip(self.uuids, self.new_names))
+
+    def validate(self, grammar=None):
+        """Return (index, reason) for every entry that cannot be applied as is.
+
+        Without a grammar only the UUIDs and duplicates are checked.
+        """
+        problems = []
+        match = UUID_PATTERN.fullmatch
+        seen = set()
+        for index, uuid in enumerate(self.uuids):
+            if not isinstance(uuid, str) or match(uuid) is None:
+                problems.append((index, f"malformed uuid '{uuid}'"))
+            elif uuid in seen:
+                problems.append((index, f"uuid '{uuid}' listed twice"))
+            seen.add(uuid)
+        texts = [index for index, new_name in enumerate(self.new_names) if isinstance(new_name, str)]
+        if len(texts) < len(self.new_names):
+            problems.extend((index, f"new name {self.new_names[index]!r} is not text")
+                            for index in sorted(set(range(len(self.new_names))).difference(texts)))
+        if grammar is not None:
+            valid = grammar.validate_many([self.new_names[index] for index in texts])
+            problems.extend((index, f"'{self.new_names[index]}' does not follow the naming convention")
+                            for index, is_valid in zip(texts, valid) if not is_valid)
+        problems.sort()
+        return problems
+
+    def header(self):
+        header = {"format": FORMAT_NAME, "version": FORMAT_VERSION, "set": self.set_name, "count": len(self)}
+        header.update(self.metadata)
+        return header
+
+
+def _check_header(header, path):
+    if not isinstance(header, dict) or header.get("format") != FORMAT_NAME:
+        raise ManifestError(f"'{path}' is not a rename plan manifest.")
+    version = header.get("version", 0)
+    if not isinstance(version, int) or isinstance(version, bool):
+        raise ManifestError(f"'{path}' has an invalid format version: {version!r}.")
+    if version > FORMAT_VERSION:
+        raise ManifestError(f"'{path}' was written by a newer version (format {version}).")
+    metadata = {key: value for key, value in header.items() if key not in ("format", "version", "set", "count")}
+    return header.get("set", ""), metadata
+
+
+# JSON Lines
+
+def write_jsonl(manifest, path):
+    dumps = json.dumps
+    with open(path, "w", encoding="utf-8", newline="\n") as handle:
+        handle.write(dumps(manifest.header()) + "\n")
+        handle.writelines(dumps({"uuid": uuid, "old": old, "new": new}) + "\n" for uuid, old, new in manifest)
+
+
+def read_jsonl(path):
+    loads = json.loads
+    uuids = []
+    old_names = []
+    new_names = []
+    with open(path, "r", encoding="utf-8") as handle:
+        try:
+            set_name, metadata = _check_header(loads(handle.readline() or "null"), path)
+            for line_number, line in enumerate(handle, 2):
+                if not line.strip():
+                    continue
+                entry = loads(line)
+                try:
+                    uuid, old_name, new_name = entry["uuid"], entry.get("old", ""), entry["new"]
+                except (KeyError, TypeError, AttributeError) as e:
+                    raise ManifestError(f"'{path}' line {line_number}: missing {e}") from e
+                if not (isinstance(uuid, str) and isinstance(old_name, str) and isinstance(new_name, str)):
+                    raise ManifestError(f"'{path}' line {line_number}: uuid, old and new must be strings")
+                uuids.append(uuid)
+                old_names.append(old_name)
+                new_names.append(new_name)
+        except ValueError as e:
+            if isinstance(e, ManifestError):
+                raise
+            raise ManifestError(f"Invalid manifest '{path}': {e}") from e
+    return RenameManifest(set_name, uuids, old_names, new_names, metadata)
+
+
+# Columnar
+
+def _block(data):
+    return _BLOCK_SIZE.pack(len(data)) + data
+
+
+def write_columnar(manifest, path):
+    header = json.dumps(manifest.header()).encode("utf-8")
+    with open(path, "wb") as handle:
+        handle.write(_COLUMNAR_HEADER.pack(COLUMNAR_MAGIC, FORMAT_VERSION, len(manifest)))
+        handle.write(_block(header))
+        # Node names and UUIDs never contain newlines
+        for column in (manifest.uuids, manifest.old_names, manifest.new_names):
+            handle.write(_block(zlib.compress("\n".join(column).encode("utf-8"))))
+
+
+def _read_block(data, offset, path):
+    if offset + _BLOCK_SIZE.size > len(data):
+        raise ManifestError(f"'{path}' is truncated.")
+    (size,) = _BLOCK_SIZE.unpack_from(data, offset)
+    offset += _BLOCK_SIZE.size
+    if offset + size > len(data):
+        raise ManifestError(f"'{path}' is truncated.")
+    return data[offset:offset + size], offset + size
+
+
+def read_columnar(path):
+    with open(path, "rb") as handle:
+        data = handle.read()
+    if len(data) < _COLUMNAR_HEADER.size:
+        raise ManifestError(f"'{path}' is truncated.")
+    magic, version, count = _COLUMNAR_HEADER.unpack_from(data)
+    if magic != COLUMNAR_MAGIC:
+        raise ManifestError(f"'{path}' is not a rename plan manifest.")
+    offset = _COLUMNAR_HEADER.size
+    header, offset = _read_block(data, offset, path)
+    try:
+        set_name, metadata = _check_header(json.loads(header), path)
+    except ValueError as e:
+        if isinstance(e, ManifestError):
+            raise
+        raise ManifestError(f"Invalid manifest header in '{path}': {e}") from e
+    columns = []
+    for _ in range(3):
+        block, offset = _read_block(data, offset, path)
+        try:
+            text = zlib.decompress(block).decode("utf-8")
+        except (zlib.error, UnicodeDecodeError) as e:
+            raise ManifestError(f"Corrupt column in '{path}': {e}") from e
+        columns.append(text.split("\n") if count else [])
+    if any(len(column) != count for column in columns):
+        raise ManifestError(f"'{path}' declares {count} entries but its columns disagree.")
+    return RenameManifest(set_name, *columns, metadata)
+
+
+# Format dispatch
+
+def save_manifest(manifest, path):
+    """Write a manifest, columnar for .rnp paths and JSON Lines otherwise."""
+    if path.lower().endswith(COLUMNAR_EXTENSION):
+        write_columnar(manifest, path)
+    else:
+        write_jsonl(manifest, path)
+
+
+def load_manifest(path):
+    """Read a manifest in either format, detected from its first bytes."""
+    with open(path, "rb") as handle:
+        magic = handle.read(len(COLUMNAR_MAGIC))
+    if magic == COLUMNAR_MAGIC:
+        return read_columnar(path)
+    return read_jsonl(path)
+
+
+# Diff and apply
+
+class ManifestDiff:
+    """Entries added, removed or retargeted between two manifests, keyed by UUID.
+
+    added and removed hold (uuid, old_name, new_name), changed holds
+    (uuid, old_name, before, after).
+    """
+
+    __slots__ = ("added", "removed", "changed")
+
+    def __init__(self, added, removed, changed):
+        self.added = added
+        self.removed = removed
+        self.changed = changed
+
+    def __bool__(self):
+        return bool(self.added or self.removed or self.changed)
+
+
+def diff_manifests(before, after):
+    before_entries = {uuid: (old, new) for uuid, old, new in before}
+    after_entries = {uuid: (old, new) for uuid, old, new in after}
+    added = [(uuid, old, new) for uuid, old, new in after if uuid not in before_entries]
+    removed = [(uuid, old, new) for uuid, old, new in before if uuid not in after_entries]
+    changed = []
+    for uuid, old, new in after:
+        previous = before_entries.get(uuid)
+        if previous is not None and previous[1] != new:
+            changed.append((uuid, old, previous[1], new))
+    return ManifestDiff(added, removed, changed)
+
+
+def plan_manifest(cmds, manifest):
+    """Plan a manifest against the scene, nodes that no longer exist become conflicts."""
+    return build_plan(cmds, manifest.new_names_by_uuid())
+
+
+def apply_manifest(cmds, manifest, chunk_name="applyRenameManifest"):
+    """Plan and apply a manifest in one undo chunk, returns the number of nodes renamed."""
+    return apply_plan(cmds, plan_manifest(cmds, manifest), chunk_name)
@@ -0,0 +1,123 @@
+"""Compatibility layer for the former side_name_type naming engine.
+
+The naming convention now comes from grammar.py. These functions keep the
+old names and signatures for existing scripts but follow active_grammar(),
+so they agree with the tool under a show grammar. Tokens other than side,
+primary name and type take their defaults. New code should use the Grammar
+methods directly.
+"""
+from array import array
+
+from .grammar import active_grammar
+
+
+class ParseResult:
+    """Column-oriented result of parse_names."""
+
+    __slots__ = ("valid", "sides", "bases", "types")
+
+    def __init__(self, valid, sides, bases, types):
+        self.valid = valid
+        self.sides = sides
+        self.bases = bases
+        self.types = types
+
+    def __len__(self):
+        return len(self.valid)
+
+    def row(self, index):
+        return self.sides[index], self.bases[index], self.types[index]
+
+
+def __getattr__(name):
+    # The former module constants, read from the active grammar
+    grammar = active_grammar()
+    if name == "SIDES":
+        return grammar.token_values("side")
+    if name == "TYPES":
+        return grammar.token_values("type")
+    if name == "DEFAULT_SIDE":
+        return grammar.token("side").default
+    if name == "DEFAULT_TYPE":
+        return grammar.token("type").default
+    if name == "SEPARATOR":
+        return grammar.separator
+    if name == "NAME_PATTERN":
+        return grammar.pattern
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _indexes(grammar):
+    names = grammar.token_names
+    return names.index("side"), grammar.primary_index, names.index("type")
+
+
+def _token_values(grammar, side, base, node_type):
+    values = [token.default for token in grammar.tokens]
+    for index, value in zip(_indexes(grammar), (side, base, node_type)):
+        values[index] = value
+    return values
+
+
+def validate_name(name):
+    """Return True if name follows the naming convention."""
+    return active_grammar().validate(name)
+
+
+def clean_name(name):
+    """Remove illegal characters and spaces from a name token."""
+    grammar = active_grammar()
+    return grammar.tokens[grammar.primary_index].clean(name)
+
+
+def parse_name(name):
+    """Split a valid name into (side, base, type), or return None."""
+    grammar = active_grammar()
+    values = grammar.parse(name)
+    if values is None:
+        return None
+    return tuple(values[index] for index in _indexes(grammar))
+
+
+def compose_name(side, base, node_type):
+    """Build a full name from its tokens, cleaning the base token."""
+    grammar = active_grammar()
+    return grammar.format(_token_values(grammar, side, base, node_type))
+
+
+def validate_names(names):
+    """Return an array('B') mask with 1 for every valid name."""
+    return active_grammar().validate_many(names)
+
+
+def clean_names(names):
+    """Clean a list of name tokens."""
+    grammar = active_grammar()
+    clean = grammar.tokens[grammar.primary_index].clean
+    return [clean(name) for name in names]
+
+
+def parse_names(names):
+    """Parse names into columns.
+
+    Invalid names keep the full name as their base token and get the default
+    side and type, matching what the UI shows for them.
+    """
+    grammar = active_grammar()
+    valid, columns = grammar.parse_many(names)
+    side, base, node_type = _indexes(grammar)
+    return ParseResult(valid, columns[side], columns[base], columns[node_type])
+
+
+def compose_names(sides, bases, types):
+    """Compose full names for parallel token columns."""
+    grammar = active_grammar()
+    columns = [[token.default] * len(bases) for token in grammar.tokens]
+    for index, column in zip(_indexes(grammar), (sides, bases, types)):
+        columns[index] = column
+    return grammar.format_many(columns)
+
+
+def changed_mask(original_names, new_names):
+    """Return an array('B') mask with 1 where the new name differs."""
+    return array('B', [old != new for old, new in zip(original_names, new_names)])
@@ -0,0 +1,142 @@
+"""UUID-keyed cache of node long names and types.
+
+Rows and set members are identified by UUID, which survives renames and
+reparenting. The cache maps each UUID to the node's current long name and
+type, filled by two batched ls calls however many nodes are asked for.
+Scene deltas patch cached paths in place; entries that cannot be patched
+are only marked stale and re-resolved, again in one batch, the next time
+they are looked up. Lookups of fresh entries never query the scene.
+"""
+
+
+class NodeCache:
+    """uuid -> long name and node type, with a reverse long name -> uuid index."""
+
+    def __init__(self, cmds):
+        self.cmds = cmds
+        self._long_names = {}
+        self._types = {}
+        self._uuids = {}
+        self._stale = set()
+
+    def __len__(self):
+        return len(self._long_names)
+
+    def __contains__(self, uuid):
+        return uuid in self._long_names
+
+    def clear(self):
+        self._long_names.clear()
+        self._types.clear()
+        self._uuids.clear()
+        self._stale.clear()
+
+    def _store(self, uuid, long_name, node_type=None):
+        old_name = self._long_names.get(uuid)
+        if old_name is not None and self._uuids.get(old_name) == uuid:
+            del self._uuids[old_name]
+        self._long_names[uuid] = long_name
+        self._uuids[long_name] = uuid
+        if node_type is not None:
+            self._types[uuid] = node_type
+        self._stale.discard(uuid)
+
+    def _drop(self, uuid):
+        long_name = self._long_names.pop(uuid, None)
+        if long_name is not None and self._uuids.get(long_name) == uuid:
+            del self._uuids[long_name]
+        self._types.pop(uuid, None)
+        self._stale.discard(uuid)
+
+    def resolve(self, names):
+        """Cache the nodes matching names (long or short names, or UUIDs).
+
+        Returns (long names, uuids) of the nodes found, in ls order.
+        """
+        names = list(names)
+        if not names:
+            return [], []
+        cmds = self.cmds
+        flat = cmds.ls(names, long=True, showType=True) or []
+        long_names = flat[0::2]
+        if not long_names:
+            return [], []
+        uuids = cmds.ls(long_names, uuid=True) or []
+        for uuid, long_name, node_type in zip(uuids, long_names, flat[1::2]):
+            self._store(uuid, long_name, node_type)
+        return long_names, uuids
+
+    def uuids(self, long_names):
+        """UUID of each long name, None for names that match no node."""
+        long_names = list(long_names)
+        cached = self._uuids
+        stale = self._stale
+        unknown = [long_name for long_name in long_names
+                   if long_name not in cached or cached[long_name] in stale]
+        if unknown:
+            found = dict(zip(*self.resolve(unknown)))
+            for long_name in unknown:
+                uuid = cached.get(long_name)
+                if uuid is not None and long_name not in found:
+                    # The path now belongs to no node
+                    del cached[long_name]
+        return [cached.get(long_name) for long_name in long_names]
+
+    def long_names(self, uuids):
+        """Current long name of each UUID, None for nodes that no longer exist."""
+        uuids = list(uuids)
+        self.refresh([uuid for uuid in uuids if uuid is not None
+                      and (uuid in self._stale or uuid not in self._long_names)])
+        get = self._long_names.get
+        return [get(uuid) for uuid in uuids]
+
+    def long_name(self, uuid):
+        return self.long_names((uuid,))[0]
+
+    def node_types(self, uuids):
+        """Node type of each UUID, None for nodes that no longer exist."""
+        uuids = list(uuids)
+        self.refresh([uuid for uuid in uuids if uuid is not None
+                      and (uuid in self._stale or uuid not in self._types)])
+        get = self._types.get
+        return [get(uuid) for uuid in uuids]
+
+    def node_type(self, uuid):
+        return self.node_types((uuid,))[0]
+
+    def refresh(self, uuids):
+        """Re-resolve the given UUIDs in one batch, forgetting deleted nodes."""
+        uuids = list(dict.fromkeys(uuids))
+        if not uuids:
+            return
+        found = set(self.resolve(uuids)[1])
+        for uuid in uuids:
+            if uuid not in found:
+                self._drop(uuid)
+
+    def invalidate(self, uuids=None):
+        """Mark entries stale, every entry for None. They are refreshed on their next lookup."""
+        if uuids is None:
+            self._stale.update(self._long_names)
+        else:
+            self._stale.update(uuid for uuid in uuids if uuid in self._long_names)
+
+    def rename(self, uuid, long_name):
+        """Record a node's new long name, for renames made by the tool itself."""
+        if uuid in self._long_names:
+            self._store(uuid, long_name)
+
+    def apply_delta(self, delta):
+        """Patch cached paths for a sync.SceneDelta, marking what cannot be patched stale."""
+        if delta.moved_nodes:
+            # Reparented nodes take their descendants along, their old paths are unknown
+            self.invalidate()
+            return
+        if not (delta.renamed or delta.removed_nodes):
+            return
+        for uuid, long_name in list(self._long_names.items()):
+            new_name = delta.rename_path(long_name)
+            if new_name is None:
+                self._stale.add(uuid)
+            elif new_name != long_name:
+                self._store(uuid, new_name)
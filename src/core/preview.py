@@ -0,0 +1,77 @@
+"""Incremental aggregate preview of pending renames.
+
+The aggregator keeps the composed names of checked rows and the rows marked
+dirty since, so an edit only sends O(dirty rows) to the worker instead of
+the whole list. The batches the worker computes off the main thread
+(core/jobs.py) are merged with apply_batch. Rendering is capped to one page
+of names.
+"""
+import bisect
+
+from .rows import STATUS_MODIFIED
+
+DEFAULT_PAGE_SIZE = 100
+
+
+class PreviewAggregator:
+    """Tracks pending renames of a RowStore and renders them a page at a time."""
+
+    def __init__(self, page_size=DEFAULT_PAGE_SIZE):
+        self.page_size = page_size
+        self.names = {}
+        self._rows = []
+        self._dirty = set()
+
+    def __len__(self):
+        return len(self._rows)
+
+    def clear(self):
+        self.names = {}
+        self._rows = []
+        self._dirty.clear()
+
+    def mark_dirty(self, rows):
+        self._dirty.update(rows)
+
+    def take_dirty(self):
+        """Sorted dirty rows, which are no longer marked dirty."""
+        dirty = sorted(self._dirty)
+        self._dirty.clear()
+        return dirty
+
+    def apply_batch(self, batch):
+        """Merge a jobs.PreviewBatch. Returns True if the preview changed."""
+        changed = False
+        names = self.names
+        rows = self._rows
+        for row, status, new_name in zip(batch.rows, batch.statuses, batch.new_names):
+            if status == STATUS_MODIFIED:
+                if row not in names:
+                    # Batches arrive in row order, so this is usually an append
+                    if not rows or row > rows[-1]:
+                        rows.append(row)
+                    else:
+                        bisect.insort(rows, row)
+                elif names[row] == new_name:
+                    continue
+                names[row] = new_name
+                changed = True
+            elif row in names:
+                del names[row]
+                del rows[bisect.bisect_left(rows, row)]
+                changed = True
+        return changed
+
+    def page(self, index=0):
+        """Composed names shown on the given page, in row order."""
+        start = index * self.page_size
+        return [self.names[row] for row in self._rows[start:start + self.page_size]]
+
+    def render(self, index=0):
+        """Preview text for one page, with a count of what is not shown."""
+        names = self.page(index)
+        text = ", ".join(names)
+        hidden = len(self._rows) - len(names)
+        if hidden > 0:
+            text += f" ... (+{hidden} more)"
+        return text
@@ -0,0 +1,188 @@
+"""Opt-in profiling of Maya commands and tool phases.
+
+The tool marks its hot paths with `@profiled("populate")` and friends. While
+the profiler is disabled a phase is a flag check and commands go straight to
+maya.cmds, so nothing is measured and next to nothing is paid. Once enabled,
+commands are called through InstrumentedCmds and every call, phase and Qt
+layout pass (see views/profiling.py) is counted and timed under the phase it
+ran in.
+"""
+import functools
+import json
+import os
+import time
+
+# PRTTM_PROFILE=1 profiles a tool session, the report is printed when the tool
+# closes and written as JSON to PRTTM_PROFILE_REPORT if set
+PROFILE_ENV_VAR = "PRTTM_PROFILE"
+REPORT_ENV_VAR = "PRTTM_PROFILE_REPORT"
+
+KIND_PHASE = "phase"
+KIND_COMMAND = "cmds"
+KIND_QT = "qt"
+
+NO_PHASE = "-"
+
+
+class _NullPhase:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_PHASE = _NullPhase()
+
+
+class _Phase:
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.profiler._phases.append(self.name)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        elapsed = time.perf_counter() - self.start
+        self.profiler._phases.pop()
+        self.profiler.record(KIND_PHASE, self.name, elapsed, phase=self.name)
+        return False
+
+
+class Profiler:
+    """Counts and times events per (phase, kind, name)."""
+
+    def __init__(self):
+        self.enabled = False
+        self.stats = {}
+        self._phases = []
+
+    def phase(self, name):
+        """Context manager attributing everything inside it to phase `name`."""
+        if not self.enabled:
+            return _NULL_PHASE
+        return _Phase(self, name)
+
+    @property
+    def current_phase(self):
+        return self._phases[-1] if self._phases else NO_PHASE
+
+    def record(self, kind, name, seconds, phase=None):
+        key = (phase or self.current_phase, kind, name)
+        entry = self.stats.get(key)
+        if entry is None:
+            self.stats[key] = [1, seconds, seconds]
+        else:
+            entry[0] += 1
+            entry[1] += seconds
+            if seconds > entry[2]:
+                entry[2] = seconds
+
+    def reset(self):
+        self.stats.clear()
+
+    def instrument(self, cmds):
+        """Wrap a cmds module so each command is recorded while the profiler is enabled."""
+        if isinstance(cmds, InstrumentedCmds):
+            return cmds
+        return InstrumentedCmds(cmds, self)
+
+    # Reports
+
+    def rows(self):
+        """(phase, kind, name, count, total seconds, max seconds), slowest phases first."""
+        phase_totals = {}
+        for (phase, kind, name), (count, total, longest) in self.stats.items():
+            if kind == KIND_PHASE:
+                phase_totals[phase] = phase_totals.get(phase, 0.0) + total
+        kind_order = {KIND_PHASE: 0, KIND_COMMAND: 1, KIND_QT: 2}
+        return sorted(((phase, kind, name, count, total, longest)
+                       for (phase, kind, name), (count, total, longest) in self.stats.items()),
+                      key=lambda row: (-phase_totals.get(row[0], 0.0), row[0], kind_order.get(row[1], 3), -row[4]))
+
+    def report_json(self):
+        return {"entries": [{"phase": phase, "kind": kind, "name": name, "count": count,
+                             "total_ms": total * 1000, "max_ms": longest * 1000}
+                            for phase, kind, name, count, total, longest in self.rows()]}
+
+    def report_text(self):
+        lines = [f"{'phase':<12} {'kind':<6} {'name':<24} {'count':>8} {'total ms':>10} {'mean ms':>9} {'max ms':>9}"]
+        for phase, kind, name, count, total, longest in self.rows():
+            lines.append(f"{phase:<12} {kind:<6} {name:<24} {count:>8} {total * 1000:>10.2f} "
+                         f"{total * 1000 / count:>9.3f} {longest * 1000:>9.3f}")
+        return "\n".join(lines)
+
+    def write_json(self, path):
+        with open(path, "w", encoding="utf-8") as handle:
+            json.dump(self.report_json(), handle, indent=2)
+
+
+class InstrumentedCmds:
+    """Stand-in for a cmds module recording every command call."""
+
+    def __init__(self, cmds, profiler):
+        self.wrapped = cmds
+        self.profiler = profiler
+
+    def __getattr__(self, name):
+        attribute = getattr(self.wrapped, name)
+        if not callable(attribute):
+            return attribute
+        profiler = self.profiler
+        perf_counter = time.perf_counter
+
+        def command(*args, **kwargs):
+            if not profiler.enabled:
+                return attribute(*args, **kwargs)
+            start = perf_counter()
+            try:
+                return attribute(*args, **kwargs)
+            finally:
+                profiler.record(KIND_COMMAND, name, perf_counter() - start)
+
+        # Later lookups find the wrapper without going through __getattr__
+        setattr(self, name, command)
+        return command
+
+
+# Shared by every view, enabled through views.profiling.enable_profiling
+PROFILER = Profiler()
+
+
+def profiled(phase):
+    """Decorator running a method inside a profiler phase."""
+    def decorator(func):
+        # Qt only drops extra signal arguments for slots that cannot take them,
+        # so methods taking just self keep that signature
+        if func.__code__.co_argcount == 1 and not func.__code__.co_flags & 0x0C:
+            def wrapper(self):
+                if not PROFILER.enabled:
+                    return func(self)
+                with _Phase(PROFILER, phase):
+                    return func(self)
+        else:
+            def wrapper(*args, **kwargs):
+                if not PROFILER.enabled:
+                    return func(*args, **kwargs)
+                with _Phase(PROFILER, phase):
+                    return func(*args, **kwargs)
+        return functools.update_wrapper(wrapper, func)
+    return decorator
+
+
+def dump_report():
+    """Print the profile and write it to PRTTM_PROFILE_REPORT if set."""
+    if not PROFILER.stats:
+        return
+    print(PROFILER.report_text())
+    path = os.environ.get(REPORT_ENV_VAR)
+    if path:
+        PROFILER.write_json(path)
+        print(f"Profile written to {path}")
@@ -0,0 +1,101 @@
+"""Scene-wide name uniqueness checks.
+
+NameRegistry counts every short name in the scene, taken from one bulk ls
+(SceneSnapshot.scene_names), and every name proposed by the rows of a
+RowStore. Checking or updating a row is a few dictionary operations, so
+collisions can be flagged while the user types.
+"""
+import collections
+
+from .rows import STATUS_MODIFIED
+
+COLLISION_NONE = 0
+COLLISION_SCENE = 1
+COLLISION_BATCH = 2
+
+COLLISION_LABELS = ("", "Exists", "Duplicate")
+
+
+class NameRegistry:
+    """Hash index of scene names and of the names a batch wants to take."""
+
+    def __init__(self, scene_names=()):
+        self.scene_counts = collections.Counter(scene_names)
+        self._current = []
+        self._targets = []
+        self._by_target = collections.defaultdict(set)
+        self._leaving = collections.Counter()
+
+    def bind(self, store):
+        """Index the pending renames of every row in store."""
+        self._current = list(store.names)
+        self._targets = [None] * len(store)
+        self._by_target.clear()
+        self._leaving.clear()
+        rows = store.checked_rows()
+        for row, target in zip(rows, store.combined_names(rows)):
+            self._add(row, target)
+
+    def _add(self, row, target):
+        self._targets[row] = target
+        self._by_target[target].add(row)
+        # The row frees its current name once renamed
+        self._leaving[self._current[row]] += 1
+
+    def _remove(self, row):
+        target = self._targets[row]
+        self._targets[row] = None
+        rows = self._by_target[target]
+        rows.discard(row)
+        if not rows:
+            del self._by_target[target]
+        self._leaving[self._current[row]] -= 1
+        return target
+
+    def update(self, store, row, target=None):
+        """Re-index one row after an edit or a new status.
+
+        target is the row's composed name when it is already known, as in a
+        jobs.PreviewBatch. Returns the rows whose collision state may have
+        changed, including row, or nothing if the row keeps its target.
+        """
+        if store.status[row] != STATUS_MODIFIED:
+            target = None
+        elif target is None:
+            target = store.combined_name(row)
+        if target == self._targets[row]:
+            return set()
+        affected = {row}
+        if self._targets[row] is not None:
+            affected.update(self._by_target.get(self._remove(row), ()))
+        if target is not None:
+            self._add(row, target)
+            affected.update(self._by_target[target])
+        # Rows aiming at this row's current name depend on whether it leaves
+        affected.update(self._by_target.get(self._current[row], ()))
+        return affected
+
+    def target(self, row):
+        return self._targets[row]
+
+    def collision(self, row):
+        """COLLISION_* state of one row's pending rename."""
+        target = self._targets[row]
+        if target is None:
+            return COLLISION_NONE
+        if len(self._by_target[target]) > 1:
+            return COLLISION_BATCH
+        if self.scene_counts[target] - self._leaving[target] > 0:
+            return COLLISION_SCENE
+        return COLLISION_NONE
+
+    def summary(self):
+        """Return (scene_collisions, batch_duplicates) row counts for the batch."""
+        scene = 0
+        batch = 0
+        for target, rows in self._by_target.items():
+            if len(rows) > 1:
+                batch += len(rows)
+            elif self.scene_counts[target] - self._leaving[target] > 0:
+                scene += 1
+        return scene, batch
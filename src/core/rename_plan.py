@@ -0,0 +1,226 @@
+"""Collision-safe bulk renaming.
+
+Renames are planned before anything touches the scene:
+
+* two nodes under the same parent asking for the same name, or a name
+  already held by a sibling that is not renamed itself, are conflicts;
+* a node whose target is the current name of another renamed sibling waits
+  for that sibling (chains);
+* closed loops such as swaps go through a temporary name (cycles).
+
+Nodes are identified by UUID and resolved to long names once. Groups are
+executed deepest first, so renaming a parent never invalidates a long name
+that is still needed. The whole batch runs in one undo chunk and is rolled
+back if any rename fails.
+"""
+import collections
+import logging
+
+from .scene import leaf_name, parent_path
+
+logger = logging.getLogger(__name__)
+
+TEMP_PREFIX = "__renameTmp"
+
+
+class RenameError(RuntimeError):
+    """Raised when a planned rename does not land on the expected name."""
+
+
+class RenameOp:
+    __slots__ = ("uuid", "parent", "old_name", "new_name")
+
+    def __init__(self, uuid, parent, old_name, new_name):
+        self.uuid = uuid
+        self.parent = parent
+        self.old_name = old_name
+        self.new_name = new_name
+
+
+class RenamePlan:
+    """Ordered rename steps plus the requests that cannot be honoured.
+
+    steps holds (uuid, parent, from_name, to_name) tuples in execution order.
+    conflicts holds (uuid, new_name, reason) tuples.
+    """
+
+    __slots__ = ("steps", "conflicts")
+
+    def __init__(self):
+        self.steps = []
+        self.conflicts = []
+
+    def __len__(self):
+        return len(self.steps)
+
+    @property
+    def is_valid(self):
+        return not self.conflicts
+
+
+def plan_renames(ops, sibling_names):
+    """Order ops so no rename ever lands on a name that is still taken.
+
+    sibling_names maps a parent long name ('' for world) to the leaf names of
+    all its current children. Runs in O(len(ops)).
+    """
+    plan = RenamePlan()
+    groups = collections.defaultdict(list)
+    for op in ops:
+        if op.new_name != op.old_name:
+            groups[op.parent].append(op)
+
+    # Children before parents keeps every pending long name valid
+    for parent in sorted(groups, key=lambda path: path.count("|"), reverse=True):
+        _plan_group(plan, parent, groups[parent], sibling_names.get(parent, ()))
+    return plan
+
+
+def _plan_group(plan, parent, group, siblings):
+    by_old = {op.old_name: op for op in group}
+    by_target = collections.defaultdict(list)
+    for op in group:
+        by_target[op.new_name].append(op)
+
+    conflicted = set()
+    for target, targeting in by_target.items():
+        if len(targeting) > 1:
+            for op in targeting:
+                plan.conflicts.append((op.uuid, op.new_name, "duplicate name in batch"))
+                conflicted.add(op.uuid)
+        elif target in siblings and target not in by_old:
+            op = targeting[0]
+            plan.conflicts.append((op.uuid, op.new_name, "name already exists"))
+            conflicted.add(op.uuid)
+
+    # Each op waits on at most one other op (the sibling currently holding its
+    # target) and is waited on by at most one, so the graph is chains and cycles.
+    blocker = {}
+    dependent = {}
+    for op in group:
+        holder = by_old.get(op.new_name)
+        if holder is not None and holder is not op:
+            blocker[op.uuid] = holder
+            dependent[holder.uuid] = op
+
+    # Anything waiting on a conflicted op can never run either
+    pending = [op for op in group if op.uuid in conflicted]
+    while pending:
+        op = pending.pop()
+        waiting = dependent.get(op.uuid)
+        if waiting is not None and waiting.uuid not in conflicted:
+            conflicted.add(waiting.uuid)
+            plan.conflicts.append((waiting.uuid, waiting.new_name, f"blocked by '{op.old_name}'"))
+            pending.append(waiting)
+
+    done = set(conflicted)
+    ready = [op for op in group if op.uuid not in done and op.uuid not in blocker]
+    while ready:
+        op = ready.pop()
+        _emit_chain(plan, parent, op, dependent, done)
+
+    # Whatever is left forms closed cycles
+    taken = set(siblings)
+    taken.update(by_target)
+    temp_index = 0
+    for op in group:
+        if op.uuid in done:
+            continue
+        while f"{TEMP_PREFIX}{temp_index}" in taken:
+            temp_index += 1
+        temp_name = f"{TEMP_PREFIX}{temp_index}"
+        temp_index += 1
+        plan.steps.append((op.uuid, parent, op.old_name, temp_name))
+        done.add(op.uuid)
+        # Freeing op's old name lets the rest of the cycle unwind as a chain
+        waiting = dependent.get(op.uuid)
+        if waiting is not None and waiting.uuid not in done:
+            _emit_chain(plan, parent, waiting, dependent, done)
+        plan.steps.append((op.uuid, parent, temp_name, op.new_name))
+
+
+def _emit_chain(plan, parent, op, dependent, done):
+    while op is not None and op.uuid not in done:
+        plan.steps.append((op.uuid, parent, op.old_name, op.new_name))
+        done.add(op.uuid)
+        op = dependent.get(op.uuid)
+
+
+def resolve_uuids(cmds, uuids):
+    """Map UUIDs to current long names in two batched ls calls."""
+    uuids = list(uuids)
+    if not uuids:
+        return {}
+    long_names = cmds.ls(uuids, long=True)
+    if not long_names:
+        return {}
+    return dict(zip(cmds.ls(long_names, uuid=True), long_names))
+
+
+def query_rename_ops(cmds, new_names_by_uuid):
+    """Build RenameOps and the sibling name index for a uuid -> new name mapping.
+
+    Uses a constant number of queries regardless of the batch size.
+    """
+    long_names = resolve_uuids(cmds, new_names_by_uuid)
+    missing = [uuid for uuid in new_names_by_uuid if uuid not in long_names]
+    ops = []
+    parents = set()
+    for uuid, long_name in long_names.items():
+        parent = parent_path(long_name)
+        parents.add(parent)
+        ops.append(RenameOp(uuid, parent, leaf_name(long_name), new_names_by_uuid[uuid]))
+
+    sibling_names = collections.defaultdict(set)
+    dag_parents = [parent for parent in parents if parent]
+    if dag_parents:
+        for child in cmds.listRelatives(dag_parents, children=True, fullPath=True) or []:
+            sibling_names[parent_path(child)].add(leaf_name(child))
+    if "" in parents:
+        sibling_names[""].update(leaf_name(name) for name in cmds.ls(assemblies=True, long=True))
+    return ops, sibling_names, missing
+
+
+def build_plan(cmds, new_names_by_uuid):
+    """Query the scene and plan a uuid -> new name mapping."""
+    ops, sibling_names, missing = query_rename_ops(cmds, new_names_by_uuid)
+    plan = plan_renames(ops, sibling_names)
+    for uuid in missing:
+        plan.conflicts.append((uuid, new_names_by_uuid[uuid], "node no longer exists"))
+    return plan
+
+
+def apply_plan(cmds, plan, chunk_name="renameObjects"):
+    """Execute plan steps in one undo chunk, rolling back on failure.
+
+    Returns the number of nodes renamed.
+    """
+    if not plan.is_valid:
+        raise RenameError(f"Plan has {len(plan.conflicts)} conflicting renames.")
+    executed = []
+    cmds.undoInfo(openChunk=True, chunkName=chunk_name)
+    try:
+        for step in plan.steps:
+            uuid, parent, from_name, to_name = step
+            result = cmds.rename(f"{parent}|{from_name}", to_name)
+            executed.append(step)
+            if leaf_name(result) != to_name:
+                raise RenameError(f"Renaming '{from_name}' produced '{result}' instead of '{to_name}'.")
+    except Exception:
+        _rollback(cmds, executed)
+        raise
+    finally:
+        cmds.undoInfo(closeChunk=True)
+    return len({step[0] for step in plan.steps})
+
+
+def _rollback(cmds, executed):
+    # Runs while the original failure is being handled, so errors here are
+    # logged and the remaining steps are still undone
+    for uuid, parent, from_name, to_name in reversed(executed):
+        try:
+            current = cmds.ls(uuid, long=True)
+            if current:
+                cmds.rename(current[0], from_name)
+        except Exception:
+            logger.exception("Could not restore '%s' to '%s' while rolling back.", to_name, from_name)
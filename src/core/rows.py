@@ -0,0 +1,206 @@
+"""Compact column store backing the object list.
+
+One RowStore holds every member of a set as parallel columns instead of one
+widget per node. There is one column per grammar token: choice tokens (side,
+type, ...) are stored as small integer indices into the token's choices, free
+text tokens as strings, so a row costs little more than its name strings.
+"""
+from array import array
+
+from .grammar import load_grammar
+
+STATUS_INVALID = 0
+STATUS_MODIFIED = 1
+STATUS_VALID = 2
+# Not checked yet, see RowStore.defer_status
+STATUS_PENDING = 3
+
+STATUS_LABELS = ("Invalid", "Modified", "Valid", "Checking")
+
+
+class RowStore:
+    """Parallel columns of original names and editable name tokens."""
+
+    __slots__ = ("grammar", "names", "long_names", "uuids", "columns", "status", "defer_status", "stale_rows",
+                 "_choice_index")
+
+    def __init__(self, grammar=None, defer_status=False):
+        self.grammar = grammar or load_grammar()
+        # Statuses are left to a background job (core/jobs.py), see refresh_status
+        self.defer_status = defer_status
+        self._choice_index = [
+            {value: index for index, value in enumerate(token.choices)} if token.is_choice else None
+            for token in self.grammar.tokens
+        ]
+        self.clear()
+
+    def clear(self):
+        self.names = []
+        self.long_names = []
+        self.uuids = []
+        self.columns = [array('B') if token.is_choice else [] for token in self.grammar.tokens]
+        self.status = array('B')
+        self.stale_rows = set()
+
+    def __len__(self):
+        return len(self.names)
+
+    def load(self, names, long_names=None, uuids=None):
+        """Replace the store content with the given node names."""
+        self.clear()
+        self.extend(names, long_names, uuids)
+
+    def extend(self, names, long_names=None, uuids=None):
+        """Append rows for the given node names, parsing them in one pass.
+
+        long_names identifies each node in the scene and defaults to names.
+        uuids keys the rows across renames, None where unknown.
+        """
+        names = list(names)
+        self.long_names.extend(names if long_names is None else long_names)
+        self.uuids.extend([None] * len(names) if uuids is None else uuids)
+        _, parsed = self.grammar.parse_many(names)
+        for column, values, choice_index, token in zip(self.columns, parsed, self._choice_index,
+                                                      self.grammar.tokens):
+            if choice_index is None:
+                column.extend(values)
+            else:
+                default = choice_index.get(token.default, 0)
+                column.extend(choice_index.get(value, default) for value in values)
+        self.names.extend(names)
+        start = len(self.status)
+        self.status.extend(bytes([STATUS_PENDING]) * len(names))
+        self.refresh_status(range(start, len(self.names)))
+
+    def reload(self, names, long_names, uuids=None):
+        """Replace the rows while keeping the pending edits of nodes that remain.
+
+        Nodes are matched by UUID when both rows have one, else by long name.
+        """
+        by_uuid = {uuid: row for row, uuid in enumerate(self.uuids) if uuid is not None}
+        by_long_name = {long_name: row for row, (long_name, uuid) in enumerate(zip(self.long_names, self.uuids))
+                        if uuid is None}
+        old_names, old_columns = self.names, self.columns
+        self.load(names, long_names, uuids)
+        kept = []
+        for row, (long_name, uuid) in enumerate(zip(self.long_names, self.uuids)):
+            old_row = by_uuid.get(uuid) if uuid is not None else None
+            if old_row is None:
+                old_row = by_long_name.get(long_name)
+            if old_row is not None and old_names[old_row] == self.names[row]:
+                for column, old_column in zip(self.columns, old_columns):
+                    column[row] = old_column[old_row]
+                kept.append(row)
+        self.refresh_status(kept)
+
+    def rename_long_names(self, new_long_names):
+        """Point rows at new long names, for nodes renamed outside the tool.
+
+        Returns the rows whose name changed.
+        """
+        changed = [row for row, (old, new) in enumerate(zip(self.long_names, new_long_names)) if old != new]
+        for row in changed:
+            long_name = new_long_names[row]
+            self.long_names[row] = long_name
+            self.names[row] = long_name.rpartition("|")[2]
+        self.refresh_status(changed)
+        return changed
+
+    # Accessors
+
+    def token(self, row, token_index):
+        """Current value of one token of a row."""
+        value = self.columns[token_index][row]
+        if self._choice_index[token_index] is None:
+            return value
+        return self.grammar.tokens[token_index].choices[value]
+
+    def token_column(self, token_index, rows=None):
+        """Values of one token for the given rows, or for every row."""
+        column = self.columns[token_index]
+        if rows is None:
+            rows = range(len(self.names))
+        if self._choice_index[token_index] is None:
+            return [column[row] for row in rows]
+        choices = self.grammar.tokens[token_index].choices
+        return [choices[column[row]] for row in rows]
+
+    def combined_name(self, row):
+        return self.grammar.format([self.token(row, index) for index in range(len(self.columns))])
+
+    def combined_names(self, rows=None):
+        """Composed names for the given rows, or for every row."""
+        if rows is None:
+            rows = range(len(self.names))
+        rows = list(rows)
+        return self.grammar.format_many([self.token_column(index, rows) for index in range(len(self.columns))])
+
+    def is_valid(self, row):
+        return self.status[row] != STATUS_INVALID
+
+    def is_checked(self, row):
+        # Rows are checked automatically when they hold a valid pending rename
+        return self.status[row] == STATUS_MODIFIED
+
+    def checked_rows(self):
+        return [row for row, status in enumerate(self.status) if status == STATUS_MODIFIED]
+
+    # Edits
+
+    def set_token(self, row, token_index, value):
+        """Set one token of a row, value must be one of its choices for choice tokens."""
+        choice_index = self._choice_index[token_index]
+        self.columns[token_index][row] = value if choice_index is None else choice_index[value]
+        self.refresh_status((row,))
+
+    def set_token_column(self, token_index, rows, values):
+        """Set one token on many rows at once and refresh their status in one pass."""
+        rows = list(rows)
+        column = self.columns[token_index]
+        choice_index = self._choice_index[token_index]
+        if choice_index is None:
+            for row, value in zip(rows, values):
+                column[row] = value
+        else:
+            for row, value in zip(rows, values):
+                column[row] = choice_index[value]
+        self.refresh_status(rows)
+
+    def refresh_status(self, rows):
+        """Recompute the status column for the given rows.
+
+        With defer_status set the rows are only added to stale_rows and keep
+        their current status until apply_statuses is given the result of a
+        job; rows never checked stay STATUS_PENDING.
+        """
+        rows = list(rows)
+        if not rows:
+            return
+        if self.defer_status:
+            self.stale_rows.update(rows)
+            return
+        combined = self.combined_names(rows)
+        fullmatch = self.grammar.pattern.fullmatch
+        names = self.names
+        status = self.status
+        for row, new_name in zip(rows, combined):
+            if fullmatch(new_name) is None:
+                status[row] = STATUS_INVALID
+            elif new_name != names[row]:
+                status[row] = STATUS_MODIFIED
+            else:
+                status[row] = STATUS_VALID
+
+    def apply_statuses(self, rows, statuses):
+        """Store statuses computed elsewhere for the given rows, which are no longer stale.
+
+        Returns the rows whose status changed.
+        """
+        status = self.status
+        changed = []
+        for row, value in zip(rows, statuses):
+            if status[row] != value:
+                status[row] = value
+                changed.append(row)
+        self.stale_rows.difference_update(rows)
+        return changed
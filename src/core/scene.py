@@ -0,0 +1,121 @@
+"""Batched scene queries.
+
+SceneSnapshot answers "which transforms does this set hold" with a constant
+number of Maya commands, whatever the size of the set, and caches the answer
+until it is invalidated. `cmds` is injected so the same code runs against
+maya.cmds or the in-memory FakeCmds.
+"""
+from .node_cache import NodeCache
+
+
+def parent_path(long_name):
+    """Parent long name of a DAG long name, or '' for a world child."""
+    return long_name.rpartition("|")[0]
+
+
+def leaf_name(long_name):
+    """Short (leaf) name of a DAG long name."""
+    return long_name.rpartition("|")[2]
+
+
+class SceneSnapshot:
+    """Caches resolved set members, node types and long names."""
+
+    def __init__(self, cmds):
+        self.cmds = cmds
+        # Survives invalidate, renames only make its entries stale
+        self.nodes = NodeCache(cmds)
+        self.node_types = {}
+        self._set_members = {}
+        self._scene_names = None
+
+    def invalidate(self, set_name=None):
+        """Drop cached results for one set, or everything."""
+        if set_name is None:
+            self.node_types.clear()
+            self._set_members.clear()
+            self._scene_names = None
+        else:
+            self._set_members.pop(set_name, None)
+
+    def scene_names(self):
+        """Short names of every node in the scene, cached."""
+        if self._scene_names is None:
+            self._scene_names = [leaf_name(name) for name in self.cmds.ls(long=True) or []]
+        return self._scene_names
+
+    def set_members(self, set_name):
+        """Long names of the members of set_name as returned by the set."""
+        cmds = self.cmds
+        members = cmds.sets(set_name, q=True) or []
+        if not members:
+            return []
+        return cmds.ls(members, long=True)
+
+    def set_transforms(self, set_name):
+        """Long names of the transforms a set holds, with shapes replaced by their parent.
+
+        Cached per set until invalidate is called.
+        """
+        cached = self._set_members.get(set_name)
+        if cached is None:
+            cached = self.resolve_transforms(self.set_members(set_name))
+            self._set_members[set_name] = cached
+        return list(cached)
+
+    def sets_transforms(self, set_names):
+        """set_transforms for several sets at once, {set name: long names}.
+
+        Shapes of all the sets not cached yet are resolved in one pass, so
+        overlapping sets cost the same batched queries as a single set.
+        """
+        pending = [set_name for set_name in set_names if set_name not in self._set_members]
+        if pending:
+            members = {set_name: self.set_members(set_name) for set_name in pending}
+            resolved = self._resolve_map(list(dict.fromkeys(
+                long_name for long_names in members.values() for long_name in long_names)))
+            for set_name, long_names in members.items():
+                self._set_members[set_name] = list(dict.fromkeys(
+                    resolved[long_name] for long_name in long_names if long_name in resolved))
+        return {set_name: list(self._set_members[set_name]) for set_name in set_names}
+
+    def resolve_transforms(self, long_names):
+        """Map mesh shapes to their parent transform and keep plain transforms.
+
+        Works in two batched `ls` calls. Shape parents come from the long
+        path itself, so no per-node listRelatives is needed.
+        """
+        resolved = self._resolve_map(long_names)
+        return list(dict.fromkeys(resolved[long_name] for long_name in long_names if long_name in resolved))
+
+    def _resolve_map(self, long_names):
+        # {long name: transform it stands for}, names resolving to no transform are left out
+        if not long_names:
+            return {}
+        cmds = self.cmds
+        meshes = set(cmds.ls(long_names, exactType='mesh', long=True))
+        candidates = {}
+        for long_name in long_names:
+            if long_name in meshes:
+                self.node_types[long_name] = 'mesh'
+                parent = parent_path(long_name)
+                if parent:
+                    candidates[long_name] = parent
+            else:
+                candidates[long_name] = long_name
+        if not candidates:
+            return {}
+        transforms = set(cmds.ls(list(dict.fromkeys(candidates.values())), exactType='transform', long=True))
+        for long_name in transforms:
+            self.node_types[long_name] = 'transform'
+        return {long_name: candidate for long_name, candidate in candidates.items() if candidate in transforms}
+
+    def uuids(self, long_names):
+        """UUIDs for the given long names, only names not cached yet are queried.
+
+        Returns None if any of the nodes no longer exists.
+        """
+        uuids = self.nodes.uuids(long_names)
+        if None in uuids:
+            return None
+        return uuids
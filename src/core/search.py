@@ -0,0 +1,182 @@
+"""Indexed name search over a HierarchyIndex.
+
+Substring queries of three characters or more go through a trigram index:
+only the names listed under the query's rarest trigram are checked. Shorter
+queries and glob patterns scan one lowercase blob of all names with a single
+compiled regex, built so that a match never spans two names. User regexes
+could match across names in the blob, so they are run on each name. Either
+way, the cost after the scan is proportional to the number of matches, and
+ancestors are collected by walking the parent array until an already
+visible node is reached.
+"""
+import bisect
+import collections
+import re
+from array import array
+
+MODE_SUBSTRING = "substring"
+MODE_GLOB = "glob"
+MODE_REGEX = "regex"
+MODES = (MODE_SUBSTRING, MODE_GLOB, MODE_REGEX)
+
+NGRAM = 3
+
+
+def glob_to_regex(text):
+    """Translate a glob to a regex matching one whole line of the name blob."""
+    parts = []
+    index = 0
+    while index < len(text):
+        char = text[index]
+        if char == "*":
+            parts.append(r'[^\n]*')
+        elif char == "?":
+            parts.append(r'[^\n]')
+        elif char == "[":
+            end = text.find("]", index + 2)
+            if end == -1:
+                parts.append(re.escape(char))
+            else:
+                body = text[index + 1:end].replace("\\", "\\\\")
+                if body.startswith("!"):
+                    parts.append(f"[^\n{body[1:]}]")
+                else:
+                    # A range may include the newline that joins the names
+                    parts.append(f"(?!\n)[{body}]")
+                index = end
+        else:
+            parts.append(re.escape(char))
+        index += 1
+    return "^" + "".join(parts) + "$"
+
+
+def _grams(name):
+    return {name[i:i + NGRAM] for i in range(len(name) - NGRAM + 1)}
+
+
+class SearchResult:
+    __slots__ = ("matches", "visible")
+
+    def __init__(self, matches, visible):
+        self.matches = matches
+        self.visible = visible
+
+    def __len__(self):
+        return len(self.matches)
+
+
+class SearchIndex:
+    """Case-insensitive search index over the names of a hierarchy."""
+
+    def __init__(self, hierarchy):
+        self.hierarchy = hierarchy
+        self.lower_names = [name.lower() for name in hierarchy.names]
+        self._blob = None
+        self._offsets = None
+        self._ngrams = None
+
+    def _build_blob(self):
+        self._blob = "\n".join(self.lower_names)
+        # Start offset of every name inside the blob, to map regex hits back to ids
+        self._offsets = array('l')
+        offset = 0
+        for name in self.lower_names:
+            self._offsets.append(offset)
+            offset += len(name) + 1
+
+    def update(self, node_ids):
+        """Re-read the names of nodes the hierarchy added, moved or removed.
+
+        The trigram postings are patched in place, the name blob is rebuilt
+        on the next scan that needs it.
+        """
+        names = self.hierarchy.names
+        lower_names = self.lower_names
+        ngrams = self._ngrams
+        for node_id in node_ids:
+            old_name = lower_names[node_id] if node_id < len(lower_names) else None
+            new_name = names[node_id].lower()
+            if new_name == old_name:
+                continue
+            if old_name is None:
+                lower_names.extend([""] * (node_id + 1 - len(lower_names)))
+                old_name = ""
+            lower_names[node_id] = new_name
+            self._blob = None
+            if ngrams is not None:
+                for gram in _grams(old_name):
+                    ngrams[gram].remove(node_id)
+                for gram in _grams(new_name):
+                    posting = ngrams.setdefault(gram, array('i'))
+                    posting.insert(bisect.bisect_left(posting, node_id), node_id)
+
+    def warm_up(self):
+        """Build the name blob and trigram index now rather than on the first query."""
+        if self._blob is None:
+            self._build_blob()
+        if self._ngrams is None:
+            self._build_ngrams()
+
+    def _build_ngrams(self):
+        postings = collections.defaultdict(lambda: array('i'))
+        for node_id, name in enumerate(self.lower_names):
+            for gram in _grams(name):
+                postings[gram].append(node_id)
+        self._ngrams = dict(postings)
+
+    def query(self, text, mode=MODE_SUBSTRING):
+        """Return matching node ids and the set of ids to keep visible.
+
+        Raises re.error for an invalid regex in MODE_REGEX.
+        """
+        if mode == MODE_SUBSTRING:
+            matches = self._substring(text.lower())
+        elif mode == MODE_GLOB:
+            matches = self._scan(re.compile(glob_to_regex(text.lower()), re.M))
+        else:
+            search = re.compile(text, re.I).search
+            matches = [node_id for node_id, name in enumerate(self.hierarchy.names) if search(name)]
+        if self.hierarchy.removed:
+            paths = self.hierarchy.paths
+            matches = [node_id for node_id in matches if paths[node_id] is not None]
+        return SearchResult(matches, self.visible_for(matches))
+
+    def visible_for(self, matches):
+        """Matches plus all of their ancestors."""
+        parents = self.hierarchy.parents
+        visible = set()
+        for node_id in matches:
+            while node_id >= 0 and node_id not in visible:
+                visible.add(node_id)
+                node_id = parents[node_id]
+        return visible
+
+    def _substring(self, text):
+        if not text:
+            return list(range(len(self.lower_names)))
+        if len(text) < NGRAM or "\n" in text:
+            return self._scan(re.compile(re.escape(text)))
+        if self._ngrams is None:
+            self._build_ngrams()
+        postings = []
+        for i in range(len(text) - NGRAM + 1):
+            posting = self._ngrams.get(text[i:i + NGRAM])
+            if posting is None:
+                return []
+            postings.append(posting)
+        names = self.lower_names
+        return [node_id for node_id in min(postings, key=len) if text in names[node_id]]
+
+    def _scan(self, pattern):
+        if self._blob is None:
+            self._build_blob()
+        offsets = self._offsets
+        matches = []
+        last = -1
+        for match in pattern.finditer(self._blob):
+            node_id = bisect.bisect_right(offsets, match.start()) - 1
+            if node_id == last:
+                continue
+            last = node_id
+            matches.append(node_id)
+        return matches
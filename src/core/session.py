@@ -0,0 +1,80 @@
+"""Several selection sets renamed as one batch.
+
+A session loads the transforms of many, often overlapping, sets with the
+batched queries of SceneSnapshot.sets_transforms and keeps one row per node,
+deduplicated by UUID. Which rows belong to which set is remembered, so the
+list can be filtered to one set and back without touching the scene, and
+pending edits live on the shared rows whatever the filter.
+"""
+
+
+class SetSession:
+    """One row per node across set_names, set_rows lists the rows of each set."""
+
+    __slots__ = ("set_names", "long_names", "uuids", "set_rows")
+
+    def __init__(self, set_names, long_names, uuids, set_rows):
+        self.set_names = list(set_names)
+        self.long_names = long_names
+        self.uuids = uuids
+        self.set_rows = set_rows
+
+    def __len__(self):
+        return len(self.long_names)
+
+    def __contains__(self, set_name):
+        return set_name in self.set_rows
+
+    def keep_sets(self, set_names):
+        """Forget the sets of the session missing from set_names, such as deleted sets.
+
+        Returns True if any set of the session is left.
+        """
+        existing = set(set_names)
+        self.set_names = [set_name for set_name in self.set_names if set_name in existing]
+        for set_name in list(self.set_rows):
+            if set_name not in existing:
+                del self.set_rows[set_name]
+        return bool(self.set_names)
+
+    def rows_for(self, set_name=None):
+        """Sorted rows of one set, or None for every row."""
+        if set_name is None or set_name not in self.set_rows:
+            return None
+        return self.set_rows[set_name]
+
+    def shared_count(self):
+        """Number of rows held by more than one set."""
+        counts = {}
+        for rows in self.set_rows.values():
+            for row in rows:
+                counts[row] = counts.get(row, 0) + 1
+        return sum(1 for count in counts.values() if count > 1)
+
+
+def load_session(scene, set_names):
+    """Resolve the transforms of every set and merge nodes shared between them.
+
+    Nodes that no longer exist are left out.
+    """
+    set_names = list(dict.fromkeys(set_names))
+    by_set = scene.sets_transforms(set_names)
+    union = list(dict.fromkeys(long_name for set_name in set_names for long_name in by_set[set_name]))
+    row_of_uuid = {}
+    row_of_name = {}
+    long_names = []
+    row_uuids = []
+    for long_name, uuid in zip(union, scene.nodes.uuids(union)):
+        if uuid is None:
+            # Vanished since the sets were listed
+            continue
+        row = row_of_uuid.get(uuid)
+        if row is None:
+            row = row_of_uuid[uuid] = len(long_names)
+            long_names.append(long_name)
+            row_uuids.append(uuid)
+        row_of_name[long_name] = row
+    set_rows = {set_name: sorted({row_of_name[long_name] for long_name in by_set[set_name]
+                                  if long_name in row_of_name})
+                for set_name in set_names}
+    return SetSession(set_names, long_names, row_uuids, set_rows)
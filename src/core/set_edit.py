@@ -0,0 +1,105 @@
+"""Delta-based selection set edits.
+
+Instead of clearing a set and adding every member back, a commit compares
+the wanted members with the ones the set had when it was listed, by UUID,
+and only adds and removes the difference. Names and types are read from a
+NodeCache, so only stale entries are queried and the cost follows the size
+of the change rather than the size of the set. The whole edit is a single
+undo step.
+"""
+
+# As the editor always did, meshes are left out; other shapes are kept
+EXCLUDED_TYPES = frozenset(("mesh",))
+
+
+class SetDelta:
+    """Members to add to and remove from one set.
+
+    `unresolved` counts the listed nodes that no longer exist.
+    """
+
+    __slots__ = ("set_name", "added", "removed", "unresolved")
+
+    def __init__(self, set_name, added, removed, unresolved=0):
+        self.set_name = set_name
+        self.added = added
+        self.removed = removed
+        self.unresolved = unresolved
+
+    def __bool__(self):
+        return bool(self.added or self.removed)
+
+
+def member_names(nodes, uuids, excluded_types=EXCLUDED_TYPES):
+    """Long names of the listed nodes, in listed order, leaving out excluded types.
+
+    Names and types come from the NodeCache nodes. Returns (long names,
+    number of UUIDs that matched no node).
+    """
+    uuids = list(dict.fromkeys(uuids))
+    names = []
+    unresolved = 0
+    for long_name, node_type in zip(nodes.long_names(uuids), nodes.node_types(uuids)):
+        if long_name is None:
+            unresolved += 1
+        elif node_type not in excluded_types:
+            names.append(long_name)
+    return names, unresolved
+
+
+def set_delta(nodes, set_name, wanted, current, excluded_types=EXCLUDED_TYPES):
+    """Difference between the wanted and the current members of set_name, both as UUIDs.
+
+    current is what the set held when it was listed for editing, so members
+    added by others meanwhile are left alone. Only the UUIDs that differ are
+    turned into names; listed nodes of an excluded type are taken out of
+    the set.
+    """
+    wanted = list(dict.fromkeys(wanted))
+    kept = []
+    gone = set()
+    for uuid, node_type in zip(wanted, nodes.node_types(wanted)):
+        if node_type is None:
+            gone.add(uuid)
+        elif node_type not in excluded_types:
+            kept.append(uuid)
+    current_set = set(current)
+    kept_set = set(kept)
+    added = [uuid for uuid in kept if uuid not in current_set]
+    # Deleted nodes have already left the set
+    removed = [uuid for uuid in dict.fromkeys(current) if uuid not in kept_set and uuid not in gone]
+    return SetDelta(set_name,
+                    [name for name in nodes.long_names(added) if name is not None],
+                    [name for name in nodes.long_names(removed) if name is not None],
+                    len(gone))
+
+
+def apply_set_delta(cmds, delta, chunk_name="editSelectionSet"):
+    """Apply a SetDelta as one undo step, at most one remove and one add command."""
+    if not delta:
+        return
+    cmds.undoInfo(openChunk=True, chunkName=chunk_name)
+    try:
+        if delta.removed:
+            cmds.sets(delta.removed, remove=delta.set_name)
+        if delta.added:
+            cmds.sets(delta.added, addElement=delta.set_name)
+    finally:
+        cmds.undoInfo(closeChunk=True)
+
+
+def create_set(cmds, nodes, set_name, uuids, chunk_name="createSelectionSet"):
+    """Create a set from the listed nodes without excluded types, as one undo step.
+
+    Returns (name of the new set, number of UUIDs that matched no node).
+    """
+    members, unresolved = member_names(nodes, uuids)
+    cmds.undoInfo(openChunk=True, chunkName=chunk_name)
+    try:
+        if members:
+            created = cmds.sets(members, name=set_name)
+        else:
+            created = cmds.sets(name=set_name, empty=True)
+    finally:
+        cmds.undoInfo(closeChunk=True)
+    return created, unresolved
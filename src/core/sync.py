@@ -0,0 +1,388 @@
+"""Event-driven scene change tracking.
+
+An event source reports node added / removed / renamed / reparented and set
+membership changes. SceneSync queues them, coalesces bursts into a single
+SceneDelta and hands that delta to listeners, which patch their caches
+instead of rebuilding from full scene queries.
+
+Sources are pluggable: MayaEventSource wraps OpenMaya message callbacks and
+FakeEventSource lets tests or benchmarks emit events by hand.
+"""
+import contextlib
+
+from .scene import parent_path, leaf_name
+
+NODE_ADDED = "added"
+NODE_REMOVED = "removed"
+NODE_RENAMED = "renamed"
+NODE_REPARENTED = "reparented"
+SET_MEMBERS_CHANGED = "members"
+
+
+class SceneEvent:
+    __slots__ = ("kind", "uuid", "name", "node_type", "old_name")
+
+    def __init__(self, kind, uuid, name, node_type=None, old_name=None):
+        self.kind = kind
+        self.uuid = uuid
+        self.name = name
+        self.node_type = node_type
+        self.old_name = old_name
+
+
+class SceneDelta:
+    """Net effect of a burst of events.
+
+    renamed maps old long name -> new long name for DAG nodes and old name ->
+    new name for sets. added_nodes holds UUIDs of new DAG nodes and moved_nodes
+    UUIDs of nodes reparented without a known previous path. Nodes added and
+    removed within the same burst cancel out.
+    """
+
+    __slots__ = ("added_sets", "removed_sets", "changed_sets", "renamed",
+                 "added_nodes", "removed_nodes", "moved_nodes", "hierarchy_changed")
+
+    def __init__(self):
+        self.added_sets = []
+        self.removed_sets = []
+        self.changed_sets = set()
+        self.renamed = {}
+        self.added_nodes = set()
+        self.removed_nodes = set()
+        self.moved_nodes = set()
+        self.hierarchy_changed = False
+
+    def __bool__(self):
+        return bool(self.added_sets or self.removed_sets or self.changed_sets or self.renamed or self.added_nodes
+                    or self.removed_nodes or self.moved_nodes or self.hierarchy_changed)
+
+    def rename_path(self, long_name):
+        """Current long name for a path cached before the renames, or None if removed."""
+        parts = long_name.split("|")
+        current = long_name
+        for size in range(2, len(parts) + 1):
+            prefix = "|".join(parts[:size])
+            if prefix in self.removed_nodes:
+                return None
+            renamed = self.renamed.get(prefix)
+            if renamed is not None:
+                # The deepest renamed ancestor holds the current path of the rest
+                current = renamed + long_name[len(prefix):]
+        return current
+
+
+def _ancestors(long_name):
+    index = long_name.find("|", 1)
+    while index != -1:
+        yield long_name[:index]
+        index = long_name.find("|", index + 1)
+
+
+class _PathRenames:
+    """Original -> current long names of the DAG nodes renamed in a burst.
+
+    Renaming or reparenting a node also moves the current paths recorded for
+    its descendants, so the result does not depend on the order of events.
+    """
+
+    def __init__(self, renamed):
+        self.renamed = renamed
+        self.original = {}
+        # Ancestor path -> current paths recorded below it
+        self.below = {}
+
+    def original_path(self, long_name):
+        """Path before the burst of a node not seen yet, now at long_name."""
+        original = self.original
+        for prefix in reversed(list(_ancestors(long_name))):
+            if prefix in original:
+                return original[prefix] + long_name[len(prefix):]
+        return long_name
+
+    def _link(self, original, current):
+        self.renamed[original] = current
+        self.original[current] = original
+        for prefix in _ancestors(current):
+            self.below.setdefault(prefix, set()).add(current)
+
+    def discard(self, original):
+        current = self.renamed.pop(original, None)
+        if current is None:
+            return
+        self.original.pop(current, None)
+        for prefix in _ancestors(current):
+            paths = self.below.get(prefix)
+            if paths is not None:
+                paths.discard(current)
+                if not paths:
+                    del self.below[prefix]
+
+    def record(self, original, old_name, new_name):
+        self.discard(original)
+        self._link(original, new_name)
+        for current in list(self.below.get(old_name, ())):
+            child_original = self.original[current]
+            self.discard(child_original)
+            self._link(child_original, new_name + current[len(old_name):])
+
+
+class SceneSync:
+    """Collects events from a source and publishes coalesced SceneDeltas.
+
+    schedule is called with a flush function once per burst, for example a
+    Qt single-shot timer. Without it every event is flushed immediately.
+
+    changes counts the events seen from outside, paused or not, so a cached
+    count tells cheaply whether the scene was edited since.
+    """
+
+    def __init__(self, source, schedule=None):
+        self.source = source
+        self.schedule = schedule
+        self.listeners = []
+        self.changes = 0
+        self.paused = False
+        self._pending = []
+        self._scheduled = False
+        self._suspended = 0
+
+    def start(self):
+        self.source.start(self.push)
+
+    def stop(self):
+        self.source.stop()
+        self._pending = []
+
+    def pause(self):
+        """Only count events from now on, listeners are not called until resume."""
+        self.paused = True
+        self._pending = []
+
+    def resume(self):
+        self.paused = False
+
+    def add_listener(self, callback):
+        self.listeners.append(callback)
+
+    def remove_listener(self, callback):
+        if callback in self.listeners:
+            self.listeners.remove(callback)
+
+    @contextlib.contextmanager
+    def suspended(self):
+        """Drop events raised by the caller's own edits."""
+        self._suspended += 1
+        try:
+            yield
+        finally:
+            self._suspended -= 1
+
+    def push(self, event):
+        if self._suspended:
+            return
+        self.changes += 1
+        if self.paused:
+            return
+        self._pending.append(event)
+        if self.schedule is None:
+            self.flush()
+        elif not self._scheduled:
+            self._scheduled = True
+            self.schedule(self.flush)
+
+    def flush(self):
+        self._scheduled = False
+        events, self._pending = self._pending, []
+        delta = coalesce(events)
+        if delta:
+            for listener in list(self.listeners):
+                listener(delta)
+        return delta
+
+
+def coalesce(events):
+    """Fold a list of SceneEvents into one SceneDelta."""
+    delta = SceneDelta()
+    paths = _PathRenames(delta.renamed)
+    added = {}
+    renamed_from = {}
+    for event in events:
+        is_set = event.node_type == "objectSet"
+        if event.kind == NODE_ADDED:
+            added[event.uuid] = event
+            if not is_set:
+                delta.hierarchy_changed = True
+        elif event.kind == NODE_REMOVED:
+            if event.uuid in added:
+                # Created and deleted within the burst, nothing to report
+                del added[event.uuid]
+                continue
+            if is_set:
+                original = renamed_from.pop(event.uuid, event.name)
+                delta.renamed.pop(original, None)
+                delta.removed_sets.append(original)
+                delta.changed_sets.discard(event.name)
+            else:
+                original = renamed_from.pop(event.uuid, None) or paths.original_path(event.name)
+                paths.discard(original)
+                delta.removed_nodes.add(original)
+                delta.hierarchy_changed = True
+        elif event.kind in (NODE_RENAMED, NODE_REPARENTED):
+            if event.uuid in added:
+                added[event.uuid].name = event.name
+                continue
+            original = renamed_from.get(event.uuid)
+            if original is None and event.old_name is not None:
+                original = event.old_name if is_set else paths.original_path(event.old_name)
+                renamed_from[event.uuid] = original
+            if original is None:
+                # Reparent without a known previous path, only a re-query can place it
+                delta.moved_nodes.add(event.uuid)
+                delta.hierarchy_changed = True
+                continue
+            if is_set:
+                delta.renamed[original] = event.name
+                if event.old_name in delta.changed_sets:
+                    delta.changed_sets.discard(event.old_name)
+                    delta.changed_sets.add(event.name)
+            else:
+                # Descendants recorded so far sit under the node's current path
+                paths.record(original, delta.renamed.get(original, event.old_name), event.name)
+                delta.hierarchy_changed = True
+        elif event.kind == SET_MEMBERS_CHANGED:
+            delta.changed_sets.add(event.name)
+    for event in added.values():
+        if event.node_type == "objectSet":
+            delta.added_sets.append(event.name)
+        else:
+            delta.added_nodes.add(event.uuid)
+    return delta
+
+
+class FakeEventSource:
+    """Event source driven by hand, for tests and benchmarks."""
+
+    def __init__(self):
+        self.callback = None
+
+    def start(self, callback):
+        self.callback = callback
+
+    def stop(self):
+        self.callback = None
+
+    def emit(self, kind, uuid, name, node_type=None, old_name=None):
+        if self.callback is not None:
+            self.callback(SceneEvent(kind, uuid, name, node_type, old_name))
+
+
+class MayaEventSource:
+    """Event source backed by OpenMaya message callbacks."""
+
+    def __init__(self):
+        self.callback = None
+        self._callback_ids = []
+        self._set_callback_ids = {}
+        # UUID -> path a node is being reparented from, between the two DAG messages
+        self._previous_paths = {}
+
+    def start(self, callback):
+        import maya.api.OpenMaya as om
+
+        self.callback = callback
+        self._callback_ids = [
+            om.MDGMessage.addNodeAddedCallback(self._on_node_added, "dependNode"),
+            om.MDGMessage.addNodeRemovedCallback(self._on_node_removed, "dependNode"),
+            om.MNodeMessage.addNameChangedCallback(om.MObject.kNullObj, self._on_name_changed),
+            om.MDagMessage.addParentRemovedCallback(self._on_parent_removed),
+            om.MDagMessage.addParentAddedCallback(self._on_parent_added),
+        ]
+        iterator = om.MItDependencyNodes(om.MFn.kSet)
+        while not iterator.isDone():
+            self._watch_set(iterator.thisNode())
+            iterator.next()
+
+    def stop(self):
+        import maya.api.OpenMaya as om
+
+        for callback_id in self._callback_ids + list(self._set_callback_ids.values()):
+            om.MMessage.removeCallback(callback_id)
+        self._callback_ids = []
+        self._set_callback_ids = {}
+        self._previous_paths = {}
+        self.callback = None
+
+    def _describe(self, node):
+        import maya.api.OpenMaya as om
+
+        fn = om.MFnDependencyNode(node)
+        name = fn.name()
+        if node.hasFn(om.MFn.kDagNode):
+            name = om.MFnDagNode(node).fullPathName() or name
+        return fn.uuid().asString(), name, fn.typeName
+
+    def _emit(self, kind, node, old_name=None):
+        if self.callback is None:
+            return
+        uuid, name, node_type = self._describe(node)
+        self.callback(SceneEvent(kind, uuid, name, node_type, old_name))
+
+    def _watch_set(self, node):
+        import maya.api.OpenMaya as om
+
+        uuid = om.MFnDependencyNode(node).uuid().asString()
+        if uuid in self._set_callback_ids:
+            return
+        handle = om.MObjectHandle(node)
+
+        def on_members_modified(*args):
+            if handle.isValid():
+                self._emit(SET_MEMBERS_CHANGED, handle.object())
+
+        self._set_callback_ids[uuid] = om.MObjectSetMessage.addSetMembersModifiedCallback(node, on_members_modified)
+
+    def _on_node_added(self, node, client_data=None):
+        import maya.api.OpenMaya as om
+
+        if node.hasFn(om.MFn.kSet):
+            self._watch_set(node)
+        self._emit(NODE_ADDED, node)
+
+    def _on_node_removed(self, node, client_data=None):
+        import maya.api.OpenMaya as om
+
+        self._previous_paths.pop(om.MFnDependencyNode(node).uuid().asString(), None)
+        if node.hasFn(om.MFn.kSet):
+            uuid = om.MFnDependencyNode(node).uuid().asString()
+            callback_id = self._set_callback_ids.pop(uuid, None)
+            if callback_id is not None:
+                om.MMessage.removeCallback(callback_id)
+        self._emit(NODE_REMOVED, node)
+
+    def _on_name_changed(self, node, previous_name, client_data=None):
+        import maya.api.OpenMaya as om
+
+        if not previous_name or previous_name.startswith("__PrenotatoPerDuplicare"):
+            return
+        uuid, name, node_type = self._describe(node)
+        old_name = previous_name
+        if node.hasFn(om.MFn.kDagNode):
+            parent = parent_path(name)
+            old_name = f"{parent}|{leaf_name(previous_name)}"
+        if self.callback is not None:
+            self.callback(SceneEvent(NODE_RENAMED, uuid, name, node_type, old_name))
+
+    def _on_parent_removed(self, child_path, parent_path_, client_data=None):
+        import maya.api.OpenMaya as om
+
+        # The child's path is built from the parent it leaves, the world's path is empty
+        fn = om.MFnDependencyNode(child_path.node())
+        self._previous_paths[fn.uuid().asString()] = f"{parent_path_.fullPathName()}|{fn.name()}"
+
+    def _on_parent_added(self, child_path, parent_path_, client_data=None):
+        node = child_path.node()
+        uuid, name, node_type = self._describe(node)
+        # Without a removed parent (a new instance) SceneSync falls back to a rebuild
+        old_name = self._previous_paths.pop(uuid, None)
+        if self.callback is not None:
+            self.callback(SceneEvent(NODE_REPARENTED, uuid, name, node_type, old_name))
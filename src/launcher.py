@@ -0,0 +1,128 @@
+"""Opens the Object Namer Tool, keeping one instance alive for the Maya session.
+
+The first launch imports the views and builds the tool (cold). Closing the
+window only hides it: scene events are counted while it is hidden, and the
+next launch shows the same instance with its scene cache, rows and pending
+edits (warm). That cache is refreshed only if the scene changed meanwhile,
+which the tool checks with a cheap token (see ObjectNamerTool.resume).
+
+Shelf button:
+    from PRTTM_Node_Renamer.src import launcher
+    launcher.show()
+
+While developing, launcher.show(dev_reload=True), or PRTTM_DEV_RELOAD=1,
+closes the tool and reloads the package modules before the launch.
+"""
+import importlib
+import logging
+import os
+import sys
+import time
+
+logger = logging.getLogger(__name__)
+
+DEV_RELOAD_ENV_VAR = "PRTTM_DEV_RELOAD"
+PACKAGE = __name__.rpartition(".")[0]
+
+# Modules reloaded by dev_reload, dependencies first
+RELOAD_MODULES = (
+    "core.profiling", "core.grammar", "core.naming", "core.rows", "core.registry", "core.preview",
+    "core.jobs", "core.bulk_ops", "core.node_cache", "core.scene", "core.session", "core.sync",
+    "core.hierarchy", "core.search", "core.classify", "core.rename_plan", "core.ma_file",
+    "core.manifest", "core.set_edit", "views.scene_tree_model", "views.membership_list_model",
+    "views.object_table_model", "views.preview_worker", "views.object_widget",
+    "views.selection_set_editor", "views.object_namer_tool", "views.profiling",
+)
+
+_tool = None
+# (kind, seconds) of every launch, kind is "cold" or "warm"
+launch_times = []
+
+
+def get_maya_main_window():
+    """Maya's main window as a Qt widget, or None outside of Maya."""
+    try:
+        import maya.OpenMayaUI as apiUI
+    except ImportError:
+        return None
+    from PySide2 import QtWidgets
+    from shiboken2 import wrapInstance
+
+    ptr = apiUI.MQtUtil.mainWindow()
+    if ptr is None:
+        return None
+    return wrapInstance(int(ptr), QtWidgets.QWidget)
+
+
+def dev_reload_requested():
+    return os.environ.get(DEV_RELOAD_ENV_VAR, "") not in ("", "0")
+
+
+def reload_modules():
+    """Reload the package modules that are already imported, for development."""
+    for name in RELOAD_MODULES:
+        module = sys.modules.get(f"{PACKAGE}.{name}")
+        if module is not None:
+            importlib.reload(module)
+
+
+def current_tool():
+    """The live tool instance, or None."""
+    global _tool
+    if _tool is not None:
+        from shiboken2 import isValid
+
+        if not isValid(_tool):
+            # Deleted on the C++ side, for example with its parent window
+            _tool = None
+    return _tool
+
+
+def close():
+    """Close the tool for good, the next launch is a cold one."""
+    global _tool
+    tool = current_tool()
+    _tool = None
+    if tool is not None:
+        tool.keep_alive = False
+        tool.close()
+        tool.deleteLater()
+
+
+def show(parent=None, dev_reload=False, event_source=None):
+    """Show the tool, creating it only if none is alive. Returns the tool."""
+    global _tool
+    start = time.perf_counter()
+    if dev_reload or dev_reload_requested():
+        close()
+        reload_modules()
+
+    tool = current_tool()
+    if tool is None:
+        kind = "cold"
+        from PySide2 import QtCore, QtWidgets
+        from .views import profiling
+
+        if QtWidgets.QApplication.instance() is None:
+            profiling.create_application()
+        # PRTTM_PROFILE=1 records commands, phases and layout passes for this session
+        if profiling.profiling_requested():
+            profiling.enable_profiling()
+        from .views.object_namer_tool import ObjectNamerTool
+
+        tool = ObjectNamerTool(parent=parent or get_maya_main_window(), event_source=event_source,
+                               keep_alive=True)
+        tool.setWindowFlags(tool.windowFlags() | QtCore.Qt.Window)
+        _tool = tool
+    else:
+        kind = "warm"
+        if not tool.isVisible():
+            tool.resume()
+
+    tool.show()
+    tool.raise_()
+    tool.activateWindow()
+    seconds = time.perf_counter() - start
+    launch_times.append((kind, seconds))
+    logger.info("Object Namer Tool %s launch in %.1f ms", kind, seconds * 1000)
+    return tool
@@ -0,0 +1,75 @@
+"""Inspect, validate, convert and diff rename plan manifests without Maya.
+
+Usage:
+    python -m PRTTM_Node_Renamer.src.manifest_tool validate plan.jsonl [--grammar show.json]
+    python -m PRTTM_Node_Renamer.src.manifest_tool diff before.jsonl after.rnp
+    python -m PRTTM_Node_Renamer.src.manifest_tool convert plan.jsonl plan.rnp
+"""
+import argparse
+import sys
+
+from .core.grammar import active_grammar, load_grammar
+from .core.manifest import ManifestError, diff_manifests, load_manifest, save_manifest
+
+
+def validate(args):
+    manifest = load_manifest(args.manifest)
+    grammar = load_grammar(args.grammar) if args.grammar else active_grammar()
+    problems = manifest.validate(grammar)
+    for index, reason in problems[:args.limit]:
+        print(f"{manifest.uuids[index]} {manifest.old_names[index]}: {reason}")
+    if len(problems) > args.limit:
+        print(f"... (+{len(problems) - args.limit} more)")
+    print(f"{len(manifest)} entries for set '{manifest.set_name}', {len(problems)} problems")
+    return 1 if problems else 0
+
+
+def diff(args):
+    result = diff_manifests(load_manifest(args.before), load_manifest(args.after))
+    for uuid, old_name, new_name in result.added:
+        print(f"+ {uuid} {old_name} -> {new_name}")
+    for uuid, old_name, new_name in result.removed:
+        print(f"- {uuid} {old_name} -> {new_name}")
+    for uuid, old_name, before, after in result.changed:
+        print(f"~ {uuid} {old_name} -> {before} => {after}")
+    print(f"{len(result.added)} added, {len(result.removed)} removed, {len(result.changed)} changed")
+    return 1 if result else 0
+
+
+def convert(args):
+    manifest = load_manifest(args.source)
+    save_manifest(manifest, args.destination)
+    print(f"Wrote {len(manifest)} entries to {args.destination}")
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Work with rename plan manifests.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    validate_parser = commands.add_parser("validate", help="Check UUIDs, duplicates and new names.")
+    validate_parser.add_argument("manifest")
+    validate_parser.add_argument("--grammar", help="Naming grammar file, defaults to the active grammar.")
+    validate_parser.add_argument("--limit", type=int, default=50, help="Problems to list.")
+    validate_parser.set_defaults(handler=validate)
+
+    diff_parser = commands.add_parser("diff", help="Show entries added, removed or retargeted.")
+    diff_parser.add_argument("before")
+    diff_parser.add_argument("after")
+    diff_parser.set_defaults(handler=diff)
+
+    convert_parser = commands.add_parser("convert", help="Rewrite a manifest, .rnp paths are columnar.")
+    convert_parser.add_argument("source")
+    convert_parser.add_argument("destination")
+    convert_parser.set_defaults(handler=convert)
+
+    args = parser.parse_args(argv)
+    try:
+        return args.handler(args)
+    except (OSError, ManifestError) as e:
+        print(f"Error: {e}")
+        return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
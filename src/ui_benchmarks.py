@@ -0,0 +1,263 @@
+"""Benchmark suite for the tool's views, run against FakeCmds without Maya.
+
+Times ObjectNamerTool.populate_objects, update_preview and
+apply_all_changes, SelectionSetEditor.populate_tree_widget, filter_tree
+and commit_changes, and cold and warm launcher.show on synthetic scenes.
+Qt runs on the offscreen platform, so no display is needed. Results are
+written as JSON and can be compared with a previous run to catch regressions.
+
+Usage:
+    python -m PRTTM_Node_Renamer.src.ui_benchmarks --sizes 1000 10000 100000 --output results.json
+    python -m PRTTM_Node_Renamer.src.ui_benchmarks --baseline results.json
+"""
+import argparse
+import contextlib
+import datetime
+import json
+import os
+import platform
+import sys
+
+# Must be set before the QApplication is created
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from .benchmarks import timed
+from .core.fake_cmds import FakeCmds, build_synthetic_scene, install
+from .core.search import MODE_SUBSTRING, MODE_GLOB, MODE_REGEX
+
+DEFAULT_SIZES = (1000, 10000, 100000)
+# Slower than the baseline by more than this fraction counts as a regression
+DEFAULT_THRESHOLD = 0.25
+FILTER_QUERIES = (("mesh1", MODE_SUBSTRING), ("*part*7", MODE_GLOB), (r"mesh\d{3}$", MODE_REGEX))
+
+# The views import maya.cmds when they are first imported
+install(FakeCmds())
+
+from PySide2 import QtWidgets
+
+from .core.profiling import PROFILER
+from .core.sync import NODE_ADDED, FakeEventSource
+from . import launcher
+from .views import object_namer_tool, profiling, selection_set_editor
+
+
+def use_cmds(fake):
+    """Point the view modules at a new fake scene."""
+    object_namer_tool.cmds = fake
+    selection_set_editor.cmds = fake
+
+
+@contextlib.contextmanager
+def quiet_dialogs():
+    """Answer message boxes right away instead of blocking the run."""
+    box = QtWidgets.QMessageBox
+    saved = box.question, box.information, box.warning
+    box.question = staticmethod(lambda *args, **kwargs: box.Yes)
+    box.information = staticmethod(lambda *args, **kwargs: box.Ok)
+    box.warning = staticmethod(lambda *args, **kwargs: box.Ok)
+    try:
+        yield
+    finally:
+        box.question, box.information, box.warning = saved
+
+
+class Recorder:
+    """Collects one result per benchmark, with the commands it issued."""
+
+    def __init__(self, cmds, app, repeat):
+        self.cmds = cmds
+        self.app = app
+        self.repeat = repeat
+        self.results = []
+
+    def measure(self, name, nodes, func, repeat=None, **extra):
+        def run():
+            func()
+            # Let Qt lay out and paint what the call changed
+            self.app.processEvents()
+
+        runs = repeat or self.repeat
+        self.cmds.calls.clear()
+        seconds = timed(run, repeat=runs)
+        calls = {command: count // runs for command, count in sorted(self.cmds.calls.items())}
+        result = {"name": name, "nodes": nodes, "seconds": seconds, "calls": calls}
+        result.update(extra)
+        self.results.append(result)
+        print(f"  {name:<24} {seconds * 1000:>10.2f} ms  {sum(calls.values()):>8} commands", file=sys.stderr)
+        return result
+
+
+def bench_size(app, count, repeat=3, latency=0.0, depth=3, profile=False):
+    """Run every view benchmark on a fresh scene of `count` transforms."""
+    cmds = FakeCmds()
+    set_name = build_synthetic_scene(cmds, count, depth=depth)[0]
+    cmds.latency = latency
+    use_cmds(cmds)
+    if profile:
+        profiling.enable_profiling()
+    print(f"{count} nodes", file=sys.stderr)
+
+    tool = object_namer_tool.ObjectNamerTool(event_source=FakeEventSource())
+    tool.show()
+    dropdown = tool.selection_set_dropdown
+    dropdown.blockSignals(True)
+    dropdown.setCurrentIndex(dropdown.findText(set_name))
+    dropdown.blockSignals(False)
+    recorder = Recorder(cmds, app, repeat)
+
+    def populate():
+        tool.scene.invalidate()
+        tool.populate_objects()
+        tool.preview_worker.wait()
+
+    recorder.measure("populate_objects", count, populate)
+
+    model = tool.object_model
+    rows = len(model.store)
+
+    def preview():
+        model.emit_rows_changed(0, rows - 1)
+        tool.update_preview()
+        # Batches are delivered by the processEvents that follows
+        tool.preview_worker.wait()
+
+    recorder.measure("update_preview", count, preview)
+
+    editor = selection_set_editor.SelectionSetEditor(tool, sync=tool.sync)
+    editor.show()
+    # Runs the tree load the editor schedules for itself
+    app.processEvents()
+    recorder.measure("populate_tree_widget", count, editor.populate_tree_widget)
+    for text, mode in FILTER_QUERIES:
+        def query(text=text, mode=mode):
+            editor.search_bar.blockSignals(True)
+            editor.search_bar.setText(text)
+            editor.search_bar.blockSignals(False)
+            editor.search_mode_dropdown.blockSignals(True)
+            editor.search_mode_dropdown.setCurrentIndex(editor.search_mode_dropdown.findData(mode))
+            editor.search_mode_dropdown.blockSignals(False)
+            editor.filter_tree()
+
+        recorder.measure("filter_tree", count, query, query=text, mode=mode)
+
+    members = tool.scene.set_transforms(set_name)
+
+    def commit():
+        editor.create_edit_radio.setChecked(True)
+        editor.name_input.setText("benchmarkSet")
+        editor.list_model.set_items(members)
+        editor.commit_changes()
+
+    def commit_one_change():
+        # Edit mode with a single member removed, the commit only sends that change
+        editor.edit_existing_radio.setChecked(True)
+        editor.set_dropdown.setCurrentIndex(editor.set_dropdown.findText(set_name))
+        editor.load_selected_set()
+        editor.list_model.remove_rows([0])
+        editor.commit_changes()
+
+    with quiet_dialogs():
+        recorder.measure("commit_changes", count, commit, repeat=1)
+        recorder.measure("commit_changes", count, commit_one_change, repeat=1, query="edit one member")
+        # Renames the scene, so it runs once and last
+        tool.finish_validation()
+        checked = len(model.store.checked_rows())
+        recorder.measure("apply_all_changes", count, tool.apply_all_changes, repeat=1, renamed=checked)
+
+    editor.close()
+    tool.close()
+    editor.deleteLater()
+    tool.deleteLater()
+    app.processEvents()
+    bench_launch(recorder, count, set_name)
+    return recorder.results
+
+
+def bench_launch(recorder, count, set_name):
+    """Time a launch that builds the tool and launches that show the hidden one again."""
+    source = FakeEventSource()
+
+    def cold():
+        launcher.close()
+        launcher.show(event_source=source)
+
+    recorder.measure("launch_cold", count, cold, repeat=1)
+    tool = launcher.current_tool()
+    tool.selection_set_dropdown.setCurrentIndex(tool.selection_set_dropdown.findText(set_name))
+    tool.preview_worker.wait()
+
+    # Closing only hides the tool, nothing changed so nothing is queried again
+    tool.close()
+    recorder.measure("launch_warm", count, launcher.show, repeat=1)
+
+    # An event while hidden makes the next launch refresh the lists
+    tool.close()
+    source.emit(NODE_ADDED, None, "benchmarkNode", "transform")
+    recorder.measure("launch_warm", count, launcher.show, repeat=1, query="scene changed")
+    tool.preview_worker.wait()
+    launcher.close()
+    recorder.app.processEvents()
+
+
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """Return (result, baseline seconds) for every result slower than its baseline."""
+    def key(result):
+        return result["name"], result["nodes"], result.get("query")
+
+    previous = {key(result): result["seconds"] for result in baseline.get("results", ())}
+    regressions = []
+    for result in results:
+        seconds = previous.get(key(result))
+        if seconds is not None and result["seconds"] > seconds * (1 + threshold):
+            regressions.append((result, seconds))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the tool's views against a fake Maya scene.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Scene sizes in transforms.")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per benchmark, the best is kept.")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every command.")
+    parser.add_argument("--depth", type=int, default=3, help="Group levels above the transforms.")
+    parser.add_argument("--profile", action="store_true",
+                        help="Add per-phase command and Qt layout timings to the results.")
+    parser.add_argument("--output", help="Write the results to this JSON file.")
+    parser.add_argument("--baseline", help="JSON results of a previous run to compare with.")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Slowdown fraction reported as a regression.")
+    args = parser.parse_args(argv)
+
+    app = QtWidgets.QApplication.instance() or profiling.create_application(timed=args.profile)
+    results = []
+    for count in args.sizes:
+        results.extend(bench_size(app, count, args.repeat, args.latency, args.depth, args.profile))
+
+    report = {
+        "created": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "qt_platform": os.environ.get("QT_QPA_PLATFORM"),
+        "latency": args.latency,
+        "results": results,
+    }
+    if args.profile:
+        report["profile"] = PROFILER.report_json()
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            json.dump(report, handle, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as handle:
+            regressions = compare(results, json.load(handle), args.threshold)
+        for result, seconds in regressions:
+            print(f"REGRESSION {result['name']} at {result['nodes']} nodes: "
+                  f"{seconds * 1000:.2f} ms -> {result['seconds'] * 1000:.2f} ms")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
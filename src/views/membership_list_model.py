@@ -0,0 +1,165 @@
+import logging
+
+from PySide2 import QtCore, QtWidgets
+
+logger = logging.getLogger(__name__)
+
+TEXT_MIME_TYPE = "text/plain"
+ITEM_MODEL_MIME_TYPE = "application/x-qabstractitemmodeldatalist"
+
+
+def decode_item_model_data(data):
+    """Display texts of a Qt item model drag payload."""
+    stream = QtCore.QDataStream(data)
+    texts = []
+    while not stream.atEnd():
+        stream.readInt32()  # row
+        stream.readInt32()  # column
+        for _ in range(stream.readInt32()):
+            role = stream.readInt32()
+            value = stream.readQVariant()
+            if role == QtCore.Qt.DisplayRole:
+                texts.append(str(value))
+    return texts
+
+
+def decode_mime_data(mime_data):
+    """Node names carried by a drop, newline separated text is read in one pass."""
+    if mime_data.hasText():
+        return mime_data.text().splitlines()
+    if mime_data.hasFormat(ITEM_MODEL_MIME_TYPE):
+        return decode_item_model_data(mime_data.data(ITEM_MODEL_MIME_TYPE))
+    logger.warning("Unrecognized drop formats: %s", mime_data.formats())
+    return []
+
+
+class MembershipListModel(QtCore.QAbstractListModel):
+    """Set members being edited, with an index of their keys for deduplication.
+
+    With a resolve function (see NodeCache.resolve) items are keyed by node
+    UUID and names matching no node are dropped. Without one the key is the
+    lower-cased name.
+    """
+
+    def __init__(self, parent=None, resolve=None):
+        super().__init__(parent)
+        self.resolve = resolve
+        self._items = []
+        self._item_keys = []
+        self._keys = set()
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self._items)
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if role in (QtCore.Qt.DisplayRole, QtCore.Qt.ToolTipRole):
+            return self._items[index.row()]
+        return None
+
+    def flags(self, index):
+        if not index.isValid():
+            return QtCore.Qt.ItemIsDropEnabled
+        return QtCore.Qt.ItemIsEnabled | QtCore.Qt.ItemIsSelectable
+
+    def items(self):
+        return list(self._items)
+
+    def keys(self):
+        """Key of each item, node UUIDs when the model resolves names."""
+        return list(self._item_keys)
+
+    def __contains__(self, key):
+        if self.resolve is None:
+            key = key.strip().lower()
+        return key in self._keys
+
+    def set_items(self, items):
+        """Replace every item, dropping duplicates."""
+        self.beginResetModel()
+        self._keys = set()
+        self._items, self._item_keys = self._unique(items)
+        self.endResetModel()
+
+    def add_items(self, items):
+        """Append the items not listed yet in one insertion, returns how many were added."""
+        items = list(items)
+        new_items, new_keys = self._unique(items)
+        if new_items:
+            first = len(self._items)
+            self.beginInsertRows(QtCore.QModelIndex(), first, first + len(new_items) - 1)
+            self._items.extend(new_items)
+            self._item_keys.extend(new_keys)
+            self.endInsertRows()
+        logger.debug("Added %d of %d items, %d listed", len(new_items), len(items), len(self._items))
+        return len(new_items)
+
+    def _unique(self, items):
+        # Adds the keys of the returned items to the index
+        texts = [text for text in (item.strip() for item in items) if text]
+        if self.resolve is None:
+            pairs = [(text, text.lower()) for text in texts]
+        elif texts:
+            long_names, uuids = self.resolve(texts)
+            if len(long_names) < len(texts):
+                logger.warning("%d names match no node and were not added", len(texts) - len(long_names))
+            pairs = zip(long_names, uuids)
+        else:
+            pairs = []
+        keys = self._keys
+        unique = []
+        unique_keys = []
+        for text, key in pairs:
+            if key not in keys:
+                keys.add(key)
+                unique.append(text)
+                unique_keys.append(key)
+        return unique, unique_keys
+
+    def remove_rows(self, rows):
+        """Remove the given rows, one removal per contiguous block."""
+        rows = sorted(set(rows), reverse=True)
+        index = 0
+        while index < len(rows):
+            last = rows[index]
+            first = last
+            while index + 1 < len(rows) and rows[index + 1] == first - 1:
+                index += 1
+                first -= 1
+            index += 1
+            self.beginRemoveRows(QtCore.QModelIndex(), first, last)
+            self._keys.difference_update(self._item_keys[first:last + 1])
+            del self._items[first:last + 1]
+            del self._item_keys[first:last + 1]
+            self.endRemoveRows()
+
+    # Drag and drop
+
+    def supportedDropActions(self):
+        return QtCore.Qt.CopyAction
+
+    def mimeTypes(self):
+        return [TEXT_MIME_TYPE, ITEM_MODEL_MIME_TYPE]
+
+    def canDropMimeData(self, data, action, row, column, parent):
+        return data.hasText() or data.hasFormat(ITEM_MODEL_MIME_TYPE)
+
+    def dropMimeData(self, data, action, row, column, parent):
+        if action == QtCore.Qt.IgnoreAction:
+            return True
+        self.add_items(decode_mime_data(data))
+        return True
+
+
+def create_membership_list_view(model, parent=None):
+    """List view accepting node drops from the scene tree or Maya."""
+    view = QtWidgets.QListView(parent)
+    view.setModel(model)
+    view.setUniformItemSizes(True)
+    view.setSelectionMode(QtWidgets.QAbstractItemView.ExtendedSelection)
+    view.setDragDropMode(QtWidgets.QAbstractItemView.DropOnly)
+    view.setDefaultDropAction(QtCore.Qt.CopyAction)
+    view.setAcceptDrops(True)
+    view.setDropIndicatorShown(True)
+    return view
@@ -1,137 +1,644 @@
-from PySide2 import QtWidgets, QtCore
-import maya.cmds as cmds
+import logging
 import re
 
-from .object_widget import ObjectWidget
+from PySide2 import QtWidgets, QtCore, QtGui
+import maya.cmds as cmds
+
+from ..core import bulk_ops
+from ..core.rename_plan import build_plan, apply_plan
+from ..core.manifest import RenameManifest, ManifestError, load_manifest, save_manifest
+from ..core.scene import SceneSnapshot, leaf_name
+from ..core.session import load_session
+from ..core.grammar import active_grammar
+from ..core.preview import PreviewAggregator
+from ..core.profiling import PROFILER, profiled, dump_report
+from ..core.sync import SceneSync, MayaEventSource
+from .object_table_model import ObjectTableModel, BulkEditCommand, TOKEN_COLUMN_OFFSET, create_object_table_view
+from .preview_worker import PreviewWorker
 from .selection_set_editor import SelectionSetEditor
 
+logger = logging.getLogger(__name__)
+
+PREVIEW_DELAY_MS = 150
+SYNC_DELAY_MS = 100
+
+NO_SET_LABEL = "Select a set..."
+SESSION_LABEL = "<all session sets>"
+
+# Placeholders of the two text inputs of each free text operation, None hides the input
+BULK_TEXT_OPERATIONS = (
+    ("Find / Replace", bulk_ops.OP_REPLACE, "Find", "Replace with"),
+    ("Regex Replace", bulk_ops.OP_REGEX, "Pattern", "Replacement"),
+    ("Add Prefix", bulk_ops.OP_ADD_PREFIX, "Prefix", None),
+    ("Add Suffix", bulk_ops.OP_ADD_SUFFIX, "Suffix", None),
+    ("Strip Prefix", bulk_ops.OP_STRIP_PREFIX, "Prefix", None),
+    ("Strip Suffix", bulk_ops.OP_STRIP_SUFFIX, "Suffix", None),
+    ("Lower Case", bulk_ops.OP_LOWER, None, None),
+    ("Upper Case", bulk_ops.OP_UPPER, None, None),
+    ("Capitalize", bulk_ops.OP_CAPITALIZE, None, None),
+)
+
+
+def bulk_operations(grammar):
+    """(label, op, token index, first placeholder, second placeholder) for the bulk edit dropdown."""
+    operations = [(label, op, grammar.primary_index, first, second)
+                  for label, op, first, second in BULK_TEXT_OPERATIONS]
+    operations.extend((f"Set {token.label}", bulk_ops.OP_SET, index, None, None)
+                      for index, token in enumerate(grammar.tokens) if token.is_choice)
+    return operations
+
+
 class ObjectNamerTool(QtWidgets.QWidget):
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, event_source=None, keep_alive=False):
         super().__init__(parent)
+        # A kept alive tool only hides on close, see launcher.py
+        self.keep_alive = keep_alive
+        self.scene_token = None
         self.setWindowTitle("Object Namer Tool")
         self.setGeometry(100, 100, 400, 400)
+        self.scene = SceneSnapshot(cmds)
+        self.preview = PreviewAggregator()
+        self.grammar = active_grammar()
+        # Several sets loaded as one list, see start_session
+        self.session = None
         self.create_ui()
 
+        # Keep the cached sets and rows in step with edits made outside the tool
+        self.sync = SceneSync(event_source or MayaEventSource(),
+                              schedule=lambda flush: QtCore.QTimer.singleShot(SYNC_DELAY_MS, flush))
+        self.sync.add_listener(self.apply_scene_delta)
+        self.sync.start()
+
     def create_ui(self):
         main_layout = QtWidgets.QVBoxLayout(self)
 
         # Dropdown for selection sets
         self.selection_set_dropdown = QtWidgets.QComboBox()
-        self.selection_set_dropdown.addItem("Select a set...")
+        self.selection_set_dropdown.addItem(NO_SET_LABEL)
         self.selection_set_dropdown.addItem("<create/edit>")
         self.selection_set_dropdown.addItems(self.get_selection_sets())
         self.selection_set_dropdown.currentIndexChanged.connect(self.handle_selection_change)
         main_layout.addWidget(self.selection_set_dropdown)
 
-        # List widget to hold ObjectWidgets
-        self.object_list_widget = QtWidgets.QListWidget()
-        main_layout.addWidget(self.object_list_widget)
+        # Loads several sets at once, the dropdown then filters between them
+        self.session_button = QtWidgets.QPushButton("Session Sets...")
+        self.session_button.clicked.connect(self.choose_session_sets)
+        main_layout.addWidget(self.session_button)
+
+        # Virtualized table of set members, editors are only created for the edited cell
+        # Statuses and collisions come from the preview worker's batches
+        self.object_model = ObjectTableModel(self.grammar, self, defer_status=True)
+        self.object_model.dataChanged.connect(self.on_rows_changed)
+        self.object_model.modelReset.connect(self.on_model_reset)
+        self.object_table_view = create_object_table_view(self.object_model)
+        main_layout.addWidget(self.object_table_view)
+
+        # Bulk edits run over the selected rows, or every listed row, as one undo step
+        bulk_layout = QtWidgets.QHBoxLayout()
+        self.bulk_op_dropdown = QtWidgets.QComboBox()
+        for operation in bulk_operations(self.grammar):
+            self.bulk_op_dropdown.addItem(operation[0], operation[1:])
+        bulk_layout.addWidget(self.bulk_op_dropdown)
+        self.bulk_first_input = QtWidgets.QLineEdit()
+        bulk_layout.addWidget(self.bulk_first_input)
+        self.bulk_second_input = QtWidgets.QLineEdit()
+        bulk_layout.addWidget(self.bulk_second_input)
+        self.bulk_value_dropdown = QtWidgets.QComboBox()
+        bulk_layout.addWidget(self.bulk_value_dropdown)
+        self.bulk_apply_button = QtWidgets.QPushButton("Apply to Rows")
+        self.bulk_apply_button.clicked.connect(self.run_bulk_edit)
+        bulk_layout.addWidget(self.bulk_apply_button)
+        main_layout.addLayout(bulk_layout)
+        self.bulk_op_dropdown.currentIndexChanged.connect(self.update_bulk_inputs)
+        self.update_bulk_inputs()
+
+        self.undo_stack = QtWidgets.QUndoStack(self)
+        undo_action = self.undo_stack.createUndoAction(self, "Undo")
+        undo_action.setShortcut(QtGui.QKeySequence.Undo)
+        self.addAction(undo_action)
+        redo_action = self.undo_stack.createRedoAction(self, "Redo")
+        redo_action.setShortcut(QtGui.QKeySequence.Redo)
+        self.addAction(redo_action)
+        # Edits point at rows by index, they cannot outlive the rows
+        self.object_model.rows_loaded.connect(self.undo_stack.clear)
 
         # Preview label
         self.preview_label = QtWidgets.QLabel("Preview:")
+        self.preview_label.setWordWrap(True)
         main_layout.addWidget(self.preview_label)
 
+        # Coalesces bursts of edits into a single preview refresh
+        self.preview_timer = QtCore.QTimer(self)
+        self.preview_timer.setSingleShot(True)
+        self.preview_timer.setInterval(PREVIEW_DELAY_MS)
+        self.preview_timer.timeout.connect(self.update_preview)
+
+        # Validation and name composition run on a worker thread, batches stream back
+        self.preview_worker = PreviewWorker(self)
+        self.preview_worker.batch_ready.connect(self.on_preview_batch)
+
+        # Fills side and type of badly named objects from their type and position
+        self.classify_button = QtWidgets.QPushButton("Auto-Classify Invalid")
+        self.classify_button.clicked.connect(self.auto_classify)
+        main_layout.addWidget(self.classify_button)
+
+        # Rename plans can be saved for review and replayed on other shots
+        plan_layout = QtWidgets.QHBoxLayout()
+        self.export_plan_button = QtWidgets.QPushButton("Export Plan...")
+        self.export_plan_button.clicked.connect(self.export_plan)
+        plan_layout.addWidget(self.export_plan_button)
+        self.import_plan_button = QtWidgets.QPushButton("Apply Plan...")
+        self.import_plan_button.clicked.connect(self.import_plan)
+        plan_layout.addWidget(self.import_plan_button)
+        main_layout.addLayout(plan_layout)
+
         # Apply All Changes button
         self.apply_button = QtWidgets.QPushButton("Apply All Changes")
         self.apply_button.clicked.connect(self.apply_all_changes)
         main_layout.addWidget(self.apply_button)
 
+    def update_bulk_inputs(self):
+        op, token_index, first, second = self.bulk_op_dropdown.currentData()
+        for line_edit, placeholder in ((self.bulk_first_input, first), (self.bulk_second_input, second)):
+            line_edit.setVisible(placeholder is not None)
+            line_edit.setPlaceholderText(placeholder or "")
+        self.bulk_value_dropdown.setVisible(op == bulk_ops.OP_SET)
+        if op == bulk_ops.OP_SET:
+            self.bulk_value_dropdown.clear()
+            self.bulk_value_dropdown.addItems(self.grammar.tokens[token_index].choices)
+
+    def selected_store_rows(self):
+        model = self.object_model
+        view_rows = sorted(index.row() for index in self.object_table_view.selectionModel().selectedRows())
+        return [model.store_row(row) for row in view_rows]
+
+    def visible_store_rows(self):
+        """Store rows currently on screen in the table."""
+        view = self.object_table_view
+        top = view.rowAt(0)
+        if top < 0:
+            return []
+        bottom = view.rowAt(view.viewport().height() - 1)
+        if bottom < 0:
+            bottom = self.object_model.rowCount() - 1
+        return self.object_model.store_rows(top, bottom)
+
+    @profiled("bulk")
+    def run_bulk_edit(self):
+        op, token_index, _, _ = self.bulk_op_dropdown.currentData()
+        if op == bulk_ops.OP_SET:
+            first = self.bulk_value_dropdown.currentText()
+        else:
+            first = self.bulk_first_input.text()
+        # Rows hidden by a session filter are left alone
+        rows = self.selected_store_rows() or self.object_model.visible_rows
+        try:
+            edit = bulk_ops.bulk_edit(self.object_model.store, op, token_index, first,
+                                      self.bulk_second_input.text(), rows)
+        except (ValueError, re.error) as e:
+            QtWidgets.QMessageBox.warning(self, "Bulk Edit", str(e))
+            return
+        if edit:
+            self.undo_stack.push(BulkEditCommand(self.object_model, edit, self.bulk_op_dropdown.currentText()))
+
     def get_selection_sets(self):
         sets = cmds.ls(type='objectSet')
         return sets
 
     def handle_selection_change(self, index):
-        if self.selection_set_dropdown.currentText() == "<create/edit>":
+        selected_set = self.selection_set_dropdown.currentText()
+        if selected_set == "<create/edit>":
             self.launch_selection_set_editor()
+        elif self.session is not None and (index == 0 or selected_set in self.session):
+            # Rows of the session are already loaded, only the filter changes
+            self.object_model.set_row_filter(self.session.rows_for(selected_set))
+        elif self.session is not None and not self.confirm_end_session(f"Loading '{selected_set}'"):
+            # Back to every set of the session, pending edits stay
+            dropdown = self.selection_set_dropdown
+            dropdown.blockSignals(True)
+            dropdown.setCurrentIndex(0)
+            dropdown.blockSignals(False)
+            self.object_model.set_row_filter(None)
         else:
+            self.end_session()
+            self.populate_objects()
+
+    def choose_session_sets(self):
+        dialog = QtWidgets.QDialog(self)
+        dialog.setWindowTitle("Session Sets")
+        layout = QtWidgets.QVBoxLayout(dialog)
+        set_list = QtWidgets.QListWidget()
+        current = set(self.session.set_names) if self.session is not None else set()
+        for set_name in self.get_selection_sets():
+            item = QtWidgets.QListWidgetItem(set_name)
+            item.setFlags(item.flags() | QtCore.Qt.ItemIsUserCheckable)
+            item.setCheckState(QtCore.Qt.Checked if set_name in current else QtCore.Qt.Unchecked)
+            set_list.addItem(item)
+        layout.addWidget(set_list)
+        buttons = QtWidgets.QDialogButtonBox(QtWidgets.QDialogButtonBox.Ok | QtWidgets.QDialogButtonBox.Cancel)
+        buttons.accepted.connect(dialog.accept)
+        buttons.rejected.connect(dialog.reject)
+        layout.addWidget(buttons)
+        if dialog.exec_() != QtWidgets.QDialog.Accepted:
+            return
+        set_names = [set_list.item(row).text() for row in range(set_list.count())
+                     if set_list.item(row).checkState() == QtCore.Qt.Checked]
+        if set_names:
+            self.start_session(set_names)
+        elif self.confirm_end_session("Clearing the session sets"):
+            self.end_session()
+            self.selection_set_dropdown.setCurrentIndex(0)
             self.populate_objects()
 
+    @profiled("populate")
+    def start_session(self, set_names):
+        """Load the transforms of several sets as one list, nodes shared between sets get one row."""
+        self.session = load_session(self.scene, set_names)
+        dropdown = self.selection_set_dropdown
+        dropdown.blockSignals(True)
+        dropdown.setItemText(0, SESSION_LABEL)
+        dropdown.setCurrentIndex(0)
+        dropdown.blockSignals(False)
+        long_names = self.session.long_names
+        # Nodes already listed keep their pending edits
+        self.object_model.reload([leaf_name(name) for name in long_names], long_names,
+                                 self.scene.scene_names(), uuids=self.session.uuids)
+        logger.info("Loaded %d objects from %d sets, %d shared between sets.",
+                    len(long_names), len(set_names), self.session.shared_count())
+
+    def confirm_end_session(self, action):
+        """Ask whether action may end the session if that discards pending renames."""
+        self.finish_validation()
+        pending = len(self.object_model.store.checked_rows())
+        if not pending:
+            return True
+        answer = QtWidgets.QMessageBox.question(
+            self, "End Session",
+            f"{action} ends the session and discards {pending} pending renames.\n\nContinue?")
+        return answer == QtWidgets.QMessageBox.Yes
+
+    def end_session(self):
+        if self.session is None:
+            return
+        self.session = None
+        dropdown = self.selection_set_dropdown
+        dropdown.blockSignals(True)
+        dropdown.setItemText(0, NO_SET_LABEL)
+        dropdown.blockSignals(False)
+
     def launch_selection_set_editor(self):
-        dialog = SelectionSetEditor(self)
+        dialog = SelectionSetEditor(self, sync=self.sync, nodes=self.scene.nodes)
         result = dialog.exec_()
         if result == QtWidgets.QDialog.Accepted:
             selected_set = dialog.get_selected_set()
             self.refresh_selection_sets(selected_set)
 
     def refresh_selection_sets(self, selected_set=None):
-        current_index = self.selection_set_dropdown.currentIndex()
-        self.selection_set_dropdown.clear()
-        self.selection_set_dropdown.addItem("Select a set...")
-        self.selection_set_dropdown.addItem("<create/edit>")
-        self.selection_set_dropdown.addItems(self.get_selection_sets())
-        
-        if selected_set:
-            index = self.selection_set_dropdown.findText(selected_set)
-            if index != -1:
-                self.selection_set_dropdown.setCurrentIndex(index)
-            else:
-                self.selection_set_dropdown.setCurrentIndex(0)
-        else:
-            self.selection_set_dropdown.setCurrentIndex(current_index)
+        """List the sets again after the editor closes, then show selected_set.
+
+        A session keeps its remaining sets and the pending edits of nodes
+        still listed; showing a set outside it asks first, see
+        handle_selection_change.
+        """
+        # Set membership may have changed in the editor
+        self.scene.invalidate()
+        sets = self.get_selection_sets()
+        if self.session is not None and not self.session.keep_sets(sets):
+            self.end_session()
+        dropdown = self.selection_set_dropdown
+        dropdown.blockSignals(True)
+        dropdown.clear()
+        dropdown.addItem(SESSION_LABEL if self.session is not None else NO_SET_LABEL)
+        dropdown.addItem("<create/edit>")
+        dropdown.addItems(sets)
+        dropdown.setCurrentIndex(0)
+        dropdown.blockSignals(False)
+        if self.session is not None:
+            self.reload_objects(SESSION_LABEL)
+        index = dropdown.findText(selected_set) if selected_set else -1
+        if index > 1:
+            dropdown.setCurrentIndex(index)
+        elif self.session is None:
+            self.object_model.clear()
 
+    @profiled("populate")
     def populate_objects(self):
-        self.object_list_widget.clear()
         selected_set = self.selection_set_dropdown.currentText()
+        long_names = []
+
+        if self.session is not None:
+            # Every set of the session is resolved again, the filter is kept
+            self.session = load_session(self.scene, self.session.set_names)
+            self.object_model.load([leaf_name(name) for name in self.session.long_names],
+                                   self.session.long_names, self.scene.scene_names(),
+                                   self.session.rows_for(selected_set), self.session.uuids)
+            return
+
+        if selected_set not in [NO_SET_LABEL, "<create/edit>"]:
+            # Shapes are swapped for their transform in a few batched queries
+            long_names = self.scene.set_transforms(selected_set)
+            if not long_names:
+                logger.warning("No objects found in the selection set '%s'.", selected_set)
+
+        self.object_model.load([leaf_name(name) for name in long_names], long_names,
+                               self.scene.scene_names(), uuids=self.scene.nodes.uuids(long_names))
+
+    def refresh_rows(self):
+        """Re-read the names of the listed nodes by UUID after renames.
+
+        Set membership is unchanged by a rename, so no set is queried again.
+        """
+        store = self.object_model.store
+        uuids = store.uuids
+        long_names = self.scene.nodes.long_names(uuids)
+        if None in long_names:
+            # Nodes without a UUID or deleted since, list the set again
+            self.populate_objects()
+            return
+        if self.session is not None:
+            self.session.long_names = long_names
+        self.object_model.load([leaf_name(name) for name in long_names], long_names,
+                               self.scene.scene_names(), self.object_model.visible_rows, uuids)
+
+    def apply_scene_delta(self, delta):
+        dropdown = self.selection_set_dropdown
+        current_set = dropdown.currentText()
+        dropdown.blockSignals(True)
+        for set_name in delta.removed_sets:
+            index = dropdown.findText(set_name)
+            if index > 1:
+                dropdown.removeItem(index)
+        for old_name, new_name in delta.renamed.items():
+            index = dropdown.findText(old_name)
+            if index > 1:
+                dropdown.setItemText(index, new_name)
+                if old_name == current_set:
+                    current_set = new_name
+        for set_name in delta.added_sets:
+            if dropdown.findText(set_name) == -1:
+                dropdown.addItem(set_name)
+        dropdown.blockSignals(False)
 
-        if selected_set not in ["Select a set...", "<create/edit>"]:
-            objects = cmds.sets(selected_set, q=True)
-
-            if objects:
-                for obj in objects:
-                    # Get the transform node if the object is a shape
-                    if cmds.objectType(obj) == 'mesh':
-                        transform = cmds.listRelatives(obj, parent=True, type='transform')
-                        if transform:
-                            obj = transform[0]
-                    
-                    if cmds.objectType(obj) == 'transform':
-                        self.add_object_widget(obj)
+        session_changed = False
+        if self.session is not None:
+            set_names = [delta.renamed.get(set_name, set_name) for set_name in self.session.set_names
+                         if set_name not in delta.removed_sets]
+            if not set_names:
+                self.end_session()
             else:
-                print(f"No objects found in the selection set '{selected_set}'.")
+                session_changed = (set_names != self.session.set_names
+                                   or any(set_name in delta.changed_sets for set_name in set_names))
+                self.session.set_names = set_names
+
+        if current_set in delta.removed_sets:
+            if self.session is not None:
+                # Back to every set of the session, without signals as the rows are reloaded below
+                dropdown.blockSignals(True)
+                dropdown.setCurrentIndex(0)
+                dropdown.blockSignals(False)
+                current_set = SESSION_LABEL
+            else:
+                dropdown.setCurrentIndex(0)
+                return
+
+        for set_name in delta.changed_sets:
+            self.scene.invalidate(set_name)
+        if delta.renamed or delta.removed_nodes or delta.moved_nodes:
+            # Cached paths are stale, the next query goes back to the scene
+            self.scene.invalidate()
+            self.scene.nodes.apply_delta(delta)
+
+        store = self.object_model.store
+        if current_set in delta.changed_sets or session_changed or delta.moved_nodes:
+            self.reload_objects(current_set)
+        elif delta.renamed or delta.removed_nodes:
+            new_long_names = [delta.rename_path(long_name) for long_name in store.long_names]
+            if None in new_long_names:
+                self.reload_objects(current_set)
+            else:
+                self.object_model.rename_long_names(new_long_names, self.scene.scene_names())
+
+    def reload_objects(self, selected_set):
+        """Re-resolve the set while keeping pending edits on remaining rows."""
+        if self.session is not None:
+            self.session = load_session(self.scene, self.session.set_names)
+            long_names = self.session.long_names
+            self.object_model.reload([leaf_name(name) for name in long_names], long_names,
+                                     self.scene.scene_names(), self.session.rows_for(selected_set),
+                                     self.session.uuids)
+            return
+        long_names = self.scene.set_transforms(selected_set)
+        self.object_model.reload([leaf_name(name) for name in long_names], long_names,
+                                 self.scene.scene_names(), uuids=self.scene.nodes.uuids(long_names))
+
+    def closeEvent(self, event):
+        if self.keep_alive:
+            self.suspend()
+        else:
+            self.shutdown()
+        super().closeEvent(event)
+
+    def current_scene_token(self):
+        """Open scene and number of scene events seen, one cheap query."""
+        return cmds.file(q=True, sceneName=True), self.sync.changes
+
+    def suspend(self):
+        """Stop work while hidden, scene events are only counted."""
+        self.sync.pause()
+        self.preview_worker.cancel()
+        self.preview_worker.wait()
+        self.scene_token = self.current_scene_token()
+        if PROFILER.enabled:
+            dump_report()
+
+    def resume(self):
+        """Continue after suspend, the cached scene is kept unless the scene changed meanwhile.
+
+        Returns True if the lists had to be refreshed.
+        """
+        self.sync.resume()
+        if self.scene_token is not None and self.current_scene_token() == self.scene_token:
+            return False
+        self.scene.invalidate()
+        self.scene.nodes.invalidate()
+        sets = self.get_selection_sets()
+        dropdown = self.selection_set_dropdown
+        current_set = dropdown.currentText()
+        dropdown.blockSignals(True)
+        while dropdown.count() > 2:
+            dropdown.removeItem(2)
+        dropdown.addItems(sets)
+        if self.session is not None and not self.session.keep_sets(sets):
+            self.end_session()
+        index = dropdown.findText(current_set)
+        dropdown.setCurrentIndex(index if index > 1 else 0)
+        dropdown.blockSignals(False)
+        if self.session is not None or dropdown.currentIndex() > 1:
+            # Pending edits of nodes still listed are kept
+            self.reload_objects(dropdown.currentText())
+        else:
+            self.object_model.clear()
+        return True
 
-    def add_object_widget(self, obj_name):
-        object_widget = ObjectWidget(obj_name, self)
-        object_widget.preview_updated.connect(self.update_preview)
-        list_item = QtWidgets.QListWidgetItem(self.object_list_widget)
-        list_item.setSizeHint(object_widget.sizeHint())
-        self.object_list_widget.addItem(list_item)
-        self.object_list_widget.setItemWidget(list_item, object_widget)
+    def shutdown(self):
+        """Release the scene callbacks, the tool cannot be shown again."""
+        self.sync.stop()
+        self.preview_worker.cancel()
+        self.preview_worker.wait()
+        if PROFILER.enabled:
+            dump_report()
 
+    def on_rows_changed(self, top_left, bottom_right):
+        if bottom_right.column() < TOKEN_COLUMN_OFFSET or top_left.column() >= self.object_model.status_column:
+            # Check, status and preview cells only, such as the results of a batch
+            return
+        self.preview.mark_dirty(self.object_model.store_rows(top_left.row(), bottom_right.row()))
+        # Batches computed before this edit are stale
+        self.preview_worker.cancel()
+        self.preview_timer.start()
+
+    def on_model_reset(self):
+        self.preview.clear()
+        self.preview_timer.stop()
+        self.render_preview()
+        self.preview_worker.submit(self.object_model.store, first=self.visible_store_rows())
+
+    @profiled("preview")
     def update_preview(self):
-        combined_strings = [
-            self.object_list_widget.itemWidget(self.object_list_widget.item(index)).get_combined_name()
-            for index in range(self.object_list_widget.count())
-            if self.object_list_widget.itemWidget(self.object_list_widget.item(index)).is_checked()
-        ]
-        self.preview_label.setText("Preview: " + ", ".join(combined_strings))
-        self.updateGeometry()
+        # Rows on screen are validated first, the rest streams in behind them
+        self.preview_worker.submit(self.object_model.store, self.preview.take_dirty(), self.visible_store_rows())
+
+    def on_preview_batch(self, batch):
+        self.object_model.apply_batch(batch)
+        if self.preview.apply_batch(batch):
+            self.render_preview()
+
+    def finish_validation(self):
+        """Check every row still waiting for the worker, before the statuses are relied on."""
+        self.preview_timer.stop()
+        self.preview.take_dirty()
+        self.preview_worker.finish(self.object_model.store)
 
+    def render_preview(self):
+        self.preview_label.setText("Preview: " + self.preview.render())
+
+    @profiled("classify")
+    def auto_classify(self):
+        rows = self.object_model.auto_classify(cmds)
+        if rows:
+            self.update_preview()
+
+    @profiled("apply")
     def apply_all_changes(self):
-        all_valid = True
-        for index in range(self.object_list_widget.count()):
-            object_widget = self.object_list_widget.itemWidget(self.object_list_widget.item(index))
-            if object_widget.is_checked() and not object_widget.is_valid:
-                all_valid = False
-                break
-
-        if not all_valid:
-            QtWidgets.QMessageBox.warning(self, "Invalid Names", "Please correct all invalid names before applying changes.")
-            return
-
-        for index in range(self.object_list_widget.count()):
-            object_widget = self.object_list_widget.itemWidget(self.object_list_widget.item(index))
-            if object_widget.is_checked() and object_widget.has_changed():
-                old_name = object_widget.obj_name
-                new_name = object_widget.get_combined_name()
-                cmds.rename(old_name, new_name)
+        self.finish_validation()
+        store = self.object_model.store
+        # Rows are only checked when their new name is valid and differs from the old one
+        checked_rows = store.checked_rows()
+        if not checked_rows:
+            return
+
+        uuids = self.checked_uuids(checked_rows)
+        if uuids is None:
+            QtWidgets.QMessageBox.warning(self, "Scene Changed", "Some objects no longer exist, the list has been refreshed.")
+            self.scene.invalidate()
+            self.populate_objects()
+            return
+
+        # Clashes between siblings are refused by the plan, what the registry
+        # still reports are names shared with nodes under other parents
+        plan = self.plan_renames(dict(zip(uuids, store.combined_names(checked_rows))))
+        if plan is None:
+            return
+        scene_collisions, batch_duplicates = self.object_model.registry.summary()
+        if scene_collisions or batch_duplicates:
+            answer = QtWidgets.QMessageBox.question(
+                self, "Duplicate Names",
+                f"{scene_collisions + batch_duplicates} new names are also used by objects under other parents. "
+                "Maya allows this, but those objects can then only be told apart by their full path."
+                "\n\nApply anyway?")
+            if answer != QtWidgets.QMessageBox.Yes:
+                return
+        self.run_plan(plan)
+
+    def checked_uuids(self, rows):
+        """UUIDs of the given rows, looked up by long name only for rows loaded without one."""
+        store = self.object_model.store
+        uuids = [store.uuids[row] for row in rows]
+        if None not in uuids:
+            return uuids
+        return self.scene.uuids([store.long_names[row] for row in rows])
+
+    def apply_renames(self, new_names_by_uuid):
+        """Plan and apply uuid -> new name renames as one undo step, then refresh the list."""
+        plan = self.plan_renames(new_names_by_uuid)
+        if plan is not None:
+            self.run_plan(plan)
+
+    def plan_renames(self, new_names_by_uuid):
+        """Plan uuid -> new name renames, None after reporting the conflicts if any."""
+        plan = build_plan(cmds, new_names_by_uuid)
+        if not plan.is_valid:
+            details = "\n".join(f"{new_name}: {reason}" for _, new_name, reason in plan.conflicts[:20])
+            QtWidgets.QMessageBox.warning(self, "Name Conflicts", f"{len(plan.conflicts)} names cannot be applied:\n{details}")
+            return None
+        return plan
+
+    def run_plan(self, plan):
+        """Apply a valid plan as one undo step, then refresh the list."""
+        try:
+            # The list is refreshed below, so our own rename events are not needed
+            with self.sync.suspended():
+                apply_plan(cmds, plan)
+        except Exception as e:
+            QtWidgets.QMessageBox.warning(self, "Error", f"Failed to rename objects, changes were rolled back: {str(e)}")
         
-        # Refresh the tool
-        self.populate_objects()
-
-    def sizeHint(self):
-        size = super().sizeHint()
-        for index in range(self.object_list_widget.count()):
-            item = self.object_list_widget.item(index)
-            widget = self.object_list_widget.itemWidget(item)
-            size.setHeight(size.height() + widget.sizeHint().height())
-        return size
\ No newline at end of file
+        # Rows follow their nodes by UUID, paths are re-read in one batch
+        self.scene.invalidate()
+        self.scene.nodes.invalidate()
+        self.refresh_rows()
+
+    def export_plan(self):
+        self.finish_validation()
+        store = self.object_model.store
+        checked_rows = store.checked_rows()
+        if not checked_rows:
+            QtWidgets.QMessageBox.information(self, "Export Plan", "There are no pending renames to export.")
+            return
+        uuids = self.checked_uuids(checked_rows)
+        if uuids is None:
+            QtWidgets.QMessageBox.warning(self, "Scene Changed", "Some objects no longer exist, the list has been refreshed.")
+            self.scene.invalidate()
+            self.populate_objects()
+            return
+        path, _ = QtWidgets.QFileDialog.getSaveFileName(
+            self, "Export Rename Plan", "", "JSON Lines (*.jsonl);;Columnar (*.rnp)")
+        if not path:
+            return
+        if self.session is not None:
+            set_name = ", ".join(self.session.set_names)
+        else:
+            set_name = self.selection_set_dropdown.currentText()
+        manifest = RenameManifest.from_store(store, checked_rows, uuids, set_name,
+                                             {"scene": cmds.file(q=True, sceneName=True)})
+        try:
+            save_manifest(manifest, path)
+        except OSError as e:
+            QtWidgets.QMessageBox.warning(self, "Error", f"Failed to write the plan: {e}")
+
+    @profiled("apply")
+    def import_plan(self):
+        path, _ = QtWidgets.QFileDialog.getOpenFileName(
+            self, "Apply Rename Plan", "", "Rename plans (*.jsonl *.rnp);;All files (*)")
+        if not path:
+            return
+        try:
+            manifest = load_manifest(path)
+        except (OSError, ManifestError) as e:
+            QtWidgets.QMessageBox.warning(self, "Error", f"Failed to read the plan: {e}")
+            return
+        problems = manifest.validate(self.grammar)
+        if problems:
+            details = "\n".join(f"{manifest.old_names[index]}: {reason}" for index, reason in problems[:20])
+            QtWidgets.QMessageBox.warning(self, "Invalid Plan", f"{len(problems)} entries cannot be applied:\n{details}")
+            return
+        self.apply_renames(manifest.new_names_by_uuid())
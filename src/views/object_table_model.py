@@ -0,0 +1,303 @@
+import bisect
+
+from PySide2 import QtWidgets, QtCore, QtGui
+
+from ..core.classify import prefill_invalid
+from ..core.registry import NameRegistry, COLLISION_NONE, COLLISION_LABELS
+from ..core.rows import RowStore, STATUS_INVALID, STATUS_MODIFIED, STATUS_PENDING, STATUS_LABELS
+
+# Token columns follow the check column, one per grammar token, then status and preview
+COL_CHECK = 0
+TOKEN_COLUMN_OFFSET = 1
+
+STATUS_COLORS = {
+    STATUS_INVALID: QtGui.QColor("red"),
+    STATUS_MODIFIED: QtGui.QColor("orange"),
+    STATUS_PENDING: QtGui.QColor("gray"),
+}
+VALID_COLOR = QtGui.QColor("green")
+COLLISION_COLOR = QtGui.QColor("red")
+COLLISION_TOOLTIPS = ("", "An object with this name already exists in the scene.",
+                      "Another row in this batch uses the same name.")
+
+
+class ObjectTableModel(QtCore.QAbstractTableModel):
+    """Table model exposing a RowStore, one row per set member.
+
+    With defer_status the store leaves statuses to a PreviewWorker and its
+    batches are merged with apply_batch, collisions included.
+    """
+
+    # The rows were replaced by load or reload, unlike a reset for a new filter
+    rows_loaded = QtCore.Signal()
+
+    def __init__(self, grammar=None, parent=None, defer_status=False):
+        super().__init__(parent)
+        self.store = RowStore(grammar, defer_status)
+        self.registry = NameRegistry()
+        # Sorted store rows shown by the view, None shows every row
+        self.visible_rows = None
+        self.grammar = self.store.grammar
+        token_count = len(self.grammar.tokens)
+        self.status_column = TOKEN_COLUMN_OFFSET + token_count
+        self.preview_column = self.status_column + 1
+        self.headers = ("",) + tuple(token.label for token in self.grammar.tokens) + ("Status", "Preview")
+
+    def token_index(self, column):
+        """Grammar token shown in a column, or None for the other columns."""
+        token_index = column - TOKEN_COLUMN_OFFSET
+        if 0 <= token_index < len(self.grammar.tokens):
+            return token_index
+        return None
+
+    def load(self, names, long_names=None, scene_names=None, visible_rows=None, uuids=None):
+        self.beginResetModel()
+        self.visible_rows = visible_rows
+        self.store.load(names, long_names, uuids)
+        if scene_names is not None:
+            self.registry = NameRegistry(scene_names)
+        self.registry.bind(self.store)
+        self.endResetModel()
+        self.rows_loaded.emit()
+
+    def reload(self, names, long_names, scene_names=None, visible_rows=None, uuids=None):
+        """Reload rows, keeping the edits of rows whose node is still listed."""
+        self.beginResetModel()
+        self.visible_rows = visible_rows
+        self.store.reload(names, long_names, uuids)
+        if scene_names is not None:
+            self.registry = NameRegistry(scene_names)
+        self.registry.bind(self.store)
+        self.endResetModel()
+        self.rows_loaded.emit()
+
+    def rename_long_names(self, new_long_names, scene_names=None):
+        changed = self.store.rename_long_names(new_long_names)
+        if scene_names is not None:
+            self.registry = NameRegistry(scene_names)
+        self.registry.bind(self.store)
+        if changed:
+            self.emit_rows_changed(changed[0], changed[-1])
+        if scene_names is not None and self.rowCount():
+            # Collisions with the new scene names can change on any row
+            self.dataChanged.emit(self.index(0, self.status_column),
+                                  self.index(self.rowCount() - 1, self.status_column))
+
+    def auto_classify(self, cmds):
+        """Suggest side and type for rows whose name does not parse, returns the rows updated."""
+        rows = prefill_invalid(cmds, self.store)
+        if rows:
+            self.registry.bind(self.store)
+            self.emit_rows_changed(rows[0], rows[-1])
+        return rows
+
+    def apply_bulk_edit(self, edit, revert=False):
+        """Apply or revert a bulk_ops.BulkEdit with one store update and one change signal."""
+        if not edit:
+            return
+        rows = edit.revert(self.store) if revert else edit.apply(self.store)
+        if not rows:
+            return
+        self.registry.bind(self.store)
+        self.emit_rows_changed(min(rows), max(rows))
+
+    def clear(self):
+        self.load([])
+
+    def set_row_filter(self, rows):
+        """Show only the given store rows (sorted), or every row for None.
+
+        Rows keep their pending edits while hidden.
+        """
+        self.beginResetModel()
+        self.visible_rows = rows
+        self.endResetModel()
+
+    def store_row(self, view_row):
+        if self.visible_rows is None:
+            return view_row
+        return self.visible_rows[view_row]
+
+    def store_rows(self, first, last):
+        """Store rows behind a range of view rows."""
+        if self.visible_rows is None:
+            return range(first, last + 1)
+        return self.visible_rows[first:last + 1]
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        if parent.isValid():
+            return 0
+        if self.visible_rows is not None:
+            return len(self.visible_rows)
+        return len(self.store)
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.headers)
+
+    def headerData(self, section, orientation, role=QtCore.Qt.DisplayRole):
+        if orientation == QtCore.Qt.Horizontal and role == QtCore.Qt.DisplayRole:
+            return self.headers[section]
+        return None
+
+    def flags(self, index):
+        if not index.isValid():
+            return QtCore.Qt.NoItemFlags
+        flags = QtCore.Qt.ItemIsEnabled | QtCore.Qt.ItemIsSelectable
+        if self.token_index(index.column()) is not None:
+            flags |= QtCore.Qt.ItemIsEditable
+        return flags
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row = self.store_row(index.row())
+        column = index.column()
+        store = self.store
+
+        if role in (QtCore.Qt.DisplayRole, QtCore.Qt.EditRole):
+            token_index = self.token_index(column)
+            if token_index is not None:
+                return store.token(row, token_index)
+            if column == self.status_column:
+                collision = self.registry.collision(row)
+                if collision != COLLISION_NONE:
+                    return COLLISION_LABELS[collision]
+                return STATUS_LABELS[store.status[row]]
+            if column == self.preview_column and store.is_checked(row):
+                return store.combined_name(row)
+        elif role == QtCore.Qt.CheckStateRole and column == COL_CHECK:
+            return QtCore.Qt.Checked if store.is_checked(row) else QtCore.Qt.Unchecked
+        elif role == QtCore.Qt.ForegroundRole and column == self.status_column:
+            if self.registry.collision(row) != COLLISION_NONE:
+                return COLLISION_COLOR
+            return STATUS_COLORS.get(store.status[row], VALID_COLOR)
+        elif role == QtCore.Qt.ToolTipRole:
+            if column == self.status_column:
+                return COLLISION_TOOLTIPS[self.registry.collision(row)] or None
+            return store.long_names[row]
+        return None
+
+    def setData(self, index, value, role=QtCore.Qt.EditRole):
+        if not index.isValid() or role != QtCore.Qt.EditRole:
+            return False
+        row = self.store_row(index.row())
+        token_index = self.token_index(index.column())
+        if token_index is None:
+            return False
+        self.store.set_token(row, token_index, value)
+        self.emit_rows_changed(row, row)
+        if not self.store.defer_status:
+            # Rows sharing the old or new name may change collision state too
+            for affected in self.registry.update(self.store, row):
+                self.emit_rows_changed(affected, affected)
+        return True
+
+    def apply_batch(self, batch):
+        """Merge the statuses and names of a jobs.PreviewBatch and re-index their collisions.
+
+        Returns the rows whose status changed.
+        """
+        store = self.store
+        changed = store.apply_statuses(batch.rows, batch.statuses)
+        affected = set(changed)
+        update = self.registry.update
+        for row, new_name in zip(batch.rows, batch.new_names):
+            affected.update(update(store, row, new_name))
+        if affected:
+            first, last = min(affected), max(affected)
+            self.emit_columns_changed(first, last, COL_CHECK, COL_CHECK)
+            self.emit_columns_changed(first, last, self.status_column, self.preview_column)
+        return changed
+
+    def emit_rows_changed(self, first, last):
+        """Signal a change of the store rows first to last."""
+        self.emit_columns_changed(first, last, 0, len(self.headers) - 1)
+
+    def emit_columns_changed(self, first, last, first_column, last_column):
+        """Signal a change of some columns of the store rows first to last."""
+        if self.visible_rows is not None:
+            # Narrow to the visible rows in that range
+            first, last = (bisect.bisect_left(self.visible_rows, first),
+                           bisect.bisect_right(self.visible_rows, last) - 1)
+            if first > last:
+                return
+        self.dataChanged.emit(self.index(first, first_column), self.index(last, last_column))
+
+
+class BulkEditCommand(QtWidgets.QUndoCommand):
+    """Undo step for a BulkEdit on an ObjectTableModel."""
+
+    def __init__(self, model, edit, text):
+        super().__init__(f"{text} ({len(edit)} rows)")
+        self.model = model
+        self.edit = edit
+
+    def redo(self):
+        self.model.apply_bulk_edit(self.edit)
+
+    def undo(self):
+        self.model.apply_bulk_edit(self.edit, revert=True)
+
+
+class ObjectDelegate(QtWidgets.QStyledItemDelegate):
+    """Creates editors on demand for the cell being edited only."""
+
+    def createEditor(self, parent, option, index):
+        model = index.model()
+        token_index = model.token_index(index.column())
+        if token_index is None:
+            return super().createEditor(parent, option, index)
+        token = model.grammar.tokens[token_index]
+        if token.is_choice:
+            editor = QtWidgets.QComboBox(parent)
+            editor.addItems(token.choices)
+            editor.currentIndexChanged.connect(lambda: self.commitData.emit(editor))
+            return editor
+        editor = QtWidgets.QLineEdit(parent)
+        # Commit on every keystroke so status and preview stay live
+        editor.textEdited.connect(lambda: self.commitData.emit(editor))
+        return editor
+
+    def setEditorData(self, editor, index):
+        value = index.model().data(index, QtCore.Qt.EditRole)
+        if isinstance(editor, QtWidgets.QComboBox):
+            editor.blockSignals(True)
+            editor.setCurrentText(value)
+            editor.blockSignals(False)
+        elif isinstance(editor, QtWidgets.QLineEdit):
+            if editor.text() != value:
+                editor.setText(value)
+        else:
+            super().setEditorData(editor, index)
+
+    def setModelData(self, editor, model, index):
+        if isinstance(editor, QtWidgets.QComboBox):
+            model.setData(index, editor.currentText(), QtCore.Qt.EditRole)
+        elif isinstance(editor, QtWidgets.QLineEdit):
+            model.setData(index, editor.text(), QtCore.Qt.EditRole)
+        else:
+            super().setModelData(editor, model, index)
+
+
+def create_object_table_view(model, parent=None):
+    """Build a QTableView configured for large, fixed-height row counts."""
+    view = QtWidgets.QTableView(parent)
+    view.setModel(model)
+    view.setItemDelegate(ObjectDelegate(view))
+    view.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows)
+    view.setEditTriggers(QtWidgets.QAbstractItemView.AllEditTriggers)
+    view.setWordWrap(False)
+    # Fixed row heights avoid measuring every row on layout
+    vertical_header = view.verticalHeader()
+    vertical_header.setSectionResizeMode(QtWidgets.QHeaderView.Fixed)
+    vertical_header.setDefaultSectionSize(vertical_header.fontMetrics().height() + 8)
+    vertical_header.setVisible(False)
+    horizontal_header = view.horizontalHeader()
+    horizontal_header.setSectionResizeMode(QtWidgets.QHeaderView.Interactive)
+    primary_column = TOKEN_COLUMN_OFFSET + model.grammar.primary_index
+    horizontal_header.setSectionResizeMode(primary_column, QtWidgets.QHeaderView.Stretch)
+    horizontal_header.setSectionResizeMode(model.preview_column, QtWidgets.QHeaderView.Stretch)
+    view.setColumnWidth(COL_CHECK, 24)
+    return view
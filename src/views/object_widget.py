@@ -1,5 +1,11 @@
+"""Per-object rename row, kept for scripts built on it.
+
+The tool itself lists objects through ObjectTableModel, see
+object_table_model.py. Names follow the active grammar through core.naming.
+"""
 from PySide2 import QtWidgets, QtCore
-import re
+
+from ..core import naming
 
 class ObjectWidget(QtWidgets.QWidget):
     preview_updated = QtCore.Signal()
@@ -24,7 +30,7 @@ class ObjectWidget(QtWidgets.QWidget):
 
         # Left/Right/Center Dropdown
         self.lrc_dropdown = QtWidgets.QComboBox()
-        self.lrc_dropdown.addItems(["L", "R", "C"])
+        self.lrc_dropdown.addItems(naming.SIDES)
         top_layout.addWidget(self.lrc_dropdown)
 
         # Name LineEdit
@@ -33,7 +39,7 @@ class ObjectWidget(QtWidgets.QWidget):
 
         # Object Type Dropdown
         self.type_dropdown = QtWidgets.QComboBox()
-        self.type_dropdown.addItems(["GEO", "JNT", "CTRL"])
+        self.type_dropdown.addItems(naming.TYPES)
         top_layout.addWidget(self.type_dropdown)
 
         # Status Label
@@ -54,20 +60,19 @@ class ObjectWidget(QtWidgets.QWidget):
         self.type_dropdown.currentIndexChanged.connect(self.on_widget_changed)
 
     def validate_name(self, name):
-        pattern = r'^([CLR])_([a-zA-Z0-9]+)_(GEO|JNT|CTRL)$'
-        return bool(re.match(pattern, name))
+        return naming.validate_name(name)
 
     def populate_fields(self):
-        if self.is_valid:
-            parts = self.obj_name.split('_')
+        parts = naming.parse_name(self.obj_name)
+        if parts:
             self.lrc_dropdown.setCurrentText(parts[0])
             self.name_lineedit.setText(parts[1])
             self.type_dropdown.setCurrentText(parts[2])
         else:
             self.name_lineedit.setText(self.obj_name)
             # Set default values for invalid names
-            self.lrc_dropdown.setCurrentText("C")
-            self.type_dropdown.setCurrentText("GEO")
+            self.lrc_dropdown.setCurrentText(naming.DEFAULT_SIDE)
+            self.type_dropdown.setCurrentText(naming.DEFAULT_TYPE)
 
     def on_widget_changed(self):
         self.update_preview()
@@ -75,14 +80,13 @@ class ObjectWidget(QtWidgets.QWidget):
         self.preview_updated.emit()
 
     def update_preview(self):
-        cleaned_name = self.clean_name(self.name_lineedit.text())
-        new_name = f"{self.lrc_dropdown.currentText()}_{cleaned_name}_{self.type_dropdown.currentText()}"
+        new_name = self.get_combined_name()
         self.is_valid = self.validate_name(new_name)
         self.preview_label.setText(f"Preview: {new_name}")
 
     def clean_name(self, name):
         # Remove illegal characters and spaces
-        return re.sub(r'[^a-zA-Z0-9]', '', name)
+        return naming.clean_name(name)
 
     def update_status(self):
         if not self.is_valid:
@@ -105,8 +109,9 @@ class ObjectWidget(QtWidgets.QWidget):
         self.parent().parent().updateGeometry()
 
     def get_combined_name(self):
-        cleaned_name = self.clean_name(self.name_lineedit.text())
-        return f"{self.lrc_dropdown.currentText()}_{cleaned_name}_{self.type_dropdown.currentText()}"
+        return naming.compose_name(self.lrc_dropdown.currentText(),
+                                   self.name_lineedit.text(),
+                                   self.type_dropdown.currentText())
 
     def has_changed(self):
         return self.get_combined_name() != self.original_name
@@ -0,0 +1,109 @@
+"""Runs preview jobs (core/jobs.py) on a worker thread and streams their batches back.
+
+Jobs only see a RowSnapshot, so the worker thread never touches the row store
+or maya.cmds. Batches reach the main thread through queued signals and are
+dropped there if a newer job was started in the meantime.
+"""
+from PySide2 import QtCore
+
+from ..core.jobs import DEFAULT_BATCH_SIZE, Generation, RowSnapshot, preview_batches
+
+
+class _JobSignals(QtCore.QObject):
+    # Emitted from the worker thread with the generation of the job
+    batch_ready = QtCore.Signal(int, object)
+    finished = QtCore.Signal(int)
+
+
+class PreviewJob(QtCore.QRunnable):
+    def __init__(self, snapshot, token, signals, batch_size=DEFAULT_BATCH_SIZE):
+        super().__init__()
+        self.snapshot = snapshot
+        self.token = token
+        self.signals = signals
+        self.batch_size = batch_size
+
+    def run(self):
+        try:
+            for batch in preview_batches(self.snapshot, self.token, self.batch_size):
+                self.signals.batch_ready.emit(self.token.value, batch)
+        finally:
+            self.signals.finished.emit(self.token.value)
+
+
+class PreviewWorker(QtCore.QObject):
+    """Validates rows and composes their new names in the background.
+
+    Rows stay pending until a batch of the current job covers them, so a
+    cancelled job hands its unfinished rows over to the next one.
+    """
+
+    batch_ready = QtCore.Signal(object)
+    finished = QtCore.Signal()
+
+    def __init__(self, parent=None, batch_size=DEFAULT_BATCH_SIZE):
+        super().__init__(parent)
+        self.batch_size = batch_size
+        self.generation = Generation()
+        self._pending = set()
+        # One thread is enough, a newer job always replaces the running one
+        self.pool = QtCore.QThreadPool(self)
+        self.pool.setMaxThreadCount(1)
+        self._signals = _JobSignals(self)
+        self._signals.batch_ready.connect(self._on_batch_ready)
+        self._signals.finished.connect(self._on_finished)
+
+    @property
+    def busy(self):
+        return bool(self._pending)
+
+    def submit(self, store, rows=None, first=None):
+        """Start a job for the given rows of store plus the pending ones, or for every row.
+
+        Pending rows also listed in first, such as the rows on screen, are done first.
+        """
+        if rows is None:
+            self._pending = set(range(len(store)))
+        else:
+            self._pending.update(rows)
+        token = self.generation.advance()
+        # Jobs still queued are out of date
+        self.pool.clear()
+        if self._pending:
+            snapshot = RowSnapshot.from_store(store, [row for row in self._pending if row < len(store)], first)
+            self.pool.start(PreviewJob(snapshot, token, self._signals, self.batch_size))
+        return token
+
+    def cancel(self):
+        """Drop the batches of the running job, its pending rows go to the next submit."""
+        self.generation.advance()
+
+    def finish(self, store):
+        """Validate the pending rows and the stale rows of store on the calling thread.
+
+        Their batches are emitted before this returns, for callers that need
+        final statuses, such as the rows about to be renamed.
+        """
+        rows = self._pending.union(store.stale_rows)
+        self.cancel()
+        self._pending.clear()
+        if not rows:
+            return
+        snapshot = RowSnapshot.from_store(store, [row for row in rows if row < len(store)])
+        for batch in preview_batches(snapshot, batch_size=self.batch_size):
+            self.batch_ready.emit(batch)
+
+    def wait(self, msecs=-1):
+        """Block until the running job ends, its batches are delivered by the event loop."""
+        return self.pool.waitForDone(msecs)
+
+    def _on_batch_ready(self, generation, batch):
+        if not self.generation.is_current(generation):
+            return
+        self._pending.difference_update(batch.rows)
+        self.batch_ready.emit(batch)
+
+    def _on_finished(self, generation):
+        if self.generation.is_current(generation):
+            self._pending.clear()
+            self.finished.emit()
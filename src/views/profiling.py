@@ -0,0 +1,128 @@
+"""Switches the shared profiler on for the views and times Qt layout work.
+
+Set PRTTM_PROFILE=1 before launching the tool to profile a session, see
+core/profiling.py for the report.
+"""
+import os
+import sys
+import time
+
+import shiboken2
+from PySide2 import QtCore, QtWidgets
+
+from ..core.profiling import PROFILER, KIND_QT, PROFILE_ENV_VAR, InstrumentedCmds
+from . import object_namer_tool, selection_set_editor
+
+# View modules whose cmds calls are recorded
+INSTRUMENTED_MODULES = (object_namer_tool, selection_set_editor)
+
+TIMED_EVENTS = {
+    QtCore.QEvent.LayoutRequest: "layout",
+    QtCore.QEvent.Resize: "resize",
+    QtCore.QEvent.Move: "move",
+    QtCore.QEvent.Paint: "paint",
+}
+
+
+class TimedApplication(QtWidgets.QApplication):
+    """QApplication timing layout, geometry and paint events while profiling.
+
+    The time is taken around notify, so the event goes through every event
+    filter and handler as usual. Inside Maya, which creates its own
+    application, EventTimer does the same job.
+    """
+
+    def notify(self, receiver, event):
+        if not PROFILER.enabled:
+            return super().notify(receiver, event)
+        label = TIMED_EVENTS.get(event.type())
+        if label is None or not isinstance(receiver, QtWidgets.QWidget):
+            return super().notify(receiver, event)
+        # Read before delivery, a handler may delete the receiver
+        name = f"{label} {type(receiver).__name__}"
+        start = time.perf_counter()
+        try:
+            return super().notify(receiver, event)
+        finally:
+            PROFILER.record(KIND_QT, name, time.perf_counter() - start)
+
+
+class EventTimer(QtCore.QObject):
+    """Application event filter timing the same events as TimedApplication.
+
+    A timed event is sent again from the filter, so the object's filters and
+    handler run inside the measurement, and then reported as handled so it
+    is not delivered twice. Application filters installed after this one
+    see the event twice.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        # C++ addresses of the events being sent again, those pass through
+        self._delivering = set()
+
+    def eventFilter(self, watched, event):
+        if not PROFILER.enabled:
+            return False
+        label = TIMED_EVENTS.get(event.type())
+        if label is None or not isinstance(watched, QtWidgets.QWidget):
+            return False
+        address = shiboken2.getCppPointer(event)[0]
+        if address in self._delivering:
+            return False
+        name = f"{label} {type(watched).__name__}"
+        self._delivering.add(address)
+        start = time.perf_counter()
+        try:
+            QtCore.QCoreApplication.sendEvent(watched, event)
+        finally:
+            PROFILER.record(KIND_QT, name, time.perf_counter() - start)
+            self._delivering.discard(address)
+        return True
+
+
+_event_timer = None
+
+
+def profiling_requested():
+    return os.environ.get(PROFILE_ENV_VAR, "") not in ("", "0")
+
+
+def create_application(argv=None, timed=None):
+    """Create the QApplication, a TimedApplication if timed or profiling is requested."""
+    if timed is None:
+        timed = profiling_requested()
+    application_class = TimedApplication if timed else QtWidgets.QApplication
+    return application_class(argv if argv is not None else sys.argv[:1])
+
+
+def enable_profiling():
+    """Start recording: wrap the views' cmds and time Qt events.
+
+    Qt events are timed by a TimedApplication, or by an EventTimer installed
+    on any other application, such as Maya's. Call it before creating the
+    tool, which keeps the cmds it was built with.
+    """
+    global _event_timer
+    PROFILER.enabled = True
+    for module in INSTRUMENTED_MODULES:
+        module.cmds = PROFILER.instrument(module.cmds)
+    application = QtWidgets.QApplication.instance()
+    if application is not None and not isinstance(application, TimedApplication) and _event_timer is None:
+        _event_timer = EventTimer(application)
+        application.installEventFilter(_event_timer)
+
+
+def disable_profiling():
+    """Stop recording and give the views their plain cmds back."""
+    global _event_timer
+    PROFILER.enabled = False
+    for module in INSTRUMENTED_MODULES:
+        if isinstance(module.cmds, InstrumentedCmds):
+            module.cmds = module.cmds.wrapped
+    if _event_timer is not None:
+        application = QtWidgets.QApplication.instance()
+        if application is not None:
+            application.removeEventFilter(_event_timer)
+        _event_timer.deleteLater()
+        _event_timer = None
@@ -0,0 +1,208 @@
+from PySide2 import QtCore
+
+from ..core.hierarchy import HierarchyIndex, ROOT
+
+LONG_NAME_ROLE = QtCore.Qt.UserRole + 1
+
+
+class _TreeItem:
+    """Fetched node, created only once its parent branch is expanded."""
+
+    __slots__ = ("node_id", "parent", "row", "children")
+
+    def __init__(self, node_id, parent, row):
+        self.node_id = node_id
+        self.parent = parent
+        self.row = row
+        self.children = None
+
+
+class SceneTreeModel(QtCore.QAbstractItemModel):
+    """Lazy tree model over a HierarchyIndex.
+
+    Children of a node are turned into items in fetchMore, which views only
+    call for expanded branches.
+    """
+
+    def __init__(self, hierarchy=None, parent=None):
+        super().__init__(parent)
+        self.hierarchy = hierarchy or HierarchyIndex()
+        self.visible = None
+        self._reset_items()
+
+    def _reset_items(self):
+        self._root = _TreeItem(ROOT, None, 0)
+        # Fetched items by node id
+        self._items = {ROOT: self._root}
+
+    def set_hierarchy(self, hierarchy):
+        self.beginResetModel()
+        self.hierarchy = hierarchy
+        self.visible = None
+        self._reset_items()
+        self.endResetModel()
+
+    def set_visible(self, visible):
+        """Restrict the tree to a set of node ids, or show everything with None."""
+        self.beginResetModel()
+        self.visible = visible
+        self._reset_items()
+        self.endResetModel()
+
+    def update_branches(self, node_ids):
+        """Follow a hierarchy patched in place: refetch the children of node_ids.
+
+        Items already fetched are moved rather than recreated, so expanded
+        branches, the selection and other persistent indexes survive.
+        Branches never fetched are left for fetchMore.
+        """
+        items = self._items
+        branches = [items[node_id] for node_id in node_ids
+                    if node_id in items and items[node_id].children is not None]
+        if not branches:
+            return
+        self.layoutAboutToBeChanged.emit()
+        previous = self.persistentIndexList()
+        left = []
+        for item in branches:
+            left.extend(item.children)
+            item.children = []
+            for row, child_id in enumerate(self._child_ids(item.node_id)):
+                child = items.get(child_id)
+                if child is None:
+                    child = items[child_id] = _TreeItem(child_id, item, row)
+                child.parent = item
+                child.row = row
+                item.children.append(child)
+        for child in left:
+            if not self._is_placed(child):
+                self._drop(child)
+        self.changePersistentIndexList(previous, [self._current_index(index) for index in previous])
+        self.layoutChanged.emit()
+
+    def _is_placed(self, item):
+        siblings = item.parent.children
+        return (self._items.get(item.node_id) is item and siblings is not None
+                and item.row < len(siblings) and siblings[item.row] is item)
+
+    def _drop(self, item):
+        stack = [item]
+        while stack:
+            current = stack.pop()
+            if self._items.get(current.node_id) is current:
+                del self._items[current.node_id]
+            # Children moved to another fetched branch keep their item
+            stack.extend(child for child in current.children or () if child.parent is current)
+
+    def _current_index(self, index):
+        item = index.internalPointer()
+        if item is None or not self._is_placed(item):
+            return QtCore.QModelIndex()
+        return self.createIndex(item.row, index.column(), item)
+
+    def _child_ids(self, node_id):
+        children = self.hierarchy.children(node_id)
+        if self.visible is None:
+            return children
+        visible = self.visible
+        return [child for child in children if child in visible]
+
+    def _item(self, index):
+        if index.isValid():
+            return index.internalPointer()
+        return self._root
+
+    def index(self, row, column, parent=QtCore.QModelIndex()):
+        parent_item = self._item(parent)
+        if column != 0 or parent_item.children is None or not 0 <= row < len(parent_item.children):
+            return QtCore.QModelIndex()
+        return self.createIndex(row, column, parent_item.children[row])
+
+    def parent(self, index):
+        if not index.isValid():
+            return QtCore.QModelIndex()
+        parent_item = index.internalPointer().parent
+        if parent_item is None or parent_item is self._root:
+            return QtCore.QModelIndex()
+        return self.createIndex(parent_item.row, 0, parent_item)
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        if parent.column() > 0:
+            return 0
+        item = self._item(parent)
+        if item is self._root and item.children is None:
+            self._fetch(item)
+        return len(item.children) if item.children is not None else 0
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        return 1
+
+    def hasChildren(self, parent=QtCore.QModelIndex()):
+        item = self._item(parent)
+        if item.children is not None:
+            return bool(item.children)
+        return bool(self._child_ids(item.node_id))
+
+    def canFetchMore(self, parent):
+        item = self._item(parent)
+        return item.children is None and bool(self._child_ids(item.node_id))
+
+    def fetchMore(self, parent):
+        item = self._item(parent)
+        if item.children is not None:
+            return
+        child_ids = self._child_ids(item.node_id)
+        self.beginInsertRows(parent, 0, len(child_ids) - 1)
+        self._fetch(item, child_ids)
+        self.endInsertRows()
+
+    def _fetch(self, item, child_ids=None):
+        if child_ids is None:
+            child_ids = self._child_ids(item.node_id)
+        item.children = [_TreeItem(node_id, item, row) for row, node_id in enumerate(child_ids)]
+        self._items.update((child.node_id, child) for child in item.children)
+
+    def headerData(self, section, orientation, role=QtCore.Qt.DisplayRole):
+        if orientation == QtCore.Qt.Horizontal and role == QtCore.Qt.DisplayRole:
+            return "Scene Hierarchy"
+        return None
+
+    def flags(self, index):
+        if not index.isValid():
+            return QtCore.Qt.NoItemFlags
+        return QtCore.Qt.ItemIsEnabled | QtCore.Qt.ItemIsSelectable | QtCore.Qt.ItemIsDragEnabled
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        node_id = index.internalPointer().node_id
+        if role == QtCore.Qt.DisplayRole:
+            return self.hierarchy.names[node_id]
+        if role in (QtCore.Qt.ToolTipRole, LONG_NAME_ROLE):
+            return self.hierarchy.paths[node_id]
+        return None
+
+    def mimeTypes(self):
+        return ["text/plain"]
+
+    def mimeData(self, indexes):
+        # Long names as newline separated text, decoded in one call on drop
+        paths = self.hierarchy.paths
+        mime_data = QtCore.QMimeData()
+        mime_data.setText("\n".join(paths[index.internalPointer().node_id]
+                                    for index in indexes if index.isValid() and index.column() == 0))
+        return mime_data
+
+    def index_for_node(self, node_id):
+        """Model index for a node id, fetching its ancestors' branches if needed."""
+        chain = [node_id] + self.hierarchy.ancestors(node_id)
+        index = QtCore.QModelIndex()
+        for current in reversed(chain):
+            if self.canFetchMore(index):
+                self.fetchMore(index)
+            item = self._item(index)
+            row = next((child.row for child in item.children or () if child.node_id == current), None)
+            if row is None:
+                return QtCore.QModelIndex()
+            index = self.index(row, 0, index)
+        return index
@@ -1,93 +1,42 @@
 import maya.cmds as cmds
 from PySide2 import QtWidgets, QtCore, QtGui
 
-class CustomListWidget(QtWidgets.QListWidget):
-    def __init__(self, parent=None):
-        super(CustomListWidget, self).__init__(parent)
-        self.setAcceptDrops(True)
-        self.setDragDropMode(QtWidgets.QAbstractItemView.DragDrop)
-        self.setDropIndicatorShown(True)
-
-    def dragEnterEvent(self, event):
-        print("Drag enter event")
-        mime_data = event.mimeData()
-        print(f"Mime formats: {mime_data.formats()}")
-        event.accept()
-        print("Drag enter accepted")
-
-    def dragMoveEvent(self, event):
-        event.accept()
-        print("Drag move accepted")
-
-    def dropEvent(self, event):
-        print("Drop event triggered")
-        mime_data = event.mimeData()
-        print(f"Mime formats: {mime_data.formats()}")
-        
-        if mime_data.hasFormat('application/x-qabstractitemmodeldatalist'):
-            print("Processing QAbstractItemModel data")
-            model_data = mime_data.data('application/x-qabstractitemmodeldatalist')
-            item_texts = self.decode_model_data(model_data)
-            self.process_dropped_items(item_texts)
-        elif mime_data.hasText():
-            print(f"Processing text data: {mime_data.text()}")
-            self.process_dropped_items([mime_data.text()])
-        else:
-            print("Unrecognized mime data format")
-            for format in mime_data.formats():
-                print(f"Data for {format}: {mime_data.data(format)}")
-        
-        event.accept()
-        print("Drop event accepted")
-
-    def decode_model_data(self, model_data):
-        stream = QtCore.QDataStream(model_data)
-        items = []
-        while not stream.atEnd():
-            row = stream.readInt32()
-            column = stream.readInt32()
-            map_items = stream.readInt32()
-            for i in range(map_items):
-                key = stream.readInt32()
-                value = stream.readQVariant()
-                if key == 0:  # Qt.DisplayRole
-                    items.append(str(value))
-        return items
-
-    def process_dropped_items(self, items):
-        print(f"Processing dropped items: {items}")
-        current_items = set(self.item(i).text().strip().lower() for i in range(self.count()))
-        
-        for item_text in items:
-            cleaned_text = item_text.strip()
-            if cleaned_text and cleaned_text.lower() not in current_items:
-                print(f"Adding new item: '{cleaned_text}'")
-                self.addItem(cleaned_text)
-                current_items.add(cleaned_text.lower())
-            else:
-                print(f"Duplicate or empty item, not adding: '{cleaned_text}'")
-        
-        print(f"Current items after drop: {[self.item(i).text() for i in range(self.count())]}")
-
-    def dropMimeData(self, index, data, action):
-        print(f"dropMimeData called: index={index}, action={action}")
-        if data.hasFormat('application/x-qabstractitemmodeldatalist'):
-            model_data = data.data('application/x-qabstractitemmodeldatalist')
-            item_texts = self.decode_model_data(model_data)
-            self.process_dropped_items(item_texts)
-        elif data.hasText():
-            self.process_dropped_items([data.text()])
-        return True
+import logging
+import re
+
+from ..core.hierarchy import apply_delta as apply_hierarchy_delta, load_hierarchy
+from ..core.node_cache import NodeCache
+from ..core.profiling import profiled
+from ..core.search import SearchIndex, MODE_SUBSTRING, MODE_GLOB, MODE_REGEX
+from ..core.set_edit import create_set, set_delta, apply_set_delta
+from .membership_list_model import MembershipListModel, create_membership_list_view
+from .scene_tree_model import SceneTreeModel
+
+logger = logging.getLogger(__name__)
+
+SEARCH_DELAY_MS = 200
+SEARCH_MODES = (("Contains", MODE_SUBSTRING), ("Glob", MODE_GLOB), ("Regex", MODE_REGEX))
 
 class SelectionSetEditor(QtWidgets.QDialog):
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, sync=None, nodes=None):
         super().__init__(parent)
         self.setWindowTitle("Selection Set Editor")
         self.setMinimumSize(800, 600)
         self.selected_set = None
+        # UUIDs of the edited set's members when it was listed, commits send the difference
+        self.loaded_members = []
+        self.search_index = None
+        self.sync = sync
+        # Members are keyed by UUID, a cache shared with the tool is kept current by the tool
+        self.owns_nodes = nodes is None
+        self.nodes = NodeCache(cmds) if nodes is None else nodes
         self.create_ui()
-        self.populate_tree_widget()
         self.populate_list_widget_with_selection()
+        # Load the hierarchy once the dialog is on screen
+        QtCore.QTimer.singleShot(0, self.populate_tree_widget)
+        if self.sync is not None:
+            self.sync.add_listener(self.apply_scene_delta)
+            self.finished.connect(lambda: self.sync.remove_listener(self.apply_scene_delta))
 
     def create_ui(self):
         main_layout = QtWidgets.QHBoxLayout(self)
@@ -96,15 +45,29 @@ class SelectionSetEditor(QtWidgets.QDialog):
         left_panel = QtWidgets.QVBoxLayout()
         main_layout.addLayout(left_panel, 1)
 
-        # Search bar
+        # Search bar, filtering waits for a pause in typing
+        search_layout = QtWidgets.QHBoxLayout()
         self.search_bar = QtWidgets.QLineEdit()
         self.search_bar.setPlaceholderText("Search objects...")
-        self.search_bar.textChanged.connect(self.filter_tree)
-        left_panel.addWidget(self.search_bar)
-
-        # Tree Widget
-        self.tree_widget = QtWidgets.QTreeWidget()
-        self.tree_widget.setHeaderLabel("Scene Hierarchy")
+        search_layout.addWidget(self.search_bar)
+        self.search_mode_dropdown = QtWidgets.QComboBox()
+        for label, mode in SEARCH_MODES:
+            self.search_mode_dropdown.addItem(label, mode)
+        search_layout.addWidget(self.search_mode_dropdown)
+        left_panel.addLayout(search_layout)
+
+        self.search_timer = QtCore.QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(SEARCH_DELAY_MS)
+        self.search_timer.timeout.connect(self.filter_tree)
+        self.search_bar.textChanged.connect(self.search_timer.start)
+        self.search_mode_dropdown.currentIndexChanged.connect(self.filter_tree)
+
+        # Tree View, branches are only built when expanded
+        self.tree_model = SceneTreeModel(parent=self)
+        self.tree_widget = QtWidgets.QTreeView()
+        self.tree_widget.setModel(self.tree_model)
+        self.tree_widget.setUniformRowHeights(True)
         self.tree_widget.setSelectionMode(QtWidgets.QAbstractItemView.ExtendedSelection)
         self.tree_widget.setDragEnabled(True)
         left_panel.addWidget(self.tree_widget)
@@ -131,8 +94,9 @@ class SelectionSetEditor(QtWidgets.QDialog):
         self.name_input = QtWidgets.QLineEdit()
         right_panel.addWidget(self.name_input)
 
-        # List Widget
-        self.list_widget = CustomListWidget()
+        # Members being edited, drops from the tree are deduplicated and inserted in bulk
+        self.list_model = MembershipListModel(self, resolve=self.nodes.resolve)
+        self.list_widget = create_membership_list_view(self.list_model)
         right_panel.addWidget(self.list_widget)
 
         # Remove Selected Button
@@ -150,38 +114,64 @@ class SelectionSetEditor(QtWidgets.QDialog):
         self.set_dropdown.currentIndexChanged.connect(self.load_selected_set)
         self.commit_button.clicked.connect(self.commit_changes)
 
+    @profiled("tree")
     def populate_tree_widget(self):
-        all_objects = sorted(cmds.ls(assemblies=True))
-        for obj in all_objects:
-            self.add_item_to_tree(obj, self.tree_widget.invisibleRootItem())
-
-    def add_item_to_tree(self, obj, parent):
-        item = QtWidgets.QTreeWidgetItem(parent, [obj])
-        children = sorted(cmds.listRelatives(obj, children=True, type='transform') or [])
-        for child in children:
-            self.add_item_to_tree(child, item)
+        hierarchy = load_hierarchy(cmds)
+        self.search_index = SearchIndex(hierarchy)
+        self.tree_model.set_hierarchy(hierarchy)
+        self.filter_tree()
+
+    @profiled("tree")
+    def patch_tree(self, delta):
+        """Patch the hierarchy, search index and tree in place for a scene delta."""
+        changed, branches = apply_hierarchy_delta(cmds, self.tree_model.hierarchy, delta)
+        self.search_index.update(changed)
+        if self.search_bar.text():
+            # Matches may have changed, the filtered tree is rebuilt from the query
+            self.filter_tree()
+        else:
+            self.tree_model.update_branches(branches)
 
+    @profiled("filter")
     def filter_tree(self):
-        filter_text = self.search_bar.text().lower()
-        self.filter_tree_item(self.tree_widget.invisibleRootItem(), filter_text)
-
-    def filter_tree_item(self, item, filter_text):
-        item_visible = False
-        for i in range(item.childCount()):
-            child = item.child(i)
-            child_visible = self.filter_tree_item(child, filter_text)
-            item_visible = item_visible or child_visible
-
-        if filter_text in item.text(0).lower():
-            item_visible = True
-
-        item.setHidden(not item_visible)
-        return item_visible
+        self.search_timer.stop()
+        filter_text = self.search_bar.text()
+        if not filter_text or self.search_index is None:
+            self.tree_model.set_visible(None)
+            return
+
+        try:
+            result = self.search_index.query(filter_text, self.search_mode_dropdown.currentData())
+        except re.error as e:
+            self.search_bar.setToolTip(f"Invalid pattern: {e}")
+            self.tree_model.set_visible(set())
+            return
+        self.search_bar.setToolTip("")
+        self.tree_model.set_visible(result.visible)
+
+    def apply_scene_delta(self, delta):
+        if self.owns_nodes:
+            self.nodes.apply_delta(delta)
+        if delta.moved_nodes:
+            # Reparents without a known previous path, a single bulk query rebuilds the index
+            self.populate_tree_widget()
+        elif delta.hierarchy_changed and self.search_index is not None:
+            self.patch_tree(delta)
+        if self.edit_existing_radio.isChecked() and (delta.added_sets or delta.removed_sets):
+            current_set = self.set_dropdown.currentText()
+            self.set_dropdown.blockSignals(True)
+            for set_name in delta.removed_sets:
+                index = self.set_dropdown.findText(set_name)
+                if index != -1:
+                    self.set_dropdown.removeItem(index)
+            self.set_dropdown.addItems([name for name in delta.added_sets if self.set_dropdown.findText(name) == -1])
+            self.set_dropdown.blockSignals(False)
+            if current_set in delta.removed_sets:
+                self.load_selected_set()
 
     def populate_list_widget_with_selection(self):
         selected_objects = cmds.ls(selection=True, long=True)
-        self.list_widget.clear()
-        self.list_widget.addItems(selected_objects)
+        self.list_model.set_items(selected_objects)
 
     def toggle_mode(self):
         is_edit_mode = self.edit_existing_radio.isChecked()
@@ -203,26 +193,27 @@ class SelectionSetEditor(QtWidgets.QDialog):
             selected_set = self.set_dropdown.currentText()
             if selected_set:
                 set_members = cmds.sets(selected_set, q=True) or []
-                self.list_widget.clear()
-                self.list_widget.addItems(set_members)
+                self.list_model.set_items(set_members)
+                self.loaded_members = self.list_model.keys()
 
     def remove_selected_items(self):
-        for item in self.list_widget.selectedItems():
-            self.list_widget.takeItem(self.list_widget.row(item))
+        rows = [index.row() for index in self.list_widget.selectionModel().selectedRows()]
+        self.list_model.remove_rows(rows)
 
+    @profiled("commit")
     def commit_changes(self):
-        objects_to_set = [self.list_widget.item(i).text() for i in range(self.list_widget.count())]
-        
-        # Filter out shape nodes
-        objects_to_set = [obj for obj in objects_to_set if cmds.objectType(obj) != 'mesh']
-        
+        # Members are UUIDs, renamed or reparented nodes resolve to their current path
+        members = self.list_model.keys()
+
         if self.create_edit_radio.isChecked():
             set_name = self.name_input.text().strip()
             if not set_name:
                 QtWidgets.QMessageBox.warning(self, "Invalid Name", "Please enter a valid set name.")
                 return
             try:
-                cmds.sets(objects_to_set, name=set_name)
+                # Meshes are left out, names and types come from the node cache
+                set_name, unresolved = create_set(cmds, self.nodes, set_name, members)
+                self.report_unresolved(unresolved)
                 QtWidgets.QMessageBox.information(self, "Success", f"Selection set '{set_name}' created/updated.")
                 self.selected_set = set_name
                 self.accept()
@@ -232,13 +223,21 @@ class SelectionSetEditor(QtWidgets.QDialog):
             selected_set = self.set_dropdown.currentText()
             if selected_set:
                 try:
-                    cmds.sets(clear=selected_set)
-                    cmds.sets(objects_to_set, addElement=selected_set)
-                    QtWidgets.QMessageBox.information(self, "Success", f"Selection set '{selected_set}' updated.")
+                    # Only the added and removed members are sent to Maya, as one undo step
+                    delta = set_delta(self.nodes, selected_set, members, self.loaded_members)
+                    apply_set_delta(cmds, delta)
+                    self.report_unresolved(delta.unresolved)
+                    QtWidgets.QMessageBox.information(
+                        self, "Success",
+                        f"Selection set '{selected_set}' updated: {len(delta.added)} added, {len(delta.removed)} removed.")
                     self.selected_set = selected_set
                     self.accept()
                 except Exception as e:
                     QtWidgets.QMessageBox.warning(self, "Error", f"Failed to update set: {str(e)}")
 
+    def report_unresolved(self, unresolved):
+        if unresolved:
+            logger.warning("%d listed objects no longer exist and were skipped.", unresolved)
+
     def get_selected_set(self):
         return self.selected_set
\ No newline at end of file
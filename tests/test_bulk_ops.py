@@ -0,0 +1,64 @@
+import re
+
+import pytest
+
+from ..src.core import bulk_ops
+from ..src.core.grammar import DEFAULT_GRAMMAR_PATH, load_grammar
+from ..src.core.rows import RowStore
+
+NAME = 1
+SIDE = 0
+
+
+@pytest.fixture
+def store():
+    store = RowStore(load_grammar(DEFAULT_GRAMMAR_PATH))
+    store.load(["L_armUpper_GEO", "R_armLower_GEO", "C_spine_JNT", "badName"])
+    return store
+
+
+def names(store):
+    return store.token_column(NAME)
+
+
+def test_replace_only_lists_changed_rows(store):
+    edit = bulk_ops.replace(store, NAME, "arm", "leg")
+    assert edit.rows == [0, 1]
+    edit.apply(store)
+    assert names(store) == ["legUpper", "legLower", "spine", "badName"]
+    edit.revert(store)
+    assert names(store) == ["armUpper", "armLower", "spine", "badName"]
+
+
+def test_regex_replace_with_group_references(store):
+    bulk_ops.regex_replace(store, NAME, r"arm(\w)(?P<rest>\w+)", r"\g<rest>\1Arm").apply(store)
+    assert names(store)[:2] == ["pperUArm", "owerLArm"]
+    with pytest.raises(re.error):
+        bulk_ops.regex_replace(store, NAME, "(a)", r"\2")
+
+
+def test_text_operations(store):
+    bulk_ops.bulk_edit(store, bulk_ops.OP_ADD_PREFIX, NAME, "pre").apply(store)
+    bulk_ops.bulk_edit(store, bulk_ops.OP_STRIP_PREFIX, NAME, "prearm").apply(store)
+    bulk_ops.bulk_edit(store, bulk_ops.OP_CAPITALIZE, NAME).apply(store)
+    assert names(store) == ["Upper", "Lower", "Prespine", "PrebadName"]
+
+
+def test_set_value_checks_choices(store):
+    bulk_ops.set_value(store, SIDE, "R", rows=[0, 2]).apply(store)
+    assert store.token_column(SIDE) == ["R", "R", "R", "C"]
+    with pytest.raises(ValueError):
+        bulk_ops.set_value(store, SIDE, "X")
+    with pytest.raises(ValueError):
+        bulk_ops.replace(store, SIDE, "L", "R")
+
+
+def test_undo_and_redo_keep_cells_typed_into_since(store):
+    edit = bulk_ops.replace(store, NAME, "arm", "leg")
+    assert edit.apply(store) == [0, 1]
+    store.set_token(0, NAME, "typed")
+    assert edit.revert(store) == [1]
+    assert names(store)[:2] == ["typed", "armLower"]
+    store.set_token(1, NAME, "typedAgain")
+    assert edit.apply(store) == []
+    assert names(store)[:2] == ["typed", "typedAgain"]
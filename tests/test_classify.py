@@ -0,0 +1,73 @@
+import pytest
+
+from ..src.core import classify as classify_module
+from ..src.core.classify import classify, classify_sides, classify_types, prefill_invalid
+from ..src.core.fake_cmds import FakeCmds
+from ..src.core.grammar import DEFAULT_GRAMMAR_PATH, load_grammar
+from ..src.core.rows import RowStore
+
+# (name, node type, shape type or None, center X, expected side, expected type)
+NODES = (
+    ("leftArm", "transform", "mesh", 5.0, "L", "GEO"),
+    ("rightArm", "transform", "mesh", -5.0, "R", "GEO"),
+    ("spine", "joint", None, 0.0, "C", "JNT"),
+    ("handCtrl", "transform", "nurbsCurve", 3.0, "L", "CTRL"),
+    ("footGuide", "transform", "locator", -2.0, "R", None),
+    ("nearlyCentered", "transform", "nurbsSurface", 0.05, "C", "GEO"),
+    ("emptyGroup", "transform", None, 0.0, "C", None),
+)
+
+
+@pytest.fixture
+def scene():
+    cmds = FakeCmds()
+    long_names = []
+    for name, node_type, shape_type, center_x, _, _ in NODES:
+        node = cmds.createNode(node_type, name=name)
+        if shape_type is not None:
+            cmds.createNode(shape_type, name=f"{name}Shape", parent=node)
+        cmds.set_bounding_box(node, (center_x - 1, 0, -1, center_x + 1, 2, 1))
+        long_names.append(cmds.ls(node, long=True)[0])
+    return cmds, long_names
+
+
+def test_classify_labels_known_shapes(scene):
+    cmds, long_names = scene
+    grammar = load_grammar(DEFAULT_GRAMMAR_PATH)
+    cmds.calls.clear()
+    suggestions = classify(cmds, long_names, grammar)
+    assert suggestions[grammar.token_names.index("side")] == [node[4] for node in NODES]
+    # LOC is not a type of the default grammar
+    assert suggestions[grammar.token_names.index("type")] == [node[5] for node in NODES]
+    assert sum(cmds.calls.values()) == 4
+
+
+def test_joint_wins_over_its_shapes():
+    assert classify_types([["joint", "nurbsCurve"], ["transform", "locator"]], ("JNT", "CTRL", "LOC")) == \
+        ["JNT", "LOC"]
+
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_sides_with_and_without_numpy(monkeypatch, use_numpy):
+    if use_numpy and classify_module.numpy is None:
+        pytest.skip("numpy is not installed")
+    if not use_numpy:
+        monkeypatch.setattr(classify_module, "numpy", None)
+    assert classify_sides([0.5, -0.5, 0.1, -0.1, 0.0]) == ["L", "R", "C", "C", "C"]
+
+
+def test_prefill_only_touches_invalid_rows(scene):
+    cmds, long_names = scene
+    store = RowStore(load_grammar(DEFAULT_GRAMMAR_PATH))
+    names = [long_name.rpartition("|")[2] for long_name in long_names]
+    names[0] = "R_leftArm_CTRL"
+    cmds.rename(long_names[0], names[0])
+    long_names[0] = "|" + names[0]
+    store.load(names, long_names)
+    rows = prefill_invalid(cmds, store)
+    assert rows == list(range(1, len(NODES)))
+    assert store.combined_name(0) == "R_leftArm_CTRL"
+    assert store.combined_name(1) == "R_rightArm_GEO"
+    assert store.combined_name(3) == "L_handCtrl_CTRL"
+    # No suggestion keeps the default
+    assert store.combined_name(6) == "C_emptyGroup_GEO"
@@ -0,0 +1,127 @@
+import os
+
+import pytest
+
+from ..src.core.grammar import DEFAULT_GRAMMAR_PATH, GRAMMAR_DIR, Grammar, GrammarError, load_grammar
+
+
+def grammar_path(file_name):
+    return os.path.join(GRAMMAR_DIR, file_name)
+
+
+# (name, parsed tokens or None) for every grammar shipped in src/grammars
+CASES = {
+    "default.json": [
+        ("L_arm_GEO", ("L", "arm", "GEO")),
+        ("C_spine01_JNT", ("C", "spine01", "JNT")),
+        ("R_hand_CTRL", ("R", "hand", "CTRL")),
+        ("arm_GEO", None),
+        ("X_arm_GEO", None),
+        ("L_arm_geo", None),
+        ("L_arm_left_GEO", None),
+        ("L__GEO", None),
+        ("", None),
+    ],
+    "show_example.json": [
+        ("L_arm_GEO", ("L", "arm", "", "", "", "GEO")),
+        ("L_arm_01_GEO", ("L", "arm", "01", "", "", "GEO")),
+        ("R_finger_012_B_LOD2_JNT", ("R", "finger", "012", "B", "LOD2", "JNT")),
+        ("C_root_LOD0_GRP", ("C", "root", "", "", "LOD0", "GRP")),
+        ("C_root_A_LOC", ("C", "root", "", "A", "", "LOC")),
+        ("L_arm_1_GEO", None),
+        ("L_arm_LOD9_GEO", None),
+        ("L_arm_GEO_01", None),
+        ("arm", None),
+    ],
+}
+
+
+def test_every_grammar_has_cases():
+    assert sorted(CASES) == sorted(name for name in os.listdir(GRAMMAR_DIR) if name.endswith(".json"))
+
+
+@pytest.mark.parametrize("file_name, name, expected",
+                         [(file_name, name, expected) for file_name, cases in CASES.items()
+                          for name, expected in cases])
+def test_validate_and_parse(file_name, name, expected):
+    grammar = load_grammar(grammar_path(file_name))
+    assert grammar.validate(name) == (expected is not None)
+    assert grammar.parse(name) == expected
+    if expected is not None:
+        assert grammar.format(expected) == name
+
+
+@pytest.mark.parametrize("file_name", sorted(CASES))
+def test_bulk_matches_single(file_name):
+    grammar = load_grammar(grammar_path(file_name))
+    names = [name for name, _ in CASES[file_name]]
+    valid, columns = grammar.parse_many(names)
+    assert list(grammar.validate_many(names)) == list(valid)
+    for index, (name, expected) in enumerate(CASES[file_name]):
+        assert valid[index] == (expected is not None)
+        row = tuple(column[index] for column in columns)
+        assert row == (expected if expected is not None else grammar.fallback(name))
+    valid_names = [name for name, expected in CASES[file_name] if expected is not None]
+    assert grammar.format_many(grammar.parse_many(valid_names)[1]) == valid_names
+
+
+def test_format_cleans_free_text_and_drops_empty_optionals():
+    grammar = load_grammar(grammar_path("show_example.json"))
+    assert grammar.format(("L", "left arm!", "0x1", "", "", "GEO")) == "L_leftarm_01_GEO"
+
+
+def test_fallback_puts_the_name_in_the_primary_token():
+    grammar = load_grammar(DEFAULT_GRAMMAR_PATH)
+    assert grammar.fallback("pCube1") == ("C", "pCube1", "GEO")
+
+
+@pytest.mark.parametrize("config", [
+    {"tokens": []},
+    {"tokens": [{"name": "side", "values": ["L"]}]},
+    {"tokens": [{"name": "name", "pattern": "[a-z]+"}, {"name": "name", "pattern": "[0-9]+"}]},
+    {"tokens": [{"name": "name"}]},
+    {"tokens": [{"name": "name", "pattern": "[a-z]+", "unknown": 1}]},
+    {},
+])
+def test_malformed_grammars_are_rejected(config):
+    with pytest.raises(GrammarError):
+        Grammar.from_dict(config)
+
+
+def test_groups_inside_token_patterns_do_not_shift_tokens():
+    grammar = Grammar.from_dict({"tokens": [
+        {"name": "side", "values": ["L", "R"]},
+        {"name": "name", "pattern": "(arm|leg)[0-9]+"},
+        {"name": "type", "values": ["GEO"]},
+    ]})
+    assert grammar.parse("L_arm01_GEO") == ("L", "arm01", "GEO")
+    valid, columns = grammar.parse_many(["R_leg2_GEO", "hand"])
+    assert list(valid) == [1, 0]
+    assert columns == [["R", "L"], ["leg2", "hand"], ["GEO", "GEO"]]
+
+
+def test_consecutive_leading_optional_tokens():
+    grammar = Grammar.from_dict({"tokens": [
+        {"name": "side", "values": ["L", "R"], "optional": True},
+        {"name": "variant", "pattern": "[A-Z]", "optional": True},
+        {"name": "name", "pattern": "[a-z]+"},
+    ]})
+    for values in [("", "", "abc"), ("", "X", "abc"), ("L", "", "abc"), ("L", "X", "abc")]:
+        name = grammar.format(values)
+        assert grammar.validate(name), name
+        assert grammar.parse(name) == values
+    assert grammar.format(("", "X", "abc")) == "X_abc"
+    assert not grammar.validate("_abc")
+
+
+@pytest.mark.parametrize("config", [
+    {"tokens": [{"name": "my-side", "values": ["L"]}, {"name": "name", "pattern": "[a-z]+"}]},
+    {"tokens": [{"name": 5, "pattern": "[a-z]+"}]},
+    {"tokens": [{"name": "name", "pattern": "[a-z"}]},
+    {"tokens": [{"name": "name", "pattern": "[a-z]+", "clean": "("}]},
+    {"tokens": [{"name": "name", "pattern": "(?P<side>[a-z]+)"}, {"name": "side", "values": ["L"]}]},
+    {"tokens": [{"name": "name", "pattern": "[a-z]+", "optional": True}]},
+])
+def test_invalid_token_names_and_patterns_are_grammar_errors(config):
+    with pytest.raises(GrammarError):
+        Grammar.from_dict(config)
@@ -0,0 +1,121 @@
+from ..src.core.fake_cmds import FakeCmds
+from ..src.core.hierarchy import ROOT, HierarchyIndex, apply_delta, load_hierarchy
+from ..src.core.sync import (NODE_ADDED, NODE_REMOVED, NODE_RENAMED, NODE_REPARENTED, FakeEventSource, SceneEvent,
+                             SceneSync, coalesce)
+
+ROOTS = 3
+GROUPS = 4
+LEAVES = 5
+
+
+def synthetic_paths():
+    """ROOTS roots holding GROUPS groups of LEAVES leaves each, listed children first."""
+    paths = []
+    for root in range(ROOTS):
+        for group in range(GROUPS):
+            for leaf in range(LEAVES):
+                paths.append(f"|root{root}|group{group}|leaf{leaf}")
+            paths.append(f"|root{root}|group{group}")
+        paths.append(f"|root{root}")
+    return paths
+
+
+def test_children_and_ancestors():
+    hierarchy = HierarchyIndex.from_paths(synthetic_paths())
+    assert len(hierarchy) == ROOTS * (1 + GROUPS * (1 + LEAVES))
+    assert [hierarchy.names[node_id] for node_id in hierarchy.children(ROOT)] == ["root0", "root1", "root2"]
+    leaf = hierarchy.node_id("|root2|group3|leaf4")
+    assert [hierarchy.paths[node_id] for node_id in hierarchy.ancestors(leaf)] == ["|root2|group3", "|root2"]
+    assert not hierarchy.has_children(leaf)
+
+
+def test_load_hierarchy_is_one_query():
+    cmds = FakeCmds()
+    group = cmds.createNode("transform", name="group")
+    cmds.createNode("mesh", name="bodyShape", parent=cmds.createNode("transform", name="body", parent=group))
+    cmds.calls.clear()
+    hierarchy = load_hierarchy(cmds)
+    assert sum(cmds.calls.values()) == 1
+    assert hierarchy.paths == ["|group", "|group|body"]
+
+
+def child_names(hierarchy, path=None):
+    node_id = ROOT if path is None else hierarchy.node_id(path)
+    return [hierarchy.names[child] for child in hierarchy.children(node_id)]
+
+
+def test_move_keeps_children_sorted_and_paths_current():
+    hierarchy = HierarchyIndex.from_paths(synthetic_paths())
+    group = hierarchy.node_id("|root0|group1")
+    hierarchy.move(group, "|root2|agroup")
+    assert hierarchy.paths[group] == "|root2|agroup"
+    assert hierarchy.node_id("|root0|group1|leaf3") is None
+    assert hierarchy.paths[hierarchy.node_id("|root2|agroup|leaf3")] == "|root2|agroup|leaf3"
+    assert child_names(hierarchy, "|root0") == ["group0", "group2", "group3"]
+    assert child_names(hierarchy, "|root2") == ["agroup", "group0", "group1", "group2", "group3"]
+
+
+def test_swapped_names_keep_both_subtrees():
+    hierarchy = HierarchyIndex.from_paths(["|a", "|a|x", "|b", "|b|x"])
+    a, a_x, b, b_x = (hierarchy.node_id(path) for path in ("|a", "|a|x", "|b", "|b|x"))
+    hierarchy.move(a, "|b")
+    hierarchy.move(b, "|a")
+    assert [hierarchy.node_id(path) for path in ("|a", "|a|x", "|b", "|b|x")] == [b, b_x, a, a_x]
+
+
+def test_remove_and_add():
+    hierarchy = HierarchyIndex.from_paths(synthetic_paths())
+    size = len(hierarchy)
+    removed = hierarchy.remove(hierarchy.node_id("|root1|group2"))
+    assert len(removed) == 1 + LEAVES and hierarchy.removed == 1 + LEAVES
+    assert all(hierarchy.paths[node_id] is None for node_id in removed)
+    assert hierarchy.node_id("|root1|group2|leaf0") is None
+    assert child_names(hierarchy, "|root1") == ["group0", "group1", "group3"]
+    node_id = hierarchy.add("|root1|group2")
+    assert node_id == size and hierarchy.add("|root1|group2") == node_id
+    assert child_names(hierarchy, "|root1") == ["group0", "group1", "group2", "group3"]
+    assert not hierarchy.has_children(node_id)
+
+
+def test_apply_delta_matches_a_reload():
+    cmds = FakeCmds()
+    for path in ["|a", "|a|x", "|a|y", "|b", "|b|z"]:
+        parent, _, name = path.rpartition("|")
+        cmds.createNode("transform", name=name, parent=parent or None)
+    hierarchy = load_hierarchy(cmds)
+    events = FakeEventSource()
+    sync = SceneSync(events, schedule=lambda flush: None)
+    sync.start()
+    uuid = {path: cmds.ls(path, uuid=True)[0] for path in ["|a", "|a|y", "|b|z"]}
+    cmds.rename("|a", "c")
+    events.emit(NODE_RENAMED, uuid["|a"], "|c", "transform", "|a")
+    cmds.delete("|c|y")
+    events.emit(NODE_REMOVED, uuid["|a|y"], "|c|y", "transform")
+    cmds.delete("|b|z")
+    events.emit(NODE_REMOVED, uuid["|b|z"], "|b|z", "transform")
+    group = cmds.createNode("transform", name="w", parent="|c|x")
+    events.emit(NODE_ADDED, cmds.ls(f"|c|x|{group}", uuid=True)[0], f"|c|x|{group}", "transform")
+    shape = cmds.createNode("mesh", name="wShape", parent="|c|x|w")
+    events.emit(NODE_ADDED, cmds.ls(f"|c|x|w|{shape}", uuid=True)[0], "|c|x|w|wShape", "mesh")
+
+    changed, branches = apply_delta(cmds, hierarchy, sync.flush())
+    assert sorted(hierarchy.paths[node_id] or "" for node_id in changed) == ["", "", "|c", "|c|x|w"]
+    assert {hierarchy.paths[node_id] if node_id != ROOT else "" for node_id in branches} == {"", "|c", "|b", "|c|x"}
+    reloaded = load_hierarchy(cmds)
+    assert sorted(path for path in hierarchy.paths if path) == sorted(reloaded.paths)
+    assert child_names(hierarchy) == child_names(reloaded) == ["b", "c"]
+
+
+def test_apply_delta_reparents_under_a_new_group():
+    # Like Maya's group command: a new transform is created and the node moved under it
+    cmds = FakeCmds()
+    group = cmds.createNode("transform", name="grp")
+    cmds.createNode("transform", name="x", parent=cmds.createNode("transform", name="a", parent=group))
+    hierarchy = HierarchyIndex.from_paths(["|a", "|a|x"])
+    delta = coalesce([SceneEvent(NODE_ADDED, cmds.ls("|grp", uuid=True)[0], "|grp", "transform"),
+                      SceneEvent(NODE_REPARENTED, cmds.ls("|grp|a", uuid=True)[0], "|grp|a", "transform", "|a")])
+    assert not delta.moved_nodes
+    apply_delta(cmds, hierarchy, delta)
+    assert sorted(path for path in hierarchy.paths if path) == ["|grp", "|grp|a", "|grp|a|x"]
+    assert child_names(hierarchy) == ["grp"]
+    assert child_names(hierarchy, "|grp") == ["a"]
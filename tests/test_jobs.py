@@ -0,0 +1,134 @@
+import pytest
+
+from ..src.core.grammar import DEFAULT_GRAMMAR_PATH, load_grammar
+from ..src.core.jobs import Generation, RowSnapshot, preview_batches
+from ..src.core.registry import COLLISION_BATCH, COLLISION_NONE, COLLISION_SCENE, NameRegistry
+from ..src.core.rows import STATUS_INVALID, STATUS_MODIFIED, STATUS_PENDING, STATUS_VALID, RowStore
+
+NAME = 1
+
+NAMES = ["L_armUpper_GEO", "R_armLower_GEO", "C_spine_JNT", "badName", "L_hand_GEO"]
+
+
+@pytest.fixture
+def grammar():
+    return load_grammar(DEFAULT_GRAMMAR_PATH)
+
+
+def run(store, rows=None, token=None, batch_size=2):
+    return list(preview_batches(RowSnapshot.from_store(store, rows), token, batch_size))
+
+
+def apply(store, batches):
+    changed = []
+    for batch in batches:
+        changed.extend(store.apply_statuses(batch.rows, batch.statuses))
+    return changed
+
+
+def test_batches_match_refresh_status(grammar):
+    store = RowStore(grammar)
+    store.load(NAMES)
+    store.set_token(0, NAME, "leg")
+    store.set_token(2, NAME, "")
+    batches = run(store)
+    assert [len(batch) for batch in batches] == [2, 2, 1]
+    assert [status for batch in batches for status in batch.statuses] == list(store.status)
+    assert store.status[2] == STATUS_INVALID
+    assert batches[0].new_names == ["L_leg_GEO", "R_armLower_GEO"]
+
+
+def test_rows_listed_first_come_first(grammar):
+    store = RowStore(grammar)
+    store.load(NAMES)
+    snapshot = RowSnapshot.from_store(store, [4, 0, 1, 3], first=[3, 2])
+    assert snapshot.rows == (3, 0, 1, 4)
+    assert snapshot.names == ("badName", "L_armUpper_GEO", "R_armLower_GEO", "L_hand_GEO")
+
+
+def test_snapshot_is_not_affected_by_later_edits(grammar):
+    store = RowStore(grammar)
+    store.load(NAMES)
+    snapshot = RowSnapshot.from_store(store)
+    store.set_token(0, NAME, "leg")
+    batch = next(preview_batches(snapshot))
+    assert batch.new_names[0] == "L_armUpper_GEO"
+    assert batch.statuses[0] == STATUS_VALID
+
+
+def test_newer_job_cancels_older_between_batches(grammar):
+    store = RowStore(grammar)
+    store.load(NAMES)
+    generation = Generation()
+    token = generation.advance()
+    job = preview_batches(RowSnapshot.from_store(store), token, batch_size=2)
+    assert next(job).rows == (0, 1)
+    newer = generation.advance()
+    assert token.cancelled and not newer.cancelled
+    assert list(job) == []
+    # A batch already sent is recognised as stale by its generation
+    assert not generation.is_current(token.value)
+    assert [batch.rows for batch in run(store, token=newer)] == [(0, 1), (2, 3), (4,)]
+
+
+def test_cancelled_job_sends_nothing(grammar):
+    store = RowStore(grammar)
+    store.load(NAMES)
+    generation = Generation()
+    token = generation.advance()
+    generation.advance()
+    assert run(store, token=token) == []
+
+
+def test_deferred_statuses_wait_for_a_job(grammar):
+    store = RowStore(grammar, defer_status=True)
+    store.load(NAMES)
+    assert list(store.status) == [STATUS_PENDING] * len(NAMES)
+    assert store.stale_rows == set(range(len(NAMES)))
+    assert store.checked_rows() == []
+
+    assert apply(store, run(store)) == [0, 1, 2, 3, 4]
+    assert list(store.status) == [STATUS_VALID, STATUS_VALID, STATUS_VALID, STATUS_MODIFIED, STATUS_VALID]
+    assert not store.stale_rows
+
+    # Edits keep the previous status until the job that covers them is applied
+    store.set_token(0, NAME, "leg")
+    store.set_token_column(NAME, [1, 4], ["arm", "hand"])
+    assert store.status[0] == STATUS_VALID
+    assert store.stale_rows == {0, 1, 4}
+    assert apply(store, run(store, sorted(store.stale_rows))) == [0, 1]
+    assert store.checked_rows() == [0, 1, 3]
+    assert not store.stale_rows
+
+
+def test_registry_is_updated_from_batches(grammar):
+    store = RowStore(grammar, defer_status=True)
+    store.load(NAMES)
+    registry = NameRegistry(NAMES + ["L_leg_GEO"])
+    registry.bind(store)
+    store.set_token(0, NAME, "leg")
+    store.set_token(4, NAME, "armUpper")
+
+    affected = set()
+    for batch in run(store, sorted(store.stale_rows)):
+        store.apply_statuses(batch.rows, batch.statuses)
+        for row, new_name in zip(batch.rows, batch.new_names):
+            affected.update(registry.update(store, row, new_name))
+    # badName gets the default side and type, a pending rename too
+    assert affected == {0, 3, 4}
+    assert registry.target(0) == "L_leg_GEO"
+    assert registry.collision(0) == COLLISION_SCENE
+    # Row 0 frees L_armUpper_GEO, which row 4 now takes
+    assert registry.target(4) == "L_armUpper_GEO"
+    assert registry.collision(4) == COLLISION_NONE
+
+    # The same result again changes nothing
+    assert registry.update(store, 0, "L_leg_GEO") == set()
+
+    store.set_token(1, NAME, "armUpper")
+    store.set_token(1, 0, "L")
+    (batch,) = run(store, sorted(store.stale_rows))
+    store.apply_statuses(batch.rows, batch.statuses)
+    assert batch.statuses == [STATUS_MODIFIED]
+    assert registry.update(store, 1, batch.new_names[0]) == {1, 4}
+    assert registry.collision(1) == registry.collision(4) == COLLISION_BATCH
@@ -0,0 +1,72 @@
+import os
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+QtWidgets = pytest.importorskip("PySide2.QtWidgets")
+pytest.importorskip("shiboken2")
+
+from ..src.core.fake_cmds import FakeCmds, build_synthetic_scene, install  # noqa: E402
+
+# The views import maya.cmds when they are first imported
+install(FakeCmds())
+
+from ..src import launcher  # noqa: E402
+from ..src.core.sync import NODE_ADDED, FakeEventSource  # noqa: E402
+from ..src.views import object_namer_tool, selection_set_editor  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+
+@pytest.fixture
+def cmds(app, monkeypatch):
+    cmds = FakeCmds()
+    build_synthetic_scene(cmds, 40)
+    monkeypatch.setattr(object_namer_tool, "cmds", cmds)
+    monkeypatch.setattr(selection_set_editor, "cmds", cmds)
+    monkeypatch.delenv(launcher.DEV_RELOAD_ENV_VAR, raising=False)
+    yield cmds
+    launcher.close()
+    app.processEvents()
+
+
+def launch_kinds(count):
+    return [kind for kind, _ in launcher.launch_times[-count:]]
+
+
+def test_launches_reuse_one_tool(cmds):
+    tool = launcher.show(event_source=FakeEventSource())
+    assert launcher.current_tool() is tool
+    assert launcher.show() is tool
+    assert launch_kinds(2) == ["cold", "warm"]
+
+
+def test_hidden_tool_refreshes_only_after_scene_events(cmds):
+    source = FakeEventSource()
+    tool = launcher.show(event_source=source)
+    tool.close()
+    assert launcher.current_tool() is tool and not tool.isVisible()
+
+    # Nothing happened while hidden, one cheap query decides that
+    cmds.calls.clear()
+    assert launcher.show() is tool
+    assert set(cmds.calls) == {"file"}
+
+    tool.close()
+    source.emit(NODE_ADDED, None, "newNode", "transform")
+    cmds.calls.clear()
+    launcher.show()
+    assert cmds.calls["ls"] > 0
+    assert launch_kinds(3) == ["cold", "warm", "warm"]
+
+
+def test_close_makes_the_next_launch_cold(cmds, app):
+    tool = launcher.show(event_source=FakeEventSource())
+    launcher.close()
+    app.processEvents()
+    assert launcher.current_tool() is None
+    assert launcher.show(event_source=FakeEventSource()) is not tool
+    assert launch_kinds(1) == ["cold"]
@@ -0,0 +1,122 @@
+import pytest
+
+from ..src.batch_rename import run
+from ..src.core.grammar import DEFAULT_GRAMMAR_PATH, load_grammar
+from ..src.core.ma_file import rename_file, scan_file
+
+SCENE = """\
+//Maya ASCII 2022 scene
+requires maya "2022";
+createNode transform -s -n "persp";
+createNode transform -n "grpA";
+createNode transform -n "C_foo_GEO" -p "grpA";
+createNode mesh -n "C_foo_GEOShape" -p "C_foo_GEO";
+\tsetAttr ".v" no;
+createNode transform -n "grpB";
+createNode transform -n "bar" -p "grpB";
+createNode mesh -n "barShape" -p "bar";
+createNode joint -n "arm" -p "grpB";
+createNode joint -n "hand" -p "grpB|arm";
+createNode transform -n "ref:thing";
+select -ne bar;
+\tsetAttr ".t" -type "double3" 1 2 3 ;
+select -ne |grpB|arm;
+connectAttr "C_foo_GEO.t" "bar.t";
+connectAttr "arm.r" "hand.r";
+parent -s -nc -r "hand" "grpA";
+"""
+
+
+@pytest.fixture
+def grammar():
+    return load_grammar(DEFAULT_GRAMMAR_PATH)
+
+
+@pytest.fixture
+def scene(tmp_path):
+    path = tmp_path / "scene.ma"
+    path.write_text(SCENE, encoding="utf-8", newline="")
+    return path
+
+
+def rename(scene, grammar, mapping=None):
+    output = scene.with_name("out.ma")
+    report = rename_file(str(scene), grammar, str(output), mapping)
+    return report, output.read_text(encoding="utf-8").splitlines()
+
+
+def test_scan_resolves_parents(scene):
+    nodes = scan_file(str(scene))
+    assert nodes.paths == ["|persp", "|grpA", "|grpA|C_foo_GEO", "|grpA|C_foo_GEO|C_foo_GEOShape", "|grpB",
+                           "|grpB|bar", "|grpB|bar|barShape", "|grpB|arm", "|grpB|arm|hand", "|ref:thing"]
+    assert nodes.shared == [True] + [False] * 9
+
+
+def test_suggested_names_skip_shared_and_namespaced_nodes(scene, grammar):
+    report = rename_file(str(scene), grammar, dry_run=True)
+    assert report.renamed == {"|grpA": "C_grpA_GEO", "|grpB": "C_grpB_GEO", "|grpB|bar": "C_bar_GEO",
+                              "|grpB|arm": "C_arm_JNT", "|grpB|arm|hand": "C_hand_JNT"}
+    assert report.output is None
+    assert scene.read_text(encoding="utf-8") == SCENE
+
+
+def test_references_follow_renames(scene, grammar):
+    report, lines = rename(scene, grammar, {"|grpB|bar": "C_bar_GEO", "arm": "L_arm_JNT"})
+    assert report.renamed == {"|grpB|bar": "C_bar_GEO", "|grpB|arm": "L_arm_JNT"}
+    assert report.lines_changed == 8
+    assert lines[8] == 'createNode transform -n "C_bar_GEO" -p "grpB";'
+    assert lines[9] == 'createNode mesh -n "barShape" -p "C_bar_GEO";'
+    assert lines[10] == 'createNode joint -n "L_arm_JNT" -p "grpB";'
+    assert lines[11] == 'createNode joint -n "hand" -p "grpB|L_arm_JNT";'
+    assert lines[13] == "select -ne C_bar_GEO;"
+    assert lines[15] == "select -ne |grpB|L_arm_JNT;"
+    assert lines[16] == 'connectAttr "C_foo_GEO.t" "C_bar_GEO.t";'
+    assert lines[17] == 'connectAttr "L_arm_JNT.r" "hand.r";'
+    # setAttr data and untouched statements are copied as they were
+    assert lines[14] == SCENE.splitlines()[14]
+    assert lines[18] == SCENE.splitlines()[18]
+
+
+def test_round_trip(scene, grammar):
+    report, _ = rename(scene, grammar)
+    inverse = {path: path.rpartition("|")[2] for path in report.renamed}
+    renamed = scene.with_name("out.ma")
+    restored = scene.with_name("restored.ma")
+    back = rename_file(str(renamed), grammar, str(restored),
+                       {report.renamed[path]: name for path, name in inverse.items()})
+    assert len(back.renamed) == len(report.renamed)
+    assert restored.read_text(encoding="utf-8") == SCENE
+
+
+def test_collision_writes_full_paths(scene, grammar):
+    # |grpB|bar takes the name of |grpA|C_foo_GEO, short references to either become ambiguous
+    report, lines = rename(scene, grammar, {"|grpB|bar": "C_foo_GEO"})
+    assert report.renamed == {"|grpB|bar": "C_foo_GEO"}
+    assert lines[4] == 'createNode transform -n "C_foo_GEO" -p "grpA";'
+    assert lines[5] == 'createNode mesh -n "C_foo_GEOShape" -p "|grpA|C_foo_GEO";'
+    assert lines[9] == 'createNode mesh -n "barShape" -p "|grpB|C_foo_GEO";'
+    assert lines[13] == "select -ne |grpB|C_foo_GEO;"
+    assert lines[16] == 'connectAttr "|grpA|C_foo_GEO.t" "|grpB|C_foo_GEO.t";'
+
+
+def test_conflicts_are_skipped(scene, grammar):
+    report, lines = rename(scene, grammar, {"|grpB|bar": "arm", "hand": "L_hand_JNT"})
+    assert report.renamed == {"|grpB|arm|hand": "L_hand_JNT"}
+    assert report.conflicts == [("|grpB|bar", "arm", "name already exists")]
+    assert lines[8] == 'createNode transform -n "bar" -p "grpB";'
+    assert lines[17] == 'connectAttr "arm.r" "L_hand_JNT.r";'
+    assert lines[18] == 'parent -s -nc -r "L_hand_JNT" "grpA";'
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_batch_reports_failed_files_and_continues(scene, tmp_path, jobs):
+    broken = tmp_path / "folder.ma"
+    broken.mkdir()
+    output_dir = tmp_path / "fixed"
+    files = [(str(broken), "folder.ma"), (str(scene), "scene.ma"), (str(tmp_path / "gone.ma"), "gone.ma")]
+    reports = {report.path: report for report in run(files, str(output_dir), jobs=jobs)}
+    assert reports[str(broken)].error.startswith("IsADirectoryError")
+    assert reports[str(tmp_path / "gone.ma")].error.startswith("FileNotFoundError")
+    assert reports[str(scene)].error is None
+    assert len(reports[str(scene)].renamed) == 5
+    assert sorted(path.name for path in output_dir.iterdir()) == ["scene.ma"]
@@ -0,0 +1,68 @@
+import json
+
+import pytest
+
+from ..src.core.grammar import DEFAULT_GRAMMAR_PATH, load_grammar
+from ..src.core.manifest import (FORMAT_NAME, ManifestError, RenameManifest, diff_manifests, load_manifest,
+                                 save_manifest)
+
+UUID = "00000001-0000-0000-0000-000000000001"
+OTHER_UUID = "00000002-0000-0000-0000-000000000002"
+THIRD_UUID = "00000003-0000-0000-0000-000000000003"
+FOURTH_UUID = "00000004-0000-0000-0000-000000000004"
+
+
+@pytest.mark.parametrize("file_name", ["plan.jsonl", "plan.rnp"])
+def test_round_trip(tmp_path, file_name):
+    manifest = RenameManifest("rigSet", ["U1", "U2"], ["a", "b"], ["L_a_GEO", "R_b_GEO"], {"scene": "shot.ma"})
+    path = str(tmp_path / file_name)
+    save_manifest(manifest, path)
+    loaded = load_manifest(path)
+    assert list(loaded) == list(manifest)
+    assert loaded.set_name == "rigSet" and loaded.metadata == {"scene": "shot.ma"}
+
+
+@pytest.mark.parametrize("version, message", [("1", "invalid format version"), (None, "invalid format version"),
+                                              (True, "invalid format version"), (99, "newer version")])
+def test_bad_versions_are_manifest_errors(tmp_path, version, message):
+    path = tmp_path / "plan.jsonl"
+    path.write_text(json.dumps({"format": FORMAT_NAME, "version": version}) + "\n", encoding="utf-8")
+    with pytest.raises(ManifestError, match=message):
+        load_manifest(str(path))
+
+
+def write_jsonl(path, entries):
+    lines = [json.dumps({"format": FORMAT_NAME, "version": 1})] + [json.dumps(entry) for entry in entries]
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return str(path)
+
+
+@pytest.mark.parametrize("entry", [{"uuid": 5, "new": "L_a_GEO"}, {"uuid": UUID, "new": 5},
+                                   {"uuid": UUID, "old": None, "new": "L_a_GEO"}, {"new": "L_a_GEO"}, [1, 2]])
+def test_malformed_entries_are_manifest_errors(tmp_path, entry):
+    with pytest.raises(ManifestError, match="line 2"):
+        load_manifest(write_jsonl(tmp_path / "plan.jsonl", [entry]))
+
+
+def test_validate_reports_problems_per_entry():
+    manifest = RenameManifest("", [UUID, UUID, "nope", 5, OTHER_UUID], ["a"] * 5,
+                              ["L_a_GEO", "L_b_GEO", "L_c_GEO", "L_d_GEO", 7])
+    problems = manifest.validate(load_grammar(DEFAULT_GRAMMAR_PATH))
+    assert [index for index, _ in problems] == [1, 2, 3, 4]
+    assert "listed twice" in problems[0][1]
+    assert "is not text" in problems[3][1]
+    manifest.new_names[0] = "bad name"
+    assert manifest.validate(load_grammar(DEFAULT_GRAMMAR_PATH))[0] == \
+        (0, "'bad name' does not follow the naming convention")
+    assert [index for index, _ in manifest.validate()] == [1, 2, 3, 4]
+
+
+def test_diff():
+    before = RenameManifest("", [UUID, OTHER_UUID, THIRD_UUID], ["a", "b", "c"], ["L_a_GEO", "L_b_GEO", "L_c_GEO"])
+    after = RenameManifest("", [OTHER_UUID, THIRD_UUID, FOURTH_UUID], ["b", "c", "d"],
+                           ["L_b_GEO", "R_c_GEO", "L_d_GEO"])
+    diff = diff_manifests(before, after)
+    assert diff.added == [(FOURTH_UUID, "d", "L_d_GEO")]
+    assert diff.removed == [(UUID, "a", "L_a_GEO")]
+    assert diff.changed == [(THIRD_UUID, "c", "L_c_GEO", "R_c_GEO")]
+    assert not diff_manifests(after, after)
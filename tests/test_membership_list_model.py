@@ -0,0 +1,83 @@
+import pytest
+
+from ..src.core.fake_cmds import FakeCmds
+from ..src.core.node_cache import NodeCache
+
+QtCore = pytest.importorskip("PySide2.QtCore")
+
+from ..src.views.membership_list_model import MembershipListModel, decode_mime_data  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QtCore.QCoreApplication.instance() or QtCore.QCoreApplication([])
+
+
+class SignalLog:
+    def __init__(self, model):
+        self.inserted = []
+        self.removed = []
+        model.rowsInserted.connect(lambda parent, first, last: self.inserted.append((first, last)))
+        model.rowsRemoved.connect(lambda parent, first, last: self.removed.append((first, last)))
+
+
+def items(model):
+    return [model.data(model.index(row)) for row in range(model.rowCount())]
+
+
+def test_items_are_added_in_one_insertion(app):
+    model = MembershipListModel()
+    log = SignalLog(model)
+    assert model.add_items(["arm", " leg ", "ARM", "", "leg", "head"]) == 3
+    assert log.inserted == [(0, 2)]
+    assert items(model) == ["arm", "leg", "head"]
+    # Only names not listed yet are inserted, after the others
+    assert model.add_items(["Head", "hand", "spine", "hand"]) == 2
+    assert log.inserted == [(0, 2), (3, 4)]
+    assert model.add_items(["arm"]) == 0
+    assert len(log.inserted) == 2
+    assert " ARM " in model and "neck" not in model
+
+
+def test_set_items_replaces_and_deduplicates(app):
+    model = MembershipListModel()
+    model.add_items(["arm"])
+    model.set_items(["leg", "Leg", "head"])
+    assert items(model) == ["leg", "head"]
+    assert model.keys() == ["leg", "head"]
+    assert "arm" not in model
+
+
+def test_rows_are_removed_per_contiguous_block(app):
+    model = MembershipListModel()
+    model.set_items([f"node{index}" for index in range(8)])
+    log = SignalLog(model)
+    model.remove_rows([6, 1, 2, 7, 4, 2])
+    # Last block first, so earlier rows keep their position
+    assert log.removed == [(6, 7), (4, 4), (1, 2)]
+    assert items(model) == ["node0", "node3", "node5"]
+    # Removed names can be added again
+    assert "node1" not in model
+    assert model.add_items(["node1"]) == 1
+
+
+def test_nodes_are_keyed_by_uuid(app):
+    cmds = FakeCmds()
+    group = cmds.createNode("transform", name="group")
+    cmds.createNode("transform", name="arm", parent=group)
+    nodes = NodeCache(cmds)
+    model = MembershipListModel(resolve=nodes.resolve)
+    # Short, long and missing names of the same nodes
+    assert model.add_items(["arm", "|group|arm", "group", "missing"]) == 2
+    assert items(model) == ["|group|arm", "|group"]
+    assert model.keys() == cmds.ls(["|group|arm", "|group"], uuid=True)
+    assert model.keys()[0] in model
+
+
+def test_text_drops_are_split_per_line(app):
+    mime_data = QtCore.QMimeData()
+    mime_data.setText("|group|arm\n|group|leg\n")
+    assert decode_mime_data(mime_data) == ["|group|arm", "|group|leg"]
+    model = MembershipListModel()
+    assert model.dropMimeData(mime_data, QtCore.Qt.CopyAction, -1, -1, QtCore.QModelIndex())
+    assert items(model) == ["|group|arm", "|group|leg"]
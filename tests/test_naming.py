@@ -0,0 +1,29 @@
+import os
+
+from ..src.core import naming
+from ..src.core.grammar import GRAMMAR_DIR, GRAMMAR_ENV_VAR
+
+
+def test_single_names():
+    assert naming.validate_name("L_arm_GEO") and not naming.validate_name("arm")
+    assert naming.parse_name("R_hand_CTRL") == ("R", "hand", "CTRL")
+    assert naming.parse_name("hand") is None
+    assert naming.compose_name("L", "left arm!", "GEO") == "L_leftarm_GEO"
+    assert naming.clean_name("a b-c") == "abc"
+    assert naming.SIDES == ("L", "R", "C") and naming.DEFAULT_TYPE == "GEO"
+
+
+def test_columns():
+    result = naming.parse_names(["L_arm_GEO", "pCube1"])
+    assert list(result.valid) == [1, 0]
+    assert result.row(1) == ("C", "pCube1", "GEO")
+    assert naming.compose_names(result.sides, result.bases, result.types) == ["L_arm_GEO", "C_pCube1_GEO"]
+    assert list(naming.changed_mask(["a", "b"], ["a", "c"])) == [0, 1]
+
+
+def test_follows_the_active_grammar(monkeypatch):
+    monkeypatch.setenv(GRAMMAR_ENV_VAR, os.path.join(GRAMMAR_DIR, "show_example.json"))
+    assert naming.parse_name("L_arm_01_GEO") == ("L", "arm", "GEO")
+    assert naming.compose_name("R", "leg", "GRP") == "R_leg_GRP"
+    assert naming.compose_names(["C"], ["root"], ["LOC"]) == ["C_root_LOC"]
+    assert "GRP" in naming.TYPES
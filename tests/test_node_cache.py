@@ -0,0 +1,97 @@
+import pytest
+
+from ..src.core.fake_cmds import FakeCmds
+from ..src.core.node_cache import NodeCache
+from ..src.core.sync import NODE_REMOVED, NODE_RENAMED, NODE_REPARENTED, SceneEvent, coalesce
+
+
+@pytest.fixture
+def scene():
+    cmds = FakeCmds()
+    for group_name in ("rig", "geo"):
+        group = cmds.createNode("transform", name=group_name)
+        for name in ("arm", "leg"):
+            transform = cmds.createNode("transform", name=f"{group_name}_{name}", parent=group)
+            cmds.createNode("mesh", name=f"{group_name}_{name}Shape", parent=transform)
+    nodes = NodeCache(cmds)
+    long_names = ["|rig", "|rig|rig_arm", "|rig|rig_arm|rig_armShape", "|rig|rig_leg", "|geo|geo_arm"]
+    uuids = nodes.resolve(long_names)[1]
+    cmds.calls.clear()
+    return cmds, nodes, dict(zip(long_names, uuids))
+
+
+def test_resolve_caches_names_and_types(scene):
+    cmds, nodes, uuids = scene
+    geo_uuid = cmds.ls("|geo", uuid=True)[0]
+    cmds.calls.clear()
+    assert len(nodes) == 5 and uuids["|rig"] in nodes
+    assert nodes.long_names(uuids.values()) == list(uuids)
+    assert nodes.node_types(uuids.values()) == ["transform", "transform", "mesh", "transform", "transform"]
+    assert nodes.uuids(["|rig|rig_leg", "|geo"]) == [uuids["|rig|rig_leg"], geo_uuid]
+    # Only |geo was not cached yet
+    assert cmds.calls["ls"] == 2
+    assert nodes.uuids(["|nowhere"]) == [None]
+
+
+def test_stale_entries_are_refreshed_in_one_batch(scene):
+    cmds, nodes, uuids = scene
+    cmds.rename("|rig", "skeleton")
+    cmds.parent("|geo|geo_arm", "|skeleton|rig_arm")
+    cmds.delete("|skeleton|rig_leg")
+    cmds.calls.clear()
+    nodes.invalidate()
+    assert nodes.long_names(uuids.values()) == [
+        "|skeleton", "|skeleton|rig_arm", "|skeleton|rig_arm|rig_armShape", None,
+        "|skeleton|rig_arm|geo_arm"]
+    assert cmds.calls["ls"] == 2
+    # Deleted nodes are forgotten, the path they held is free again
+    assert uuids["|rig|rig_leg"] not in nodes
+    assert nodes.node_type(uuids["|rig|rig_leg"]) is None
+    assert nodes.uuids(["|rig|rig_arm"]) == [None]
+
+
+def test_rename_made_by_the_tool(scene):
+    cmds, nodes, uuids = scene
+    uuid = uuids["|rig|rig_leg"]
+    nodes.rename(uuid, "|rig|rig_foot")
+    assert nodes.long_name(uuid) == "|rig|rig_foot"
+    assert nodes.uuids(["|rig|rig_foot"]) == [uuid]
+    # Nodes the cache never saw are not added
+    nodes.rename("00000000-0000-0000-0000-000000000000", "|ghost")
+    assert len(nodes) == 5
+    assert not cmds.calls
+
+
+def test_delta_renames_are_patched_in_place(scene):
+    cmds, nodes, uuids = scene
+    cmds.rename("|rig", "skeleton")
+    cmds.parent("|geo|geo_arm", "|skeleton|rig_arm")
+    delta = coalesce([SceneEvent(NODE_RENAMED, uuids["|rig"], "|skeleton", "transform", "|rig"),
+                      SceneEvent(NODE_REPARENTED, uuids["|geo|geo_arm"], "|skeleton|rig_arm|geo_arm",
+                                 "transform", "|geo|geo_arm")])
+    cmds.calls.clear()
+    nodes.apply_delta(delta)
+    assert nodes.long_names(uuids.values()) == [
+        "|skeleton", "|skeleton|rig_arm", "|skeleton|rig_arm|rig_armShape", "|skeleton|rig_leg",
+        "|skeleton|rig_arm|geo_arm"]
+    assert nodes.uuids(["|skeleton|rig_leg"]) == [uuids["|rig|rig_leg"]]
+    assert not cmds.calls
+
+
+def test_delta_removals_and_moves_are_refreshed_on_lookup(scene):
+    cmds, nodes, uuids = scene
+    cmds.delete("|rig|rig_arm")
+    cmds.calls.clear()
+    nodes.apply_delta(coalesce([SceneEvent(NODE_REMOVED, uuids["|rig|rig_arm"], "|rig|rig_arm", "transform")]))
+    assert not cmds.calls
+    assert nodes.long_names(uuids.values()) == ["|rig", None, None, "|rig|rig_leg", "|geo|geo_arm"]
+    # Only the removed node and its shape were looked up again
+    assert cmds.calls["ls"] == 1
+
+    cmds.calls.clear()
+    cmds.parent("|rig|rig_leg", world=True)
+    # Without its previous path a reparent leaves every entry stale
+    nodes.apply_delta(coalesce([SceneEvent(NODE_REPARENTED, uuids["|rig|rig_leg"], "|rig_leg", "transform")]))
+    assert nodes.long_name(uuids["|rig|rig_leg"]) == "|rig_leg"
+    assert nodes.long_names([uuids["|rig"], uuids["|geo|geo_arm"]]) == ["|rig", "|geo|geo_arm"]
+    assert cmds.calls["ls"] == 4
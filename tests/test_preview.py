@@ -0,0 +1,54 @@
+from ..src.core.jobs import PreviewBatch
+from ..src.core.preview import PreviewAggregator
+from ..src.core.rows import STATUS_INVALID, STATUS_MODIFIED, STATUS_VALID
+
+
+def batch(*entries):
+    rows, statuses, new_names = zip(*entries)
+    return PreviewBatch(rows, list(statuses), list(new_names))
+
+
+def test_modified_rows_are_kept_in_row_order():
+    preview = PreviewAggregator()
+    assert preview.apply_batch(batch((4, STATUS_MODIFIED, "d"), (7, STATUS_MODIFIED, "e")))
+    # Visible rows are validated first, so batches can arrive out of order
+    assert preview.apply_batch(batch((1, STATUS_MODIFIED, "a"), (2, STATUS_VALID, "b"), (5, STATUS_INVALID, "")))
+    assert len(preview) == 3
+    assert preview.page() == ["a", "d", "e"]
+
+
+def test_unchanged_batch_reports_no_change():
+    preview = PreviewAggregator()
+    preview.apply_batch(batch((0, STATUS_MODIFIED, "a"), (1, STATUS_MODIFIED, "b")))
+    assert not preview.apply_batch(batch((0, STATUS_MODIFIED, "a"), (2, STATUS_VALID, "c")))
+    assert preview.apply_batch(batch((0, STATUS_MODIFIED, "a2")))
+    assert preview.page() == ["a2", "b"]
+
+
+def test_rows_no_longer_modified_leave_the_preview():
+    preview = PreviewAggregator()
+    preview.apply_batch(batch((0, STATUS_MODIFIED, "a"), (1, STATUS_MODIFIED, "b"), (2, STATUS_MODIFIED, "c")))
+    assert preview.apply_batch(batch((1, STATUS_VALID, "b"), (2, STATUS_INVALID, "")))
+    assert preview.page() == ["a"]
+    assert preview.names == {0: "a"}
+
+
+def test_dirty_rows_are_taken_once():
+    preview = PreviewAggregator()
+    preview.mark_dirty([5, 1])
+    preview.mark_dirty(range(3))
+    assert preview.take_dirty() == [0, 1, 2, 5]
+    assert preview.take_dirty() == []
+    preview.mark_dirty([3])
+    preview.clear()
+    assert preview.take_dirty() == []
+
+
+def test_render_is_capped_to_one_page():
+    preview = PreviewAggregator(page_size=2)
+    assert preview.render() == ""
+    preview.apply_batch(batch(*[(row, STATUS_MODIFIED, f"name{row}") for row in range(5)]))
+    assert preview.render() == "name0, name1 ... (+3 more)"
+    assert preview.page(2) == ["name4"]
+    preview.clear()
+    assert len(preview) == 0 and preview.render() == ""
@@ -0,0 +1,89 @@
+import json
+
+import pytest
+
+from ..src.core.fake_cmds import FakeCmds
+from ..src.core.profiling import KIND_COMMAND, KIND_PHASE, NO_PHASE, PROFILER, InstrumentedCmds, profiled
+
+
+@pytest.fixture
+def profiler():
+    PROFILER.reset()
+    PROFILER.enabled = True
+    yield PROFILER
+    PROFILER.enabled = False
+    PROFILER.reset()
+
+
+class Tool:
+    def __init__(self, cmds):
+        self.cmds = cmds
+
+    @profiled("populate")
+    def populate(self):
+        self.cmds.ls(type="transform")
+        self.cmds.ls(type="mesh")
+        return self.filter("x")
+
+    @profiled("filter")
+    def filter(self, text, *args):
+        self.cmds.objExists(text)
+        return text
+
+
+def test_disabled_profiler_records_nothing():
+    PROFILER.reset()
+    tool = Tool(PROFILER.instrument(FakeCmds()))
+    assert tool.populate() == "x"
+    assert not PROFILER.stats
+
+
+def test_profiled_methods_keep_their_signature():
+    assert Tool.populate.__name__ == "populate"
+    assert Tool.populate.__code__.co_argcount == 1
+    assert Tool(FakeCmds()).filter("y", 1, 2) == "y"
+
+
+def test_commands_are_counted_under_their_phase(profiler):
+    cmds = FakeCmds()
+    instrumented = profiler.instrument(cmds)
+    assert profiler.instrument(instrumented) is instrumented
+    assert isinstance(instrumented, InstrumentedCmds)
+    Tool(instrumented).populate()
+    instrumented.ls()
+    counts = {key: entry[0] for key, entry in profiler.stats.items()}
+    assert counts == {
+        ("populate", KIND_PHASE, "populate"): 1,
+        ("populate", KIND_COMMAND, "ls"): 2,
+        ("filter", KIND_PHASE, "filter"): 1,
+        ("filter", KIND_COMMAND, "objExists"): 1,
+        (NO_PHASE, KIND_COMMAND, "ls"): 1,
+    }
+    assert cmds.calls["ls"] == 3
+
+
+def test_failing_phase_is_still_recorded(profiler):
+    @profiled("broken")
+    def broken(value):
+        raise ValueError(value)
+
+    with pytest.raises(ValueError):
+        broken(1)
+    assert profiler.current_phase == NO_PHASE
+    assert profiler.stats[("broken", KIND_PHASE, "broken")][0] == 1
+
+
+def test_report_json(profiler, tmp_path):
+    profiler.record(KIND_PHASE, "fast", 0.001, phase="fast")
+    profiler.record(KIND_PHASE, "slow", 0.004, phase="slow")
+    profiler.record(KIND_PHASE, "slow", 0.002, phase="slow")
+    profiler.record(KIND_COMMAND, "ls", 0.003, phase="slow")
+    report = profiler.report_json()
+    assert [(entry["phase"], entry["kind"], entry["name"], entry["count"]) for entry in report["entries"]] == [
+        ("slow", KIND_PHASE, "slow", 2), ("slow", KIND_COMMAND, "ls", 1), ("fast", KIND_PHASE, "fast", 1)]
+    slow = report["entries"][0]
+    assert slow["total_ms"] == pytest.approx(6.0) and slow["max_ms"] == pytest.approx(4.0)
+    path = tmp_path / "profile.json"
+    profiler.write_json(str(path))
+    assert json.loads(path.read_text(encoding="utf-8")) == report
+    assert profiler.report_text().splitlines()[1].startswith("slow")
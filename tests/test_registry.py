@@ -0,0 +1,89 @@
+import pytest
+
+from ..src.core.grammar import DEFAULT_GRAMMAR_PATH, load_grammar
+from ..src.core.registry import COLLISION_BATCH, COLLISION_NONE, COLLISION_SCENE, NameRegistry
+from ..src.core.rows import RowStore
+
+SIDE = 0
+NAME = 1
+
+NAMES = ["L_arm_GEO", "R_arm_GEO", "C_spine_JNT", "C_head_GEO"]
+SCENE = NAMES + ["C_neck_JNT", "L_hand_GEO"]
+
+
+@pytest.fixture
+def store():
+    store = RowStore(load_grammar(DEFAULT_GRAMMAR_PATH))
+    store.load(NAMES)
+    return store
+
+
+@pytest.fixture
+def registry(store):
+    registry = NameRegistry(SCENE)
+    registry.bind(store)
+    return registry
+
+
+def edit(store, registry, row, token_index, value):
+    store.set_token(row, token_index, value)
+    return registry.update(store, row)
+
+
+def test_unchanged_rows_have_no_target(store, registry):
+    assert [registry.target(row) for row in range(len(store))] == [None] * len(store)
+    assert registry.summary() == (0, 0)
+
+
+def test_scene_collision(store, registry):
+    assert edit(store, registry, 2, NAME, "neck") == {2}
+    assert registry.target(2) == "C_neck_JNT"
+    assert registry.collision(2) == COLLISION_SCENE
+    assert registry.summary() == (1, 0)
+    # Back to a free name
+    assert edit(store, registry, 2, NAME, "chest") == {2}
+    assert registry.collision(2) == COLLISION_NONE
+    assert registry.summary() == (0, 0)
+
+
+def test_batch_duplicates_follow_edits(store, registry):
+    edit(store, registry, 0, NAME, "leg")
+    assert edit(store, registry, 1, SIDE, "L") == {1}
+    assert edit(store, registry, 1, NAME, "leg") == {0, 1}
+    assert registry.collision(0) == registry.collision(1) == COLLISION_BATCH
+    assert registry.summary() == (0, 2)
+    # Moving one row away clears the other one too
+    assert edit(store, registry, 1, SIDE, "R") == {0, 1}
+    assert registry.collision(0) == registry.collision(1) == COLLISION_NONE
+
+
+def test_names_freed_by_the_batch_are_not_collisions(store, registry):
+    # Row 1 takes the name row 0 gives up
+    edit(store, registry, 1, SIDE, "L")
+    assert registry.collision(1) == COLLISION_SCENE
+    affected = edit(store, registry, 0, NAME, "leg")
+    assert 1 in affected
+    assert registry.collision(1) == COLLISION_NONE
+    # Reverting row 0 takes its name back
+    assert 1 in edit(store, registry, 0, NAME, "arm")
+    assert registry.collision(1) == COLLISION_SCENE
+
+
+def test_update_without_change_affects_nothing(store, registry):
+    edit(store, registry, 2, NAME, "chest")
+    assert registry.update(store, 2) == set()
+    assert registry.update(store, 3) == set()
+
+
+def test_bind_indexes_pending_renames(store):
+    store.set_token(0, NAME, "head")
+    store.set_token(0, SIDE, "C")
+    registry = NameRegistry(SCENE)
+    registry.bind(store)
+    # C_head_GEO is taken by row 3, which keeps it
+    assert registry.target(0) == "C_head_GEO"
+    assert registry.collision(0) == COLLISION_SCENE
+    store.set_token(3, NAME, "face")
+    registry.bind(store)
+    assert registry.collision(0) == COLLISION_NONE
+    assert registry.summary() == (0, 0)
@@ -0,0 +1,136 @@
+import pytest
+
+from ..src.core.fake_cmds import FakeCmds
+from ..src.core.rename_plan import RenameError, apply_plan, build_plan
+
+
+def make_scene(cmds, paths):
+    """Create transforms from long names, parents before children. Returns {long name: uuid}."""
+    uuids = {}
+    for path in paths:
+        parent, _, name = path.rpartition("|")
+        cmds.createNode("transform", name=name, parent=parent or None)
+        uuids[path] = cmds.ls(path, uuid=True)[0]
+    return uuids
+
+
+def long_name(cmds, uuid):
+    return cmds.ls(uuid, long=True)[0]
+
+
+def rename(cmds, new_names_by_uuid):
+    plan = build_plan(cmds, new_names_by_uuid)
+    assert plan.is_valid, plan.conflicts
+    apply_plan(cmds, plan)
+    return plan
+
+
+def test_swap_goes_through_temporary_name():
+    cmds = FakeCmds()
+    uuids = make_scene(cmds, ["|grp", "|grp|a", "|grp|b"])
+    plan = rename(cmds, {uuids["|grp|a"]: "b", uuids["|grp|b"]: "a"})
+    assert len(plan) == 3
+    assert long_name(cmds, uuids["|grp|a"]) == "|grp|b"
+    assert long_name(cmds, uuids["|grp|b"]) == "|grp|a"
+
+
+def test_world_level_swap():
+    cmds = FakeCmds()
+    uuids = make_scene(cmds, ["|a", "|b"])
+    rename(cmds, {uuids["|a"]: "b", uuids["|b"]: "a"})
+    assert long_name(cmds, uuids["|a"]) == "|b"
+    assert long_name(cmds, uuids["|b"]) == "|a"
+
+
+def test_chain_renames_the_holder_first():
+    cmds = FakeCmds()
+    uuids = make_scene(cmds, ["|grp", "|grp|a", "|grp|b"])
+    plan = rename(cmds, {uuids["|grp|a"]: "b", uuids["|grp|b"]: "c"})
+    assert [step[2:] for step in plan.steps] == [("b", "c"), ("a", "b")]
+    assert long_name(cmds, uuids["|grp|a"]) == "|grp|b"
+    assert long_name(cmds, uuids["|grp|b"]) == "|grp|c"
+
+
+def test_children_are_renamed_before_their_parent():
+    cmds = FakeCmds()
+    uuids = make_scene(cmds, ["|grp", "|grp|mid", "|grp|mid|leaf"])
+    plan = rename(cmds, {uuids["|grp"]: "root", uuids["|grp|mid"]: "middle", uuids["|grp|mid|leaf"]: "tip"})
+    assert [step[3] for step in plan.steps] == ["tip", "middle", "root"]
+    assert long_name(cmds, uuids["|grp|mid|leaf"]) == "|root|middle|tip"
+
+
+def test_conflicts_are_reported():
+    cmds = FakeCmds()
+    uuids = make_scene(cmds, ["|grp", "|grp|a", "|grp|b", "|grp|taken", "|other", "|other|c"])
+    plan = build_plan(cmds, {uuids["|grp|a"]: "same", uuids["|grp|b"]: "same", uuids["|other|c"]: "other",
+                             uuids["|grp|taken"]: "taken2"})
+    reasons = {uuid: reason for uuid, _, reason in plan.conflicts}
+    assert reasons[uuids["|grp|a"]] == reasons[uuids["|grp|b"]] == "duplicate name in batch"
+    # Only a sibling clashes, a node of the same name elsewhere does not
+    assert uuids["|other|c"] not in reasons
+    plan = build_plan(cmds, {uuids["|grp|a"]: "taken"})
+    assert [reason for _, _, reason in plan.conflicts] == ["name already exists"]
+
+
+def test_vanished_node_is_a_conflict():
+    cmds = FakeCmds()
+    uuids = make_scene(cmds, ["|a"])
+    cmds.delete("|a")
+    plan = build_plan(cmds, {uuids["|a"]: "b"})
+    assert [reason for _, _, reason in plan.conflicts] == ["node no longer exists"]
+
+
+class FailingCmds(FakeCmds):
+    """Fails the rename number fail_at (1 based) of the plan."""
+
+    def __init__(self, fail_at):
+        super().__init__()
+        self.fail_at = fail_at
+        self.renames = 0
+
+    def rename(self, old_name, new_name):
+        self.renames += 1
+        if self.renames == self.fail_at:
+            raise RuntimeError("rename failed")
+        return super().rename(old_name, new_name)
+
+
+def test_failed_rename_rolls_back_the_batch():
+    cmds = FailingCmds(fail_at=3)
+    uuids = make_scene(cmds, ["|grp", "|grp|a", "|grp|b", "|grp|c"])
+    plan = build_plan(cmds, {uuids["|grp|a"]: "x", uuids["|grp|b"]: "y", uuids["|grp|c"]: "z"})
+    with pytest.raises(RuntimeError):
+        apply_plan(cmds, plan)
+    assert sorted(cmds.listRelatives("|grp", children=True)) == ["a", "b", "c"]
+    assert cmds.undo_chunks == []
+
+
+def test_invalid_plan_is_not_applied():
+    cmds = FakeCmds()
+    uuids = make_scene(cmds, ["|a", "|b"])
+    plan = build_plan(cmds, {uuids["|a"]: "b"})
+    with pytest.raises(RenameError):
+        apply_plan(cmds, plan)
+    assert cmds.calls["rename"] == 0
+
+
+class FailingRollbackCmds(FailingCmds):
+    """Also fails the first rename made by the rollback."""
+
+    def rename(self, old_name, new_name):
+        if self.renames == self.fail_at:
+            self.renames += 1
+            raise RuntimeError("rollback failed")
+        return super().rename(old_name, new_name)
+
+
+def test_failed_rollback_keeps_the_original_error(caplog):
+    cmds = FailingRollbackCmds(fail_at=3)
+    uuids = make_scene(cmds, ["|grp", "|grp|a", "|grp|b", "|grp|c"])
+    plan = build_plan(cmds, {uuids["|grp|a"]: "x", uuids["|grp|b"]: "y", uuids["|grp|c"]: "z"})
+    with pytest.raises(RuntimeError, match="rename failed"):
+        apply_plan(cmds, plan)
+    assert "rolling back" in caplog.text
+    # c -> z is still undone after b -> y could not be
+    assert cmds.listRelatives("|grp", children=True) == ["a", "y", "c"]
+    assert cmds.undo_chunks == []
@@ -0,0 +1,91 @@
+import pytest
+
+from ..src.core.fake_cmds import FakeCmds
+from ..src.core.scene import SceneSnapshot, leaf_name, parent_path
+
+
+@pytest.fixture
+def cmds():
+    cmds = FakeCmds()
+    group = cmds.createNode("transform", name="group")
+    for name in ("arm", "leg", "head"):
+        transform = cmds.createNode("transform", name=name, parent=group)
+        cmds.createNode("mesh", name=name + "Shape", parent=transform)
+    cmds.createNode("nurbsCurve", name="armCurve", parent="|group|arm")
+    # Shapes stand for their transform, other shapes and non-DAG nodes are left out
+    cmds.sets(["|group|arm|armShape", "|group|arm", "|group|leg|legShape", "|group|arm|armCurve",
+               "|group|head"], name="bodySet")
+    cmds.sets(["|group|head|headShape"], name="headSet")
+    cmds.sets(name="emptySet", empty=True)
+    cmds.calls.clear()
+    return cmds
+
+
+def test_path_helpers():
+    assert parent_path("|group|arm") == "|group"
+    assert parent_path("|group") == ""
+    assert leaf_name("|group|arm") == "arm"
+    assert leaf_name("group") == "group"
+
+
+def test_set_transforms_is_a_few_batched_queries(cmds):
+    snapshot = SceneSnapshot(cmds)
+    assert snapshot.set_transforms("bodySet") == ["|group|arm", "|group|leg", "|group|head"]
+    assert cmds.calls["sets"] == 1
+    assert cmds.calls["ls"] == 3
+    assert snapshot.node_types["|group|arm|armShape"] == "mesh"
+    assert snapshot.node_types["|group|head"] == "transform"
+    assert snapshot.set_transforms("emptySet") == []
+
+
+def test_results_are_cached_until_invalidated(cmds):
+    snapshot = SceneSnapshot(cmds)
+    snapshot.set_transforms("bodySet")
+    snapshot.set_transforms("headSet")
+    names = snapshot.scene_names()
+    cmds.calls.clear()
+    # Callers get copies, editing them leaves the cache alone
+    snapshot.set_transforms("bodySet").clear()
+    assert snapshot.set_transforms("bodySet") == ["|group|arm", "|group|leg", "|group|head"]
+    assert snapshot.scene_names() is names
+    assert not cmds.calls
+
+    cmds.sets(["|group|head"], remove="bodySet")
+    snapshot.invalidate("bodySet")
+    assert snapshot.set_transforms("bodySet") == ["|group|arm", "|group|leg"]
+    # Other sets are still cached
+    cmds.calls.clear()
+    snapshot.set_transforms("headSet")
+    assert not cmds.calls
+
+    cmds.rename("|group|head", "face")
+    snapshot.invalidate()
+    assert snapshot.set_transforms("headSet") == ["|group|face"]
+    assert "face" in snapshot.scene_names() and "head" not in snapshot.scene_names()
+    assert not snapshot.node_types.keys() & {"|group|head", "|group|arm|armShape"}
+
+
+def test_sets_transforms_share_one_resolve(cmds):
+    snapshot = SceneSnapshot(cmds)
+    snapshot.set_transforms("headSet")
+    cmds.calls.clear()
+    by_set = snapshot.sets_transforms(["bodySet", "headSet", "emptySet"])
+    assert by_set == {"bodySet": ["|group|arm", "|group|leg", "|group|head"],
+                      "headSet": ["|group|head"], "emptySet": []}
+    # headSet was cached, the other two are listed and their members resolved together
+    assert cmds.calls["sets"] == 2
+    assert cmds.calls["ls"] == 3
+    assert snapshot.sets_transforms(["bodySet"]) == {"bodySet": by_set["bodySet"]}
+
+
+def test_uuids_are_cached_by_node(cmds):
+    snapshot = SceneSnapshot(cmds)
+    long_names = snapshot.set_transforms("bodySet")
+    uuids = snapshot.uuids(long_names)
+    assert uuids == cmds.ls(long_names, uuid=True)
+    cmds.calls.clear()
+    assert snapshot.uuids(long_names) == uuids
+    assert not cmds.calls
+    cmds.delete("|group|leg")
+    snapshot.nodes.invalidate()
+    assert snapshot.uuids(long_names) is None
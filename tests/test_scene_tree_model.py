@@ -0,0 +1,91 @@
+import pytest
+
+from ..src.core.hierarchy import HierarchyIndex
+
+QtCore = pytest.importorskip("PySide2.QtCore")
+
+from ..src.views.scene_tree_model import LONG_NAME_ROLE, SceneTreeModel  # noqa: E402
+from .test_hierarchy import GROUPS, LEAVES, ROOTS, synthetic_paths  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QtCore.QCoreApplication.instance() or QtCore.QCoreApplication([])
+
+
+@pytest.fixture
+def model(app):
+    return SceneTreeModel(HierarchyIndex.from_paths(synthetic_paths()))
+
+
+def fetch(model, index):
+    assert model.canFetchMore(index)
+    model.fetchMore(index)
+    assert not model.canFetchMore(index)
+
+
+def test_branches_are_fetched_lazily(model):
+    assert model.rowCount() == ROOTS
+    root = model.index(0, 0)
+    assert model.data(root) == "root0"
+    assert model.hasChildren(root)
+    assert model.rowCount(root) == 0
+    fetch(model, root)
+    assert model.rowCount(root) == GROUPS
+    group = model.index(1, 0, root)
+    assert model.rowCount(group) == 0
+    fetch(model, group)
+    assert model.rowCount(group) == LEAVES
+    leaf = model.index(0, 0, group)
+    assert model.data(leaf, LONG_NAME_ROLE) == "|root0|group1|leaf0"
+    assert not model.hasChildren(leaf) and not model.canFetchMore(leaf)
+    assert model.parent(leaf) == group
+    # Branches never expanded hold no items
+    assert model._item(model.index(1, 0)).children is None
+
+
+def test_fetch_more_signals_inserted_rows(model):
+    inserted = []
+    model.rowsInserted.connect(lambda parent, first, last: inserted.append((first, last)))
+    root = model.index(2, 0)
+    model.fetchMore(root)
+    model.fetchMore(root)
+    assert inserted == [(0, GROUPS - 1)]
+
+
+def test_visible_filter_limits_fetched_rows(model):
+    hierarchy = model.hierarchy
+    leaf = hierarchy.node_id("|root1|group2|leaf3")
+    model.set_visible({leaf, *hierarchy.ancestors(leaf)})
+    assert model.rowCount() == 1
+    index = model.index_for_node(leaf)
+    assert model.data(index, LONG_NAME_ROLE) == "|root1|group2|leaf3"
+    assert model.rowCount(model.parent(index)) == 1
+
+
+
+def test_update_branches_keeps_fetched_items(model):
+    hierarchy = model.hierarchy
+    root = model.index(0, 0)
+    fetch(model, root)
+    group = model.index(1, 0, root)
+    fetch(model, group)
+    leaf = QtCore.QPersistentModelIndex(model.index(2, 0, group))
+    removed = QtCore.QPersistentModelIndex(model.index(3, 0, root))
+    moved = hierarchy.node_id("|root0|group1")
+    hierarchy.remove(hierarchy.node_id("|root0|group3"))
+    hierarchy.move(moved, "|root0|agroup")
+    inserted = []
+    model.rowsInserted.connect(lambda parent, first, last: inserted.append((first, last)))
+    model.update_branches([hierarchy.parents[moved]])
+    assert not inserted
+    assert [model.data(model.index(row, 0, root)) for row in range(model.rowCount(root))] == \
+        ["agroup", "group0", "group2"]
+    assert leaf.isValid() and model.data(QtCore.QModelIndex(leaf), LONG_NAME_ROLE) == "|root0|agroup|leaf2"
+    assert leaf.parent().row() == 0
+    assert not removed.isValid()
+    # Moving an expanded group under a branch never fetched drops its items
+    hierarchy.move(moved, "|root1|agroup")
+    model.update_branches([hierarchy.node_id("|root0"), hierarchy.node_id("|root1")])
+    assert not leaf.isValid()
+    assert model.rowCount(root) == GROUPS - 2
@@ -0,0 +1,60 @@
+import pytest
+
+from ..src.core.hierarchy import HierarchyIndex
+from ..src.core.search import MODE_GLOB, MODE_REGEX, MODE_SUBSTRING, SearchIndex
+
+PATHS = ["|abc", "|abd", "|xyz", "|q1", "|q2", "|q1|Leaf12"]
+
+
+@pytest.fixture
+def index():
+    return SearchIndex(HierarchyIndex.from_paths(PATHS))
+
+
+def matched(index, text, mode):
+    return sorted(index.hierarchy.names[node_id] for node_id in index.query(text, mode).matches)
+
+
+@pytest.mark.parametrize("text, mode, expected", [
+    ("ab", MODE_SUBSTRING, ["abc", "abd"]),
+    ("LEAF", MODE_SUBSTRING, ["Leaf12"]),
+    ("", MODE_SUBSTRING, ["Leaf12", "abc", "abd", "q1", "q2", "xyz"]),
+    ("q?", MODE_GLOB, ["q1", "q2"]),
+    ("[!a]*", MODE_GLOB, ["Leaf12", "q1", "q2", "xyz"]),
+    ("[\t-z]*", MODE_GLOB, ["Leaf12", "abc", "abd", "q1", "q2", "xyz"]),
+    ("[^z]+", MODE_REGEX, ["Leaf12", "abc", "abd", "q1", "q2", "xyz"]),
+    (r".*\d", MODE_REGEX, ["Leaf12", "q1", "q2"]),
+    (r"^leaf\d+$", MODE_REGEX, ["Leaf12"]),
+])
+def test_every_name_is_matched_on_its_own(index, text, mode, expected):
+    assert matched(index, text, mode) == expected
+
+
+def test_ancestors_of_matches_stay_visible(index):
+    result = index.query("leaf", MODE_SUBSTRING)
+    visible = {index.hierarchy.paths[node_id] for node_id in result.visible}
+    assert visible == {"|q1", "|q1|Leaf12"}
+
+
+def test_warm_up_builds_the_trigram_index_once(index):
+    index.warm_up()
+    ngrams = index._ngrams
+    index.warm_up()
+    assert index._ngrams is ngrams
+    assert matched(index, "eaf", MODE_SUBSTRING) == ["Leaf12"]
+
+
+def test_update_follows_a_patched_hierarchy(index):
+    hierarchy = index.hierarchy
+    index.warm_up()
+    renamed = hierarchy.node_id("|abc")
+    hierarchy.move(renamed, "|zzz")
+    removed = hierarchy.remove(hierarchy.node_id("|q1"))
+    added = hierarchy.add("|xyz|abcde")
+    index.update([renamed, added, *removed])
+    assert matched(index, "abc", MODE_SUBSTRING) == ["abcde"]
+    assert matched(index, "zz", MODE_SUBSTRING) == ["zzz"]
+    assert matched(index, "*", MODE_GLOB) == ["abcde", "abd", "q2", "xyz", "zzz"]
+    assert matched(index, "^$|leaf", MODE_REGEX) == []
+    assert matched(index, "", MODE_SUBSTRING) == ["abcde", "abd", "q2", "xyz", "zzz"]
+    assert index.query("abcde").visible == {added, hierarchy.node_id("|xyz")}
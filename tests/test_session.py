@@ -0,0 +1,61 @@
+import pytest
+
+from ..src.core.fake_cmds import FakeCmds
+from ..src.core.scene import SceneSnapshot
+from ..src.core.session import load_session
+
+
+@pytest.fixture
+def scene():
+    cmds = FakeCmds()
+    group = cmds.createNode("transform", name="group")
+    for name in ("arm", "leg", "head"):
+        transform = cmds.createNode("transform", name=name, parent=group)
+        cmds.createNode("mesh", name=name + "Shape", parent=transform)
+    cmds.sets(["|group|arm", "|group|leg"], name="bodySet")
+    # Listed through its shape, the row is the transform already held by bodySet
+    cmds.sets(["|group|leg|legShape", "|group|head"], name="faceSet")
+    cmds.sets(name="emptySet", empty=True)
+    return cmds, SceneSnapshot(cmds)
+
+
+def test_shared_nodes_get_one_row(scene):
+    cmds, snapshot = scene
+    session = load_session(snapshot, ["bodySet", "faceSet", "bodySet", "emptySet"])
+    assert session.set_names == ["bodySet", "faceSet", "emptySet"]
+    assert session.long_names == ["|group|arm", "|group|leg", "|group|head"]
+    assert session.uuids == cmds.ls(session.long_names, uuid=True)
+    assert session.set_rows == {"bodySet": [0, 1], "faceSet": [1, 2], "emptySet": []}
+    assert len(session) == 3
+    assert session.shared_count() == 1
+
+
+def test_rows_for_filters_by_set(scene):
+    _, snapshot = scene
+    session = load_session(snapshot, ["bodySet", "faceSet"])
+    assert session.rows_for("faceSet") == [1, 2]
+    assert "faceSet" in session and "otherSet" not in session
+    # Every row for no set, or a set outside the session
+    assert session.rows_for() is None
+    assert session.rows_for("otherSet") is None
+
+
+def test_deleted_members_are_left_out(scene):
+    cmds, snapshot = scene
+    cmds.delete("|group|leg")
+    session = load_session(snapshot, ["bodySet", "faceSet"])
+    assert session.long_names == ["|group|arm", "|group|head"]
+    assert session.set_rows == {"bodySet": [0], "faceSet": [1]}
+    assert session.shared_count() == 0
+
+
+def test_keep_sets_forgets_missing_sets(scene):
+    _, snapshot = scene
+    session = load_session(snapshot, ["bodySet", "faceSet"])
+    assert session.keep_sets(["faceSet", "emptySet"])
+    assert session.set_names == ["faceSet"]
+    assert "bodySet" not in session
+    # Rows stay until the session is loaded again
+    assert len(session) == 3
+    assert not session.keep_sets(["emptySet"])
+    assert session.set_names == []
@@ -0,0 +1,91 @@
+import pytest
+
+from ..src.core.fake_cmds import FakeCmds
+from ..src.core.node_cache import NodeCache
+from ..src.core.set_edit import apply_set_delta, create_set, member_names, set_delta
+
+
+@pytest.fixture
+def scene():
+    cmds = FakeCmds()
+    group = cmds.createNode("transform", name="group")
+    for name in ("body", "head", "arm", "leg"):
+        transform = cmds.createNode("transform", name=name, parent=group)
+        cmds.createNode("mesh", name=name + "Shape", parent=transform)
+    cmds.createNode("nurbsCurve", name="armCurve", parent="|group|arm")
+    cmds.sets(["|group|body", "|group|head", "|group|head|headShape"], name="charSet")
+    nodes = NodeCache(cmds)
+    return cmds, nodes
+
+
+def uuids(nodes, names):
+    return nodes.resolve(names)[1]
+
+
+def members(cmds, set_name):
+    return sorted(cmds.ls(cmds.sets(set_name, q=True) or [], long=True))
+
+
+def test_member_names_leave_out_meshes_only(scene):
+    cmds, nodes = scene
+    listed = uuids(nodes, ["|group|arm", "|group|arm|armShape", "|group|arm|armCurve", "|group|leg"])
+    cmds.delete("|group|leg")
+    nodes.invalidate()
+    assert member_names(nodes, listed + listed[:1]) == (["|group|arm", "|group|arm|armCurve"], 1)
+
+
+def test_delta_only_resolves_the_changed_members(scene):
+    cmds, nodes = scene
+    current = uuids(nodes, cmds.sets("charSet", q=True))
+    wanted = [uuid for uuid in current if uuid != current[0]] + uuids(nodes, ["|group|arm"])
+    cmds.calls.clear()
+    delta = set_delta(nodes, "charSet", wanted, current)
+    # Every node is cached and fresh, Maya is not asked
+    assert not cmds.calls
+    assert delta.added == ["|group|arm"]
+    # The listed mesh leaves the set, as the editor always did
+    assert sorted(delta.removed) == ["|group|body", "|group|head|headShape"]
+    assert delta.unresolved == 0
+
+    apply_set_delta(cmds, delta)
+    assert cmds.calls["sets"] == 2
+    assert members(cmds, "charSet") == ["|group|arm", "|group|head"]
+    assert not cmds.undo_chunks
+
+
+def test_delta_follows_renamed_and_deleted_members(scene):
+    cmds, nodes = scene
+    current = uuids(nodes, ["|group|body", "|group|head"])
+    wanted = current + uuids(nodes, ["|group|leg"])
+    cmds.rename("|group|leg", "legL")
+    cmds.delete("|group|body")
+    nodes.invalidate()
+    cmds.calls.clear()
+    delta = set_delta(nodes, "charSet", wanted, current)
+    # Stale entries are re-resolved in one batch
+    assert cmds.calls["ls"] == 2
+    assert delta.added == ["|group|legL"]
+    assert delta.removed == []
+    assert delta.unresolved == 1
+
+
+def test_unchanged_members_send_nothing(scene):
+    cmds, nodes = scene
+    current = uuids(nodes, ["|group|body", "|group|head"])
+    delta = set_delta(nodes, "charSet", list(reversed(current)), current)
+    assert not delta
+    cmds.calls.clear()
+    apply_set_delta(cmds, delta)
+    assert not cmds.calls
+
+
+def test_create_set_is_one_undo_step(scene):
+    cmds, nodes = scene
+    listed = uuids(nodes, ["|group|leg", "|group|leg|legShape"])
+    set_name, unresolved = create_set(cmds, nodes, "legSet", listed)
+    assert (set_name, unresolved) == ("legSet", 0)
+    assert members(cmds, "legSet") == ["|group|leg"]
+    assert not cmds.undo_chunks
+
+    empty_name, _ = create_set(cmds, nodes, "emptySet", uuids(nodes, ["|group|leg|legShape"]))
+    assert cmds.sets(empty_name, q=True) is None
@@ -0,0 +1,112 @@
+from ..src.core.sync import (NODE_ADDED, NODE_REMOVED, NODE_RENAMED, NODE_REPARENTED, SET_MEMBERS_CHANGED,
+                             FakeEventSource, SceneEvent, SceneSync, coalesce)
+
+
+def renamed(uuid, old_name, new_name, node_type="transform"):
+    return SceneEvent(NODE_RENAMED, uuid, new_name, node_type, old_name)
+
+
+def test_parent_then_child_rename():
+    delta = coalesce([renamed("A", "|a", "|b"), renamed("C", "|b|c", "|b|d")])
+    assert delta.renamed == {"|a": "|b", "|a|c": "|b|d"}
+    assert delta.rename_path("|a|c") == "|b|d"
+    assert delta.rename_path("|a|e") == "|b|e"
+
+
+def test_child_then_parent_rename():
+    delta = coalesce([renamed("C", "|a|c", "|a|d"), renamed("A", "|a", "|b")])
+    assert delta.renamed == {"|a": "|b", "|a|c": "|b|d"}
+    assert delta.rename_path("|a|c|leaf") == "|b|d|leaf"
+
+
+def test_reparent_then_rename_of_the_new_parent():
+    delta = coalesce([SceneEvent(NODE_REPARENTED, "C", "|x|y|c", "transform", "|a|c"),
+                      renamed("X", "|x", "|z")])
+    assert delta.rename_path("|a|c") == "|z|y|c"
+    assert delta.rename_path("|x|y") == "|z|y"
+
+
+def test_repeated_renames_keep_the_original_key():
+    delta = coalesce([renamed("A", "|a", "|b"), renamed("A", "|b", "|c"), renamed("B", "|c|k", "|c|m")])
+    assert delta.renamed == {"|a": "|c", "|a|k": "|c|m"}
+
+
+def test_removed_after_parent_rename_uses_the_original_path():
+    delta = coalesce([renamed("A", "|a", "|b"), SceneEvent(NODE_REMOVED, "C", "|b|c", "transform")])
+    assert delta.removed_nodes == {"|a|c"}
+    assert delta.rename_path("|a|c|leaf") is None
+    assert delta.rename_path("|a|k") == "|b|k"
+
+
+def test_added_then_removed_cancels_out():
+    delta = coalesce([SceneEvent(NODE_ADDED, "N", "|n", "transform"),
+                      renamed("N", "|n", "|m"),
+                      SceneEvent(NODE_REMOVED, "N", "|m", "transform")])
+    assert not delta.renamed and not delta.removed_nodes
+    assert delta.hierarchy_changed
+
+
+def test_added_nodes_are_listed_by_uuid():
+    delta = coalesce([SceneEvent(NODE_ADDED, "N", "|n", "transform"),
+                      SceneEvent(NODE_REPARENTED, "N", "|g|n", "transform"),
+                      SceneEvent(NODE_ADDED, "M", "|m", "transform"),
+                      SceneEvent(NODE_REMOVED, "M", "|m", "transform")])
+    assert delta.added_nodes == {"N"}
+    assert not delta.moved_nodes and not delta.renamed
+
+
+def test_reparent_with_old_path_is_a_rename():
+    delta = coalesce([SceneEvent(NODE_REPARENTED, "C", "|b|c", "transform", "|a|c")])
+    assert delta.renamed == {"|a|c": "|b|c"} and not delta.moved_nodes
+
+
+def test_reparent_without_old_path_is_a_move():
+    delta = coalesce([SceneEvent(NODE_REPARENTED, "C", "|b|c", "transform")])
+    assert delta.moved_nodes == {"C"} and not delta.renamed
+
+
+def test_set_events():
+    delta = coalesce([SceneEvent(SET_MEMBERS_CHANGED, "S", "rigSet", "objectSet"),
+                      renamed("S", "rigSet", "skinSet", "objectSet"),
+                      SceneEvent(NODE_ADDED, "T", "newSet", "objectSet"),
+                      SceneEvent(NODE_REMOVED, "U", "oldSet", "objectSet")])
+    assert delta.renamed == {"rigSet": "skinSet"}
+    assert delta.changed_sets == {"skinSet"}
+    assert delta.added_sets == ["newSet"]
+    assert delta.removed_sets == ["oldSet"]
+    assert not delta.hierarchy_changed
+
+
+def test_burst_is_published_as_one_delta():
+    source = FakeEventSource()
+    scheduled = []
+    sync = SceneSync(source, schedule=scheduled.append)
+    deltas = []
+    sync.add_listener(deltas.append)
+    sync.start()
+    source.emit(NODE_RENAMED, "A", "|b", "transform", "|a")
+    source.emit(NODE_RENAMED, "C", "|b|d", "transform", "|b|c")
+    assert len(scheduled) == 1 and not deltas
+    scheduled[0]()
+    assert len(deltas) == 1
+    assert deltas[0].renamed == {"|a": "|b", "|a|c": "|b|d"}
+
+
+def test_suspended_and_paused_events():
+    source = FakeEventSource()
+    sync = SceneSync(source)
+    deltas = []
+    sync.add_listener(deltas.append)
+    sync.start()
+    with sync.suspended():
+        source.emit(NODE_RENAMED, "A", "|b", "transform", "|a")
+    assert sync.changes == 0 and not deltas
+    sync.pause()
+    source.emit(NODE_RENAMED, "A", "|b", "transform", "|a")
+    assert sync.changes == 1 and not deltas
+    sync.resume()
+    source.emit(NODE_RENAMED, "A", "|c", "transform", "|b")
+    assert sync.changes == 2 and deltas[0].renamed == {"|b": "|c"}
+    sync.stop()
+    source.emit(NODE_RENAMED, "A", "|d", "transform", "|c")
+    assert len(deltas) == 1